@@ -6,12 +6,19 @@ Bee Swarm 基本模擬腳本
 
 import simpy
 import random
+import sys
+import heapq
+import itertools
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from dataclasses import dataclass
-from typing import List, Dict, Any
+import math
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Iterable, Optional
 from enum import Enum
+from simulation_stats import FlowAccounting
+from trace_replay import TraceEvent, TraceReader, trace_summary
 
 class TaskType(Enum):
     FEATURE = "feature"
@@ -24,6 +31,14 @@ class TaskPriority(Enum):
     HIGH = 3
     CRITICAL = 4
 
+# 各優先級的交付期限（小時），用於最早截止期限優先調度
+PRIORITY_SLA_HOURS = {
+    TaskPriority.LOW: 168,
+    TaskPriority.MEDIUM: 72,
+    TaskPriority.HIGH: 24,
+    TaskPriority.CRITICAL: 8
+}
+
 @dataclass
 class Task:
     """任務數據類"""
@@ -35,84 +50,124 @@ class Task:
     completed_at: float = None
     assigned_role: str = None
     status: str = "created"
+    due_at: float = None
+    preemptions: int = 0
 
 class ProductManager:
     """產品經理模擬器"""
     
-    def __init__(self, env: simpy.Environment, task_queue: simpy.Store):
+    def __init__(self, env: simpy.Environment, task_queue: simpy.Store,
+                 arrival_interval: float = 8.0, verbose: bool = True,
+                 accounting: Optional[FlowAccounting] = None,
+                 trace: Optional[Iterable[TraceEvent]] = None):
         self.env = env
         self.task_queue = task_queue
+        self.arrival_interval = arrival_interval
+        self.trace = trace
+        self.verbose = verbose
+        self.accounting = accounting
         self.task_counter = 0
         self.created_tasks = []
         
     def create_tasks(self):
-        """持續創建任務的流程"""
-        while True:
-            # 等待下一個任務創建時間（指數分布）
-            yield self.env.timeout(random.expovariate(1/8))  # 平均8小時創建一個任務
+        """持續創建任務的流程；有軌跡時按軌跡中的到達事件創建，軌跡讀完後停止"""
+        if self.trace is not None:
+            events = iter(self.trace)
+        else:
+            events = itertools.repeat(None)
+        for event in events:
+            if event is None:
+                # 等待下一個任務創建時間（指數分布，默認平均8小時創建一個任務）
+                yield self.env.timeout(random.expovariate(1 / self.arrival_interval))
+            else:
+                yield self.env.timeout(max(0.0, event.time - self.env.now))
             
             # 創建新任務
-            task = self._generate_task()
+            task = self._generate_task(event)
             self.created_tasks.append(task)
+            if self.accounting:
+                self.accounting.arrive(self.env.now)
             yield self.task_queue.put(task)
             
-            print(f"Time {self.env.now:.1f}: PM created {task.task_type.value} task #{task.id}")
+            if self.verbose:
+                print(f"Time {self.env.now:.1f}: PM created {task.task_type.value} task #{task.id}")
     
-    def _generate_task(self) -> Task:
-        """生成隨機任務"""
+    def _generate_task(self, event: Optional[TraceEvent] = None) -> Task:
+        """生成隨機任務（軌跡事件中已知的類型、優先級和複雜度直接使用）"""
         self.task_counter += 1
         
         # 任務類型分布
-        task_type = random.choices(
-            list(TaskType),
-            weights=[0.6, 0.3, 0.1]  # Feature:Bug:TechnicalDebt = 6:3:1
-        )[0]
+        if event is not None and event.task_type:
+            task_type = TaskType(event.task_type)
+        else:
+            task_type = random.choices(
+                list(TaskType),
+                weights=[0.6, 0.3, 0.1]  # Feature:Bug:TechnicalDebt = 6:3:1
+            )[0]
         
         # 優先級分布
-        priority = random.choices(
-            list(TaskPriority),
-            weights=[0.4, 0.4, 0.15, 0.05]  # Low:Medium:High:Critical = 40:40:15:5
-        )[0]
+        if event is not None and event.priority:
+            priority = TaskPriority[event.priority.upper()]
+        else:
+            priority = random.choices(
+                list(TaskPriority),
+                weights=[0.4, 0.4, 0.15, 0.05]  # Low:Medium:High:Critical = 40:40:15:5
+            )[0]
         
         # 複雜度（1-10，正態分布）
-        complexity = max(1, min(10, random.normalvariate(5, 2)))
+        if event is not None and event.complexity is not None:
+            complexity = max(1, min(10, event.complexity))
+        else:
+            complexity = max(1, min(10, random.normalvariate(5, 2)))
         
         return Task(
             id=self.task_counter,
             task_type=task_type,
             priority=priority,
             complexity=complexity,
-            created_at=self.env.now
+            created_at=self.env.now,
+            due_at=self.env.now + PRIORITY_SLA_HOURS[priority]
         )
 
 class Developer:
     """開發者基類"""
     
     def __init__(self, env: simpy.Environment, name: str, task_queue: simpy.Store, 
-                 capacity: float = 1.0, skills: Dict[TaskType, float] = None):
+                 capacity: float = 1.0, skills: Dict[TaskType, float] = None,
+                 verbose: bool = True, accounting: Optional[FlowAccounting] = None):
         self.env = env
         self.name = name
         self.task_queue = task_queue
         self.capacity = capacity
         self.skills = skills or {task_type: 1.0 for task_type in TaskType}
+        self.verbose = verbose
+        self.accounting = accounting
         self.completed_tasks = []
         self.current_task = None
+        if accounting:
+            accounting.register_worker(self, env.now)
         
     def work(self):
         """主要工作循環"""
         while True:
-            # 從任務隊列獲取任務
-            task = yield self.task_queue.get()
+            # 從任務隊列獲取任務（調度器需要知道是哪位開發者在請求）
+            if isinstance(self.task_queue, SkillAwareDispatcher):
+                task = yield self.task_queue.get(self)
+            else:
+                task = yield self.task_queue.get()
             self.current_task = task
             task.assigned_role = self.name
             task.status = "in_progress"
             
-            print(f"Time {self.env.now:.1f}: {self.name} started task #{task.id}")
+            if self.verbose:
+                print(f"Time {self.env.now:.1f}: {self.name} started task #{task.id}")
             
             # 計算工作時間
             work_time = self._calculate_work_time(task)
             
             # 執行任務
+            if self.accounting:
+                self.accounting.start_work(self, self.env.now)
             yield self.env.timeout(work_time)
             
             # 完成任務
@@ -120,8 +175,12 @@ class Developer:
             task.status = "completed"
             self.completed_tasks.append(task)
             self.current_task = None
+            if self.accounting:
+                self.accounting.end_work(self, self.env.now)
+                self.accounting.depart(self.env.now, task.created_at)
             
-            print(f"Time {self.env.now:.1f}: {self.name} completed task #{task.id}")
+            if self.verbose:
+                print(f"Time {self.env.now:.1f}: {self.name} completed task #{task.id}")
     
     def _calculate_work_time(self, task: Task) -> float:
         """計算任務執行時間"""
@@ -139,35 +198,292 @@ class Developer:
 class BackendDeveloper(Developer):
     """後端開發者"""
     
-    def __init__(self, env: simpy.Environment, task_queue: simpy.Store):
+    def __init__(self, env: simpy.Environment, task_queue: simpy.Store, **kwargs):
         skills = {
             TaskType.FEATURE: 1.0,
             TaskType.BUG_FIX: 1.2,  # 後端對bug修復更熟練
             TaskType.TECHNICAL_DEBT: 1.1
         }
-        super().__init__(env, "Backend Developer", task_queue, skills=skills)
+        super().__init__(env, "Backend Developer", task_queue, skills=skills, **kwargs)
 
 class FrontendDeveloper(Developer):
     """前端開發者"""
     
-    def __init__(self, env: simpy.Environment, task_queue: simpy.Store):
+    def __init__(self, env: simpy.Environment, task_queue: simpy.Store, **kwargs):
         skills = {
             TaskType.FEATURE: 1.1,  # 前端對功能開發更熟練
             TaskType.BUG_FIX: 0.9,
             TaskType.TECHNICAL_DEBT: 0.8
         }
-        super().__init__(env, "Frontend Developer", task_queue, skills=skills)
+        super().__init__(env, "Frontend Developer", task_queue, skills=skills, **kwargs)
 
 class DevOpsEngineer(Developer):
     """DevOps 工程師"""
     
-    def __init__(self, env: simpy.Environment, task_queue: simpy.Store):
+    def __init__(self, env: simpy.Environment, task_queue: simpy.Store, **kwargs):
         skills = {
             TaskType.FEATURE: 0.8,
             TaskType.BUG_FIX: 1.0,
             TaskType.TECHNICAL_DEBT: 1.3  # DevOps 對技術債務處理更熟練
         }
-        super().__init__(env, "DevOps Engineer", task_queue, skills=skills)
+        super().__init__(env, "DevOps Engineer", task_queue, skills=skills, **kwargs)
+
+class QueueDiscipline(ABC):
+    """
+    隊列規則基類
+    
+    key() 越小越先被處理；preemptive 為 True 時改用 simpy.PreemptiveResource
+    執行，高優先級任務可以中斷正在進行的低優先級任務。
+    """
+    name = "base"
+    preemptive = False
+    
+    @abstractmethod
+    def key(self, task: Task) -> tuple:
+        """任務的排序鍵"""
+
+class FIFODiscipline(QueueDiscipline):
+    """先進先出"""
+    name = "fifo"
+    
+    def key(self, task):
+        return (task.created_at, task.id)
+
+class PriorityDiscipline(QueueDiscipline):
+    """按 TaskPriority 從高到低，同優先級先進先出"""
+    name = "priority"
+    
+    def key(self, task):
+        return (-task.priority.value, task.created_at, task.id)
+
+class ShortestComplexityFirst(QueueDiscipline):
+    """複雜度最低的任務優先"""
+    name = "shortest_complexity"
+    
+    def key(self, task):
+        return (task.complexity, task.created_at, task.id)
+
+class EarliestDeadlineFirst(QueueDiscipline):
+    """交付期限（created_at + PRIORITY_SLA_HOURS）最早的任務優先"""
+    name = "earliest_deadline"
+    
+    def key(self, task):
+        return (task.due_at, task.id)
+
+class PreemptivePriority(PriorityDiscipline):
+    """搶佔式優先級：更高優先級的任務會中斷正在進行的低優先級任務"""
+    name = "preemptive_priority"
+    preemptive = True
+
+class DisciplinedTaskQueue(simpy.PriorityStore):
+    """按隊列規則排序的任務隊列，put/get 的用法與 simpy.Store 相同"""
+    
+    def __init__(self, env: simpy.Environment, discipline: QueueDiscipline):
+        super().__init__(env)
+        self.discipline = discipline
+    
+    def put(self, task: Task):
+        return super().put(simpy.PriorityItem(self.discipline.key(task), task))
+    
+    def _do_get(self, event):
+        if self.items:
+            event.succeed(heapq.heappop(self.items).item)
+
+class PreemptiveTeam:
+    """
+    搶佔式執行模型
+    
+    每個任務是一個進程，向容量等於開發者人數的 simpy.PreemptiveResource
+    申請執行權；被搶佔時保存剩餘工作量，釋放開發者後重新排隊。
+    """
+    
+    def __init__(self, env: simpy.Environment, developers: List['Developer'],
+                 discipline: QueueDiscipline):
+        self.env = env
+        self.developers = developers
+        self.discipline = discipline
+        self.team = simpy.PreemptiveResource(env, capacity=len(developers))
+        self.free_developers = list(developers)
+        self.items: List[Task] = []  # 等待執行的任務
+    
+    def put(self, task: Task) -> simpy.Event:
+        self.items.append(task)
+        self.env.process(self._execute(task))
+        event = self.env.event()
+        event.succeed()
+        return event
+    
+    def _execute(self, task: Task):
+        # 剩餘工作量以技能倍率 1.0 的小時數表示
+        remaining = task.complexity * 2 * random.uniform(0.8, 1.2)
+        priority = self.discipline.key(task)[0]
+        
+        while remaining > 1e-9:
+            with self.team.request(priority=priority, preempt=True) as request:
+                yield request
+                if task in self.items:
+                    self.items.remove(task)
+                
+                developer = self.free_developers.pop(0)
+                skill = developer.skills.get(task.task_type, 1.0)
+                developer.current_task = task
+                task.assigned_role = developer.name
+                task.status = "in_progress"
+                started = self.env.now
+                if developer.verbose:
+                    print(f"Time {self.env.now:.1f}: {developer.name} started task #{task.id}")
+                if developer.accounting:
+                    developer.accounting.start_work(developer, self.env.now)
+                try:
+                    yield self.env.timeout(remaining / skill)
+                    remaining = 0
+                except simpy.Interrupt:
+                    remaining -= (self.env.now - started) * skill
+                    task.preemptions += 1
+                    task.status = "preempted"
+                    self.items.append(task)
+                    if developer.verbose:
+                        print(f"Time {self.env.now:.1f}: {developer.name} preempted on task #{task.id}")
+                finally:
+                    developer.current_task = None
+                    self.free_developers.append(developer)
+                    if developer.accounting:
+                        developer.accounting.end_work(developer, self.env.now)
+        
+        task.completed_at = self.env.now
+        task.status = "completed"
+        developer.completed_tasks.append(task)
+        if developer.accounting:
+            developer.accounting.depart(self.env.now, task.created_at)
+        if developer.verbose:
+            print(f"Time {self.env.now:.1f}: {developer.name} completed task #{task.id}")
+
+class RoutingPolicy(ABC):
+    """
+    路由策略基類
+    
+    決定空閒開發者在每種任務類型的堆中的排序（堆頂即下一個接單者），
+    以及開發者空閒時從哪種任務類型的積壓隊列中取任務。
+    """
+    name = "base"
+    
+    @abstractmethod
+    def developer_key(self, developer: 'Developer', task_type: TaskType,
+                      idle_since: float) -> tuple:
+        """空閒開發者在該任務類型堆中的排序鍵（越小越先接單）"""
+    
+    @abstractmethod
+    def select_task_type(self, developer: 'Developer',
+                         backlogs: Dict[TaskType, list]) -> Optional[TaskType]:
+        """開發者空閒時選擇的積壓任務類型；沒有積壓時返回 None"""
+    
+    @staticmethod
+    def _most_urgent(task_types: List[TaskType], backlogs: Dict[TaskType, list]) -> TaskType:
+        """積壓堆頂按隊列規則最靠前的任務類型"""
+        return min(task_types, key=lambda t: backlogs[t][0][0])
+
+class FIFORouting(RoutingPolicy):
+    """先到先得：等待最久的空閒開發者接隊首任務，與共享 simpy.Store 等價"""
+    name = "fifo"
+    
+    def developer_key(self, developer, task_type, idle_since):
+        return (idle_since,)
+    
+    def select_task_type(self, developer, backlogs):
+        waiting = [t for t, queue in backlogs.items() if queue]
+        return self._most_urgent(waiting, backlogs) if waiting else None
+
+class SkillRouting(RoutingPolicy):
+    """技能優先：任務交給該類型技能倍率最高的空閒開發者"""
+    name = "skill"
+    
+    def developer_key(self, developer, task_type, idle_since):
+        return (-developer.skills.get(task_type, 1.0), idle_since)
+    
+    def select_task_type(self, developer, backlogs):
+        waiting = [t for t, queue in backlogs.items() if queue]
+        if not waiting:
+            return None
+        best_skill = max(developer.skills.get(t, 1.0) for t in waiting)
+        return self._most_urgent([t for t in waiting if developer.skills.get(t, 1.0) == best_skill],
+                                 backlogs)
+
+class SkillAwareDispatcher:
+    """
+    技能感知任務調度器
+    
+    可替代共享的 simpy.Store：PM 調用 put()，開發者調用 get(developer)。
+    每種任務類型維護一個空閒開發者最小堆（按策略的 developer_key 排序），
+    任務到達時 O(log n) 選出接單者；開發者重新忙碌後的舊堆項採用惰性刪除，
+    堆中失效項超過有效項時整堆壓縮，很少被派發的任務類型的堆不會無限增長。
+    沒有空閒開發者時任務按類型進入積壓堆，堆內按隊列規則排序（默認 FIFO）。
+    """
+    
+    def __init__(self, env: simpy.Environment, policy: Optional[RoutingPolicy] = None,
+                 discipline: Optional[QueueDiscipline] = None):
+        self.env = env
+        self.policy = policy or SkillRouting()
+        self.discipline = discipline or FIFODiscipline()
+        self.idle_heaps: Dict[TaskType, list] = {task_type: [] for task_type in TaskType}
+        self.backlogs: Dict[TaskType, list] = {task_type: [] for task_type in TaskType}
+        self._waiting: Dict['Developer', simpy.Event] = {}
+        self._idle_token: Dict['Developer', int] = {}
+        self._sequence = itertools.count()
+        self.dispatch_count = 0
+    
+    @property
+    def items(self) -> List[Task]:
+        """與 simpy.Store.items 相同的積壓任務視圖"""
+        return [task for queue in self.backlogs.values() for _, task in queue]
+    
+    def put(self, task: Task) -> simpy.Event:
+        """提交任務；返回已觸發的事件，以便與 Store.put 一樣 yield"""
+        developer = self._pop_idle(task.task_type)
+        if developer is None:
+            heapq.heappush(self.backlogs[task.task_type], (self.discipline.key(task), task))
+        else:
+            self._waiting.pop(developer).succeed(task)
+            self.dispatch_count += 1
+        
+        event = self.env.event()
+        event.succeed()
+        return event
+    
+    def get(self, developer: 'Developer') -> simpy.Event:
+        """開發者請求下一個任務"""
+        event = self.env.event()
+        task_type = self.policy.select_task_type(developer, self.backlogs)
+        if task_type is not None:
+            event.succeed(heapq.heappop(self.backlogs[task_type])[1])
+            self.dispatch_count += 1
+            return event
+        
+        # 登記為空閒：放入每種任務類型的堆
+        token = self._idle_token.get(developer, 0) + 1
+        self._idle_token[developer] = token
+        self._waiting[developer] = event
+        for task_type, heap in self.idle_heaps.items():
+            key = self.policy.developer_key(developer, task_type, self.env.now)
+            heapq.heappush(heap, (key, next(self._sequence), token, developer))
+            if len(heap) > 2 * len(self._waiting) + 8:
+                self._compact(heap)
+        return event
+    
+    def _is_idle(self, token: int, developer: 'Developer') -> bool:
+        return developer in self._waiting and self._idle_token[developer] == token
+    
+    def _compact(self, heap: list):
+        """刪除失效的堆項（攤還 O(1)：壓縮後有效項至少佔一半）"""
+        heap[:] = [entry for entry in heap if self._is_idle(entry[2], entry[3])]
+        heapq.heapify(heap)
+    
+    def _pop_idle(self, task_type: TaskType) -> Optional['Developer']:
+        heap = self.idle_heaps[task_type]
+        while heap:
+            _, _, token, developer = heapq.heappop(heap)
+            if self._is_idle(token, developer):
+                return developer
+        return None
 
 class SimulationMetrics:
     """模擬指標收集器"""
@@ -177,7 +493,8 @@ class SimulationMetrics:
         self.tasks_completed = []
         self.role_utilization = {}
         
-    def collect_data(self, pm: ProductManager, developers: List[Developer]) -> Dict[str, Any]:
+    def collect_data(self, pm: ProductManager, developers: List[Developer],
+                     accounting: Optional[FlowAccounting] = None) -> Dict[str, Any]:
         """收集模擬數據"""
         all_tasks = pm.created_tasks
         completed_tasks = []
@@ -202,9 +519,9 @@ class SimulationMetrics:
         # 計算每個角色的工作量
         role_workload = {}
         for dev in developers:
-            role_workload[dev.name] = len(dev.completed_tasks)
+            role_workload[dev.name] = role_workload.get(dev.name, 0) + len(dev.completed_tasks)
         
-        return {
+        results = {
             'total_tasks_created': total_tasks,
             'tasks_completed': completed_count,
             'completion_rate': completion_rate,
@@ -212,36 +529,81 @@ class SimulationMetrics:
             'role_workload': role_workload,
             'completed_tasks': completed_tasks
         }
+        
+        # 時間加權指標：按角色匯總的精確利用率、平均隊列長度和 WIP
+        if accounting:
+            now = pm.env.now
+            for name in role_workload:
+                role_devs = [dev for dev in developers if dev.name == name]
+                self.role_utilization[name] = accounting.team_utilization(now, role_devs)
+            results.update({
+                'role_utilization': self.role_utilization,
+                'team_utilization': accounting.team_utilization(now, developers),
+                'average_queue_length': accounting.wip.mean(now) - accounting.in_service.mean(now),
+                'average_wip': accounting.wip.mean(now),
+                'littles_law': accounting.littles_law(now)
+            })
+        
+        return results
 
-def run_basic_simulation(duration: int = 200, verbose: bool = True) -> Dict[str, Any]:
+def run_basic_simulation(duration: int = 200, verbose: bool = True,
+                         routing: Optional[RoutingPolicy] = None,
+                         discipline: Optional[QueueDiscipline] = None,
+                         arrival_interval: float = 8.0, replicas: int = 1,
+                         seed: Optional[int] = None,
+                         trace: Optional[Iterable[TraceEvent]] = None) -> Dict[str, Any]:
     """
     運行基本模擬
     
     Args:
         duration: 模擬持續時間（小時）
         verbose: 是否輸出詳細日誌
+        routing: 路由策略；None 表示所有開發者共享 FIFO 的 simpy.Store
+        discipline: 隊列規則；搶佔式規則不使用路由策略
+        arrival_interval: 平均任務創建間隔（小時）
+        replicas: 每種開發者角色的人數
+        seed: 隨機種子
+        trace: 到達事件序列（例如 TraceReader），替代按 arrival_interval 合成的到達
         
     Returns:
         模擬結果數據
     """
+    if seed is not None:
+        random.seed(seed)
+    
     # 創建模擬環境
     env = simpy.Environment()
     
     # 創建任務隊列
-    task_queue = simpy.Store(env)
-    
-    # 創建角色
-    pm = ProductManager(env, task_queue)
-    backend_dev = BackendDeveloper(env, task_queue)
-    frontend_dev = FrontendDeveloper(env, task_queue)
-    devops_engineer = DevOpsEngineer(env, task_queue)
-    
-    developers = [backend_dev, frontend_dev, devops_engineer]
+    preemptive = discipline is not None and discipline.preemptive
+    if preemptive:
+        task_queue = None  # 開發者創建後再建立 PreemptiveTeam
+    elif routing is not None:
+        task_queue = SkillAwareDispatcher(env, routing, discipline)
+    elif discipline is not None:
+        task_queue = DisciplinedTaskQueue(env, discipline)
+    else:
+        task_queue = simpy.Store(env)
+    
+    # 創建角色（共享一個時間加權賬本）
+    accounting = FlowAccounting(env.now)
+    developers = []
+    for _ in range(replicas):
+        developers.extend([
+            BackendDeveloper(env, task_queue, verbose=verbose, accounting=accounting),
+            FrontendDeveloper(env, task_queue, verbose=verbose, accounting=accounting),
+            DevOpsEngineer(env, task_queue, verbose=verbose, accounting=accounting)
+        ])
+    if preemptive:
+        task_queue = PreemptiveTeam(env, developers, discipline)
+    pm = ProductManager(env, task_queue, arrival_interval=arrival_interval, verbose=verbose,
+                        accounting=accounting, trace=trace)
     
     # 啟動進程
     env.process(pm.create_tasks())
-    for dev in developers:
-        env.process(dev.work())
+    if not preemptive:
+        for dev in developers:
+            env.process(dev.work())
     
     # 運行模擬
     if verbose:
@@ -256,10 +618,89 @@ def run_basic_simulation(duration: int = 200, verbose: bool = True) -> Dict[str,
     
     # 收集指標
     metrics = SimulationMetrics()
-    results = metrics.collect_data(pm, developers)
+    results = metrics.collect_data(pm, developers, accounting)
     
     return results
 
+def compare_routing_policies(duration: int = 2000, seeds: int = 20,
+                             arrival_intervals: List[float] = (8.0, 5.0, 4.0),
+                             replicas: int = 1) -> pd.DataFrame:
+    """
+    比較 FIFO 與技能路由的平均週期時間
+    
+    兩種策略使用相同的隨機種子，節省比例 = 1 - 技能路由週期時間 / FIFO 週期時間。
+    """
+    rows = []
+    for interval in arrival_intervals:
+        cycle_times = {}
+        for policy in (FIFORouting(), SkillRouting()):
+            runs = [run_basic_simulation(duration, verbose=False, routing=policy,
+                                         arrival_interval=interval, replicas=replicas,
+                                         seed=seed)['average_cycle_time']
+                    for seed in range(seeds)]
+            cycle_times[policy.name] = float(np.mean(runs))
+        
+        rows.append({
+            'Arrival Interval (h)': interval,
+            'FIFO Cycle Time (h)': cycle_times['fifo'],
+            'Skill Cycle Time (h)': cycle_times['skill'],
+            'Saving (%)': (1 - cycle_times['skill'] / cycle_times['fifo']) * 100
+                          if cycle_times['fifo'] else 0.0
+        })
+    
+    return pd.DataFrame(rows)
+
+def compare_queue_disciplines(duration: int = 2000, seeds: int = 20,
+                              arrival_interval: float = 4.0,
+                              disciplines: Optional[List[Optional[QueueDiscipline]]] = None
+                              ) -> pd.DataFrame:
+    """
+    比較各隊列規則下每個優先級的 P95 週期時間
+    
+    disciplines 中的 None 表示原始的共享 FIFO simpy.Store。
+    """
+    if disciplines is None:
+        disciplines = [None, PriorityDiscipline(), ShortestComplexityFirst(),
+                       EarliestDeadlineFirst(), PreemptivePriority()]
+    
+    rows = []
+    for discipline in disciplines:
+        cycle_times = {priority: [] for priority in TaskPriority}
+        preemptions = 0
+        for seed in range(seeds):
+            results = run_basic_simulation(duration, verbose=False, discipline=discipline,
+                                           arrival_interval=arrival_interval, seed=seed)
+            for task in results['completed_tasks']:
+                cycle_times[task.priority].append(task.completed_at - task.created_at)
+                preemptions += task.preemptions
+        
+        row = {'Discipline': discipline.name if discipline else 'store_fifo'}
+        for priority in reversed(TaskPriority):
+            values = cycle_times[priority]
+            row[f'{priority.name} P95 (h)'] = float(np.percentile(values, 95)) if values else float('nan')
+        all_values = [v for values in cycle_times.values() for v in values]
+        row['Mean (h)'] = float(np.mean(all_values)) if all_values else float('nan')
+        row['Preemptions'] = preemptions
+        rows.append(row)
+    
+    return pd.DataFrame(rows)
+
+def print_discipline_comparison(table: pd.DataFrame):
+    """打印各隊列規則的優先級延遲報告"""
+    print("\n" + "=" * 60)
+    print("PER-PRIORITY P95 CYCLE TIME BY QUEUE DISCIPLINE")
+    print("=" * 60)
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+    print("=" * 60)
+
+def print_routing_comparison(table: pd.DataFrame):
+    """打印技能路由節省報告"""
+    print("\n" + "=" * 60)
+    print("SKILL ROUTING VS FIFO")
+    print("=" * 60)
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+    print("=" * 60)
+
 def create_visualization(results: Dict[str, Any]):
     """創建可視化圖表"""
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
@@ -325,7 +766,20 @@ def print_summary_report(results: Dict[str, Any]):
     print(f"\n👥 Role Performance:")
     for role, count in results['role_workload'].items():
         percentage = count / results['tasks_completed'] * 100 if results['tasks_completed'] > 0 else 0
-        print(f"   • {role}: {count} tasks ({percentage:.1f}%)")
+        utilization = results.get('role_utilization', {}).get(role)
+        if utilization is None:
+            print(f"   • {role}: {count} tasks ({percentage:.1f}%)")
+        else:
+            print(f"   • {role}: {count} tasks ({percentage:.1f}%), utilization {utilization:.1%}")
+    
+    if 'littles_law' in results:
+        littles_law = results['littles_law']
+        print(f"\n⏱️ Flow Metrics (time-weighted):")
+        print(f"   • Team utilization: {results['team_utilization']:.1%}")
+        print(f"   • Average queue length: {results['average_queue_length']:.2f}")
+        print(f"   • Average WIP: {results['average_wip']:.2f}")
+        print(f"   • Little's law: L = {littles_law['L']:.2f}, "
+              f"λW = {littles_law['lambda_W']:.2f} (gap {littles_law['relative_gap']:.1%})")
     
     # 任務類型統計
     if results['completed_tasks']:
@@ -342,6 +796,25 @@ def print_summary_report(results: Dict[str, Any]):
     print("=" * 60)
 
 if __name__ == "__main__":
+    if '--compare-routing' in sys.argv:
+        print_routing_comparison(compare_routing_policies())
+        sys.exit(0)
+    if '--compare-disciplines' in sys.argv:
+        print_discipline_comparison(compare_queue_disciplines())
+        sys.exit(0)
+    if '--replay' in sys.argv:
+        # 回放記錄的 Issue 事件軌跡，模擬時長覆蓋最後一個事件所在的整天
+        arguments = sys.argv[sys.argv.index('--replay') + 1:]
+        if not arguments or arguments[0].startswith('--'):
+            print("Usage: python basic_simulation.py --replay TRACE (.jsonl/.csv, optionally .gz)")
+            sys.exit(2)
+        trace_path = arguments[0]
+        duration = (math.floor(trace_summary(trace_path)['end'] / 24) + 1) * 24
+        print(f"🐝 Replaying {trace_path} over {duration / 24:.0f} days")
+        print_summary_report(run_basic_simulation(duration=duration, verbose=False, seed=0,
+                                                  trace=TraceReader(trace_path)))
+        sys.exit(0)
+    
     # 運行基本模擬
     print("🐝 Bee Swarm Basic Simulation")
     print("Starting basic team collaboration simulation...")
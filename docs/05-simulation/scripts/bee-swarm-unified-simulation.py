@@ -5,12 +5,26 @@ Bee Swarm 真实事件驱动仿真
 
 import simpy
 import random
+import sys
 import time
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+import itertools
+import functools
+import math
+import os
+import json
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from dataclasses import dataclass, field, replace
+from typing import List, Dict, Any, Optional, Tuple
 from enum import Enum
+from pathlib import Path
 import colorama
 from colorama import Fore, Back, Style
+from simulation_profiler import ProfiledEnvironment, print_hot_path_report
+from simulation_stats import FlowAccounting, TimeWeightedValue
+from task_graph import TaskGraph, DagScheduler
+from role_registry import RoleRegistry
 
 # 初始化颜色支持
 colorama.init()
@@ -57,6 +71,8 @@ class VPSInstance:
     provider: str
     region: str
     cost_per_hour: float
+    cores: float = 1.0
+    memory_gb: float = 2.0
 
 @dataclass
 class Container:
@@ -81,6 +97,8 @@ class Role:
     webhook_calls: int = 0
     is_active: bool = False
     is_pm: bool = False  # 是否为产品经理
+    cpu_demand: float = 1.0  # 本地计算（构建、测试、Agent启动）时占用的CPU核数
+    memory_gb: float = 1.0  # 容器常驻内存
 
 @dataclass
 class Task:
@@ -91,6 +109,9 @@ class Task:
     status: str
     created_time: float
     issue_id: str
+    size: float = 1.0  # 开发工作量倍率（来自所属Issue）
+    started_time: Optional[float] = None
+    network_time: float = 0.0  # 唤醒和处理该任务途中的网络耗时（小时）
 
 @dataclass
 class GitHubIssue:
@@ -103,62 +124,866 @@ class GitHubIssue:
     status: str
     assigned_to: Optional[str] = None
     comments: List[Dict] = field(default_factory=list)
+    open_tasks: int = 0
+    closed_time: Optional[float] = None
+    task_templates: List[Dict[str, Any]] = field(default_factory=list)
+    size: float = 1.0
+    network_time: float = 0.0  # 交付关键路径上的网络耗时：PM处理 + 最后完成的任务（小时）
+
+@dataclass
+class SetupStep:
+    """前期配置步骤（配置依赖图中的一个节点）"""
+    id: str
+    event_type: EventType
+    duration: float
+    dependencies: List[str] = field(default_factory=list)
+    resource: Optional[str] = None  # 额外占用的云厂商并发名额：'vps' 或 'deploy'
+    role_id: Optional[str] = None  # 容器实例（角色副本）
+    vps_index: Optional[int] = None
+    started_time: Optional[float] = None
+    finished_time: Optional[float] = None
+
+@dataclass
+class SetupConfig:
+    """
+    前期配置并行度
+    
+    operators 为可同时执行配置步骤的运维人员数（1 名时退化为原来的串行配置），
+    vps_slots / deploy_slots 为云厂商同时开通VPS和部署容器的名额。
+    """
+    operators: int = 2
+    vps_slots: int = 2
+    deploy_slots: int = 3
+
+# 前期配置的VPS（非大厂）
+SETUP_VPS_CONFIGS = [
+    {'provider': 'Vultr', 'region': 'Tokyo', 'cost': 0.018, 'cores': 1, 'memory_gb': 2},
+    {'provider': 'Linode', 'region': 'Singapore', 'cost': 0.015, 'cores': 1, 'memory_gb': 2},
+    {'provider': 'DigitalOcean', 'region': 'NYC1', 'cost': 0.02, 'cores': 1, 'memory_gb': 2}
+]
+
+# 集群优化可选的VPS规格
+VPS_CATALOG = {
+    'small': {'provider': 'Vultr', 'region': 'Tokyo', 'cost': 0.018, 'cores': 1, 'memory_gb': 2},
+    'medium': {'provider': 'Linode', 'region': 'Singapore', 'cost': 0.036, 'cores': 2, 'memory_gb': 4},
+    'large': {'provider': 'DigitalOcean', 'region': 'NYC1', 'cost': 0.071, 'cores': 4, 'memory_gb': 8}
+}
+
+class PlacementStrategy(ABC):
+    """
+    容器放置策略基类
+    
+    place() 接收按部署顺序排列的 (容器实例, CPU需求, 内存需求) 和VPS规格列表，
+    返回容器实例到VPS序号的映射。内存是硬约束（不能超卖），CPU可以超卖，
+    超卖的VPS上本地计算会变慢。
+    """
+    name = 'base'
+    
+    @abstractmethod
+    def place(self, demands: List[Tuple[str, float, float]],
+              hosts: List[Dict[str, Any]]) -> Dict[str, int]:
+        """返回容器实例 → VPS序号"""
+    
+    @staticmethod
+    def _no_room(worker_id: str) -> ValueError:
+        return ValueError(f"没有内存足够的VPS放置容器 {worker_id}")
+
+class RoundRobinPlacement(PlacementStrategy):
+    """按部署顺序轮询VPS，跳过内存不足的VPS（不考虑规格差异）"""
+    name = 'round-robin'
+    
+    def place(self, demands, hosts):
+        free_memory = [host.get('memory_gb', 2) for host in hosts]
+        placement = {}
+        cursor = 0
+        for worker_id, _cpu, memory in demands:
+            for offset in range(len(hosts)):
+                index = (cursor + offset) % len(hosts)
+                if free_memory[index] >= memory:
+                    break
+            else:
+                raise self._no_room(worker_id)
+            free_memory[index] -= memory
+            placement[worker_id] = index
+            cursor = index + 1
+        return placement
+
+class BinPackingPlacement(PlacementStrategy):
+    """首次适应递减：内存需求大的容器优先，依次装入容量最大的VPS，使用尽量少的VPS"""
+    name = 'bin-packing'
+    
+    def place(self, demands, hosts):
+        free_memory = [host.get('memory_gb', 2) for host in hosts]
+        order = sorted(range(len(hosts)), key=lambda index: -free_memory[index])
+        placement = {}
+        for worker_id, _cpu, memory in sorted(demands, key=lambda demand: -demand[2]):
+            index = next((index for index in order if free_memory[index] >= memory), None)
+            if index is None:
+                raise self._no_room(worker_id)
+            free_memory[index] -= memory
+            placement[worker_id] = index
+        return placement
+
+class SpreadPlacement(PlacementStrategy):
+    """分散放置：每个容器放到加入后CPU超卖比例最低的VPS上"""
+    name = 'spread'
+    
+    def place(self, demands, hosts):
+        free_memory = [host.get('memory_gb', 2) for host in hosts]
+        cpu = [0.0] * len(hosts)
+        placement = {}
+        for worker_id, cpu_demand, memory in demands:
+            candidates = [index for index in range(len(hosts)) if free_memory[index] >= memory]
+            if not candidates:
+                raise self._no_room(worker_id)
+            index = min(candidates, key=lambda index: (cpu[index] + cpu_demand) / hosts[index].get('cores', 1))
+            free_memory[index] -= memory
+            cpu[index] += cpu_demand
+            placement[worker_id] = index
+        return placement
+
+@dataclass
+class FleetConfig:
+    """
+    VPS与容器集群形态
+    
+    vps 为VPS规格列表（provider、region、每小时成本 cost、CPU核数 cores、内存 memory_gb），
+    role_replicas 为每个角色的容器副本数（默认1）。同一角色的副本共享该角色的任务队列。
+    容器按副本轮次（先部署每个角色的第一个副本）交给 placement_strategy 放置；
+    没有放置容器的VPS不会开通，也不计成本。
+    """
+    vps: List[Dict[str, Any]] = field(default_factory=lambda: [dict(c) for c in SETUP_VPS_CONFIGS])
+    role_replicas: Dict[str, int] = field(default_factory=dict)
+    placement_strategy: PlacementStrategy = field(default_factory=RoundRobinPlacement)
+    label: str = 'default'
+    
+    def replicas(self, role_id: str) -> int:
+        return self.role_replicas.get(role_id, 1)
+    
+    def workers(self, role_ids: List[str]) -> List[Tuple[str, str]]:
+        """展开为 (角色, 容器实例) 列表；第一个副本的实例名与角色相同"""
+        rounds = max((self.replicas(role_id) for role_id in role_ids), default=0)
+        return [(role_id, role_id if replica == 1 else f"{role_id}-{replica}")
+                for replica in range(1, rounds + 1)
+                for role_id in role_ids if replica <= self.replicas(role_id)]
+    
+    def placement(self, demands: List[Tuple[str, float, float]]) -> Dict[str, int]:
+        """返回容器实例到VPS序号的映射；内存不足时抛出 ValueError"""
+        return self.placement_strategy.place(demands, self.vps)
+
+# 默认任务模板：单Issue演示使用全部模板，负载模式按权重抽样
+DEFAULT_TASK_TEMPLATES = [
+    {'title': '后端API设计', 'capability': 'backend', 'weight': 1.0},
+    {'title': '数据库设计', 'capability': 'backend', 'weight': 1.0},
+    {'title': '前端注册界面', 'capability': 'frontend', 'weight': 1.0},
+    {'title': '前端登录界面', 'capability': 'frontend', 'weight': 1.0},
+    {'title': '部署配置', 'capability': 'devops', 'weight': 1.0}
+]
+
+# 默认4角色团队在 roles/ 下的目录名（按容器部署顺序）
+DEFAULT_ROLE_KEYS = ('product_manager', 'backend_developer', 'frontend_developer', 'devops_engineer')
+
+@dataclass
+class WorkloadConfig:
+    """
+    多Issue负载配置
+    
+    Issue按泊松过程到达（平均间隔 issue_interval 小时），每个Issue的任务数在
+    tasks_per_issue 区间内均匀抽取，任务按模板权重抽样，开发工作量乘以
+    对数正态分布的Issue规模倍率。
+    
+    trigger_mode 决定角色如何被唤醒：'cron' 为 GitHub Actions 定时触发；
+    'push' 为 GitHub 事件（Issue创建、任务分配、PR创建）立即推送Webhook，
+    debounce 窗口内同一角色的推送合并为一次，push_loss_rate 为投递丢失率；
+    'hybrid' 在推送之外保留间隔为 hybrid_cron_interval 的定时触发兜底。
+    """
+    issue_interval: float = 36.0
+    duration: float = 1000.0  # 配置阶段之后的运行时间（小时）
+    max_issues: Optional[int] = None
+    tasks_per_issue: Tuple[int, int] = (2, 6)
+    issue_size_sigma: float = 0.3
+    cron_interval: float = 0.5  # GitHub Actions 定时触发间隔（小时）
+    trigger_mode: str = 'cron'
+    debounce: float = 0.05
+    push_loss_rate: float = 0.01
+    hybrid_cron_interval: float = 2.0
+    task_templates: List[Dict[str, Any]] = field(
+        default_factory=lambda: [dict(t) for t in DEFAULT_TASK_TEMPLATES])
+
+@dataclass
+class GitHubAPIConfig:
+    """
+    GitHub API 限流配置（时间单位：小时）
+    
+    主配额和内容写入的次级限流均建模为令牌桶，配额为 None 表示不限流。
+    batch_size 为单次请求合并的读/写操作数（例如用一次 GraphQL 请求完成多条
+    评论和PR写入）。被限流时先按指数退避重试，超过 max_retries 后按
+    Retry-After 等待令牌恢复。
+    """
+    hourly_quota: Optional[int] = 5000
+    burst: Optional[int] = None  # 默认等于 hourly_quota
+    write_quota_per_hour: Optional[int] = 500
+    write_burst: int = 80
+    concurrency: int = 3
+    batch_size: int = 1
+    max_retries: int = 3
+    backoff_base: float = 1 / 60
+    max_backoff: float = 0.25
+    # 每项操作的API请求数（负载模式）
+    poll_reads: int = 5  # 每次定时触发时每个角色轮询Issue/PR/评论
+    pr_writes: int = 4  # 推送分支、创建PR、添加标签、关联Issue
+    issue_reads: int = 1
+    prd_writes: int = 1
+    task_writes: int = 2  # 创建子Issue并分配
+
+class TokenBucket:
+    """令牌桶：按 rate 连续补充，最多累积 capacity 个令牌（惰性计算，无需仿真进程）"""
+    
+    def __init__(self, rate: float, capacity: float, now: float = 0.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_time = now
+    
+    def time_until(self, now: float, count: float = 1) -> float:
+        """补充令牌，返回还需等待多久才有 count 个令牌"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_time) * self.rate)
+        self.last_time = now
+        missing = count - self.tokens
+        return missing / self.rate if missing > 1e-9 else 0.0
+    
+    def consume(self, count: float = 1):
+        self.tokens -= count
+
+class GitHubRateLimiter:
+    """GitHub API 客户端模型：令牌桶限流、退避重试和请求批处理"""
+    
+    def __init__(self, env: simpy.Environment, config: GitHubAPIConfig, seed: int = RANDOM_SEED):
+        self.env = env
+        self.config = config
+        # 独立随机数流，使不同限流配置下的工作负载保持一致
+        self.random = random.Random(seed)
+        self.core = None
+        self.writes = None
+        if config.hourly_quota:
+            self.core = TokenBucket(config.hourly_quota, config.burst or config.hourly_quota, env.now)
+        if config.write_quota_per_hour:
+            self.writes = TokenBucket(config.write_quota_per_hour, config.write_burst, env.now)
+        
+        self.requests = 0
+        self.saved_requests = 0  # 批处理节省的请求数
+        self.throttled = 0  # 被限流拒绝的尝试次数
+        self.delay = 0.0  # 因限流累计等待的时间（小时）
+    
+    def acquire(self, reads: int = 0, writes: int = 0):
+        """发送 reads 个读操作和 writes 个写操作，按 batch_size 合并为请求，返回请求数"""
+        batch = self.config.batch_size
+        read_requests = -(-reads // batch)
+        write_requests = -(-writes // batch)
+        self.saved_requests += reads + writes - read_requests - write_requests
+        
+        started = self.env.now
+        for _ in range(read_requests):
+            yield from self._acquire_one(is_write=False)
+        for _ in range(write_requests):
+            yield from self._acquire_one(is_write=True)
+        self.delay += self.env.now - started
+        return read_requests + write_requests
+    
+    def _acquire_one(self, is_write: bool):
+        buckets = [bucket for bucket in (self.core, self.writes if is_write else None) if bucket]
+        attempt = 0
+        while True:
+            now = self.env.now
+            wait = max([bucket.time_until(now) for bucket in buckets], default=0.0)
+            if wait <= 0:
+                for bucket in buckets:
+                    bucket.consume()
+                self.requests += 1
+                return
+            
+            self.throttled += 1
+            if attempt < self.config.max_retries:
+                # 指数退避加随机抖动
+                backoff = min(self.config.max_backoff, self.config.backoff_base * 2 ** attempt)
+                delay = backoff * self.random.uniform(0.5, 1.0)
+            else:
+                # 按 Retry-After / X-RateLimit-Reset 等待令牌恢复
+                delay = wait
+            attempt += 1
+            yield self.env.timeout(delay)
+
+class ScalingPolicy:
+    """AI工具池扩缩容策略基类；interval 为检查间隔（小时），None 表示不扩缩容"""
+    name = "base"
+    interval: Optional[float] = None
+    
+    def target_capacity(self, pool: 'AIToolPool', now: float) -> int:
+        return pool.capacity
+
+class FixedScaling(ScalingPolicy):
+    """固定并发数"""
+    name = "fixed"
+
+class QueueThresholdScaling(ScalingPolicy):
+    """排队数达到 scale_up_queue 时扩容，无排队且空闲槽位不少于 scale_down_idle 时缩容"""
+    name = "queue-threshold"
+    
+    def __init__(self, scale_up_queue: int = 2, scale_down_idle: int = 1,
+                 step: int = 1, interval: float = 0.25, cooldown: float = 1.0):
+        self.scale_up_queue = scale_up_queue
+        self.scale_down_idle = scale_down_idle
+        self.step = step
+        self.interval = interval
+        self.cooldown = cooldown
+    
+    def target_capacity(self, pool: 'AIToolPool', now: float) -> int:
+        if now - pool.last_scaled < self.cooldown:
+            return pool.capacity
+        if pool.queue_length >= self.scale_up_queue:
+            return pool.capacity + self.step
+        if pool.queue_length == 0 and pool.idle_slots >= self.scale_down_idle:
+            return pool.capacity - self.step
+        return pool.capacity
+
+class ScheduledScaling(ScalingPolicy):
+    """按一天中的时段设定并发数，schedule 为 [(起始小时, 并发数), ...]"""
+    name = "scheduled"
+    
+    def __init__(self, schedule: List[Tuple[float, int]], interval: float = 0.5):
+        self.schedule = sorted(schedule)
+        self.interval = interval
+    
+    def target_capacity(self, pool: 'AIToolPool', now: float) -> int:
+        hour = now % 24
+        capacity = self.schedule[-1][1]  # 午夜前沿用最后一个时段
+        for start, slots in self.schedule:
+            if hour >= start:
+                capacity = slots
+        return capacity
+
+@dataclass
+class AIToolPoolConfig:
+    """单个AI工具的并发池配置；成本按已配置槽位时长和实际调用时长计费"""
+    tool: str
+    initial: int = 1
+    min_capacity: int = 1
+    max_capacity: int = 8
+    cost_per_slot_hour: float = 0.5
+    cost_per_busy_hour: float = 2.0
+    policy: ScalingPolicy = field(default_factory=FixedScaling)
+
+def default_ai_pools() -> List[AIToolPoolConfig]:
+    """
+    默认配置：产品经理使用 Claude Code，开发角色共享 Gemini CLI
+    
+    共 3 个槽位（Claude 1 + Gemini 2）。引入工具池之前所有角色共享一个容量为 2 的
+    ai_tools 资源，因此默认运行的排队时间和交付周期与之前的结果不可直接比较。
+    """
+    return [
+        AIToolPoolConfig('Claude Code', initial=1, cost_per_slot_hour=1.0, cost_per_busy_hour=6.0),
+        AIToolPoolConfig('Gemini CLI', initial=2, cost_per_slot_hour=0.5, cost_per_busy_hour=2.0)
+    ]
+
+class AIToolPool:
+    """
+    可扩缩容的AI工具并发池
+    
+    simpy.Container 的存量表示空闲槽位：调用前取出一个，调用后放回。扩容时直接
+    放入新槽位；缩容时立即回收空闲槽位，忙碌槽位在释放时退役。
+    """
+    
+    def __init__(self, env: simpy.Environment, config: AIToolPoolConfig):
+        self.env = env
+        self.config = config
+        self.capacity = config.initial
+        self.slots = simpy.Container(env, capacity=config.max_capacity, init=config.initial)
+        self.in_use = 0
+        self.last_scaled = env.now
+        self.scale_events = 0
+        self.calls = 0
+        self.waits = []
+        self.provisioned = TimeWeightedValue(env.now, config.initial)
+        self.busy = TimeWeightedValue(env.now)
+    
+    @property
+    def queue_length(self) -> int:
+        return len(self.slots.get_queue)
+    
+    @property
+    def idle_slots(self) -> int:
+        return self.slots.level
+    
+    def acquire(self):
+        requested = self.env.now
+        yield self.slots.get(1)
+        self.in_use += 1
+        self.calls += 1
+        self.busy.update(self.env.now, self.in_use)
+        self.waits.append(self.env.now - requested)
+    
+    def release(self):
+        self.in_use -= 1
+        self.busy.update(self.env.now, self.in_use)
+        if self.in_use + self.slots.level < self.capacity:
+            self.slots.put(1)
+    
+    def set_capacity(self, target: int):
+        target = max(self.config.min_capacity, min(self.config.max_capacity, target))
+        if target == self.capacity:
+            return
+        if target > self.capacity:
+            # 先补足此前缩容时尚未退役的忙碌槽位
+            missing = target - (self.in_use + self.slots.level)
+            if missing > 0:
+                self.slots.put(missing)
+        else:
+            retire = min(self.capacity - target, self.slots.level)
+            if retire:
+                self.slots.get(retire)
+        self.capacity = target
+        self.last_scaled = self.env.now
+        self.scale_events += 1
+        self.provisioned.update(self.env.now, target)
+    
+    def autoscale(self):
+        """按策略定期调整并发数的仿真进程"""
+        policy = self.config.policy
+        while True:
+            self.set_capacity(policy.target_capacity(self, self.env.now))
+            yield self.env.timeout(policy.interval)
+    
+    def stats(self, now: float) -> Dict[str, Any]:
+        ordered = sorted(self.waits)
+        slot_hours = self.provisioned.area_until(now)
+        busy_hours = self.busy.area_until(now)
+        cost = slot_hours * self.config.cost_per_slot_hour + busy_hours * self.config.cost_per_busy_hour
+        duration = now - self.provisioned.start_time
+        return {
+            'policy': self.config.policy.name,
+            'calls': self.calls,
+            'mean_capacity': self.provisioned.mean(now),
+            'mean_wait': sum(ordered) / len(ordered) if ordered else 0.0,
+            'p95_wait': _percentile(ordered, 95),
+            'utilization': busy_hours / slot_hours if slot_hours > 0 else 0.0,
+            'scale_events': self.scale_events,
+            'cost': cost,
+            'cost_per_hour': cost / duration if duration > 0 else 0.0
+        }
+
+@dataclass
+class ContainerLifecycleConfig:
+    """
+    容器内AI Agent的生命周期配置（时间单位：小时）
+    
+    会话结束后Agent进程保持驻留 idle_timeout 小时，期间再次唤醒为热启动，
+    否则为冷启动（启动Agent进程并重新加载Prompt和上下文）。keep_warm 为每个
+    角色常驻的Agent数（大于0时始终热启动）。驻留的Agent占用VPS资源，按
+    cost_per_resident_hour 计费。默认值等价于每次唤醒固定耗时0.1-0.3小时。
+    """
+    idle_timeout: float = 0.0
+    cold_start: Tuple[float, float] = (0.1, 0.3)
+    warm_start: Tuple[float, float] = (0.01, 0.05)
+    keep_warm: Dict[str, int] = field(default_factory=dict)
+    cost_per_resident_hour: float = 0.006
+
+class AgentLifecycle:
+    """单个角色的Agent驻留状态；驻留时长在唤醒/休眠时惰性累计，无需仿真进程"""
+    
+    def __init__(self, config: ContainerLifecycleConfig, keep_warm: int, now: float):
+        self.config = config
+        self.keep_warm = keep_warm
+        self.start_time = now
+        self.session_start = None
+        self.idle_since = None
+        self.resident_hours = 0.0
+        self.cold_starts = 0
+        self.warm_starts = 0
+        self.wakeup_time = 0.0
+    
+    def wake(self, now: float) -> bool:
+        """开始会话，返回是否为冷启动"""
+        if self.keep_warm > 0:
+            cold = False
+        elif self.idle_since is not None and now - self.idle_since <= self.config.idle_timeout:
+            cold = False
+            self.resident_hours += now - self.idle_since
+        else:
+            cold = True
+            if self.idle_since is not None:
+                self.resident_hours += self.config.idle_timeout
+        self.session_start = now
+        self.idle_since = None
+        if cold:
+            self.cold_starts += 1
+        else:
+            self.warm_starts += 1
+        return cold
+    
+    def sleep(self, now: float):
+        """结束会话，Agent进入空闲驻留"""
+        if self.session_start is None:
+            return
+        if self.keep_warm == 0:
+            self.resident_hours += now - self.session_start
+        self.session_start = None
+        self.idle_since = now
+    
+    def total_resident_hours(self, now: float) -> float:
+        if self.keep_warm > 0:
+            return self.keep_warm * (now - self.start_time)
+        hours = self.resident_hours
+        if self.session_start is not None:
+            hours += now - self.session_start
+        elif self.idle_since is not None:
+            hours += min(now - self.idle_since, self.config.idle_timeout)
+        return hours
+
+@dataclass
+class LLMToolConfig:
+    """
+    AI工具的令牌吞吐量、价格和提示缓存模型（速率单位：令牌/秒，价格单位：美元/百万令牌）
+    
+    一次开发会话为 turns 轮 Agent 调用：每轮输入为系统前缀（工具系统提示 + 角色Prompt）
+    加上此前所有轮次的工具结果和输出，模型生成 output_tokens_per_turn 个令牌，之后在容器内
+    执行工具（读写文件、构建、测试）tool_execution_seconds 秒。第 1 轮是否命中系统前缀和
+    第 k 轮（k ≥ 2）是否命中上一轮的完整输入由 cache_strategy 决定：
+    - 'none'：不使用提示缓存
+    - 'ttl'：系统前缀在距该容器上次调用不超过 cache_ttl 小时时按 cache_hit_rate 命中；
+      相邻两轮的间隔（turn_gap）不超过 cache_ttl 时后续各轮命中上一轮的输入，否则缓存
+      在轮次之间过期，每轮都重新处理全部上下文；未命中的输入写入缓存，按
+      cache_write_multiplier 倍输入价格计费
+    - 'explicit'：显式上下文缓存，系统前缀和上一轮的输入始终命中，按 storage_price_per_mtok_hour
+      支付存储费用
+    命中缓存的输入按 cached_input_price 计费，预填充速度为普通输入的 cached_speedup 倍。
+    默认值为公开价格和实测速率的近似值，可按实际账单校准。
+    """
+    tool: str
+    input_tokens_per_second: float = 4000.0
+    output_tokens_per_second: float = 60.0
+    input_price: float = 3.0
+    output_price: float = 15.0
+    cached_input_price: float = 0.3
+    system_prompt_tokens: int = 12000
+    cache_strategy: str = 'ttl'
+    cache_ttl: float = 5 / 60
+    cache_hit_rate: float = 0.9
+    cache_write_multiplier: float = 1.25
+    storage_price_per_mtok_hour: float = 0.0
+    cached_speedup: float = 10.0
+    turns_per_task: int = 40  # 规模为 1 的任务的平均调用轮数
+    tool_result_tokens: int = 2000
+    output_tokens_per_turn: int = 800
+    call_overhead_seconds: float = 2.0
+    tool_execution_seconds: float = 240.0
+    
+    def turn_gap(self) -> float:
+        """会话内相邻两次模型调用的间隔（小时）：调用开销 + 生成输出 + 工具执行，不含预填充"""
+        return (self.call_overhead_seconds + self.output_tokens_per_turn / self.output_tokens_per_second +
+                self.tool_execution_seconds) / 3600
+    
+    def turns_cached(self) -> bool:
+        """会话内第 k 轮（k ≥ 2）是否命中上一轮的输入"""
+        if self.cache_strategy == 'ttl':
+            return self.turn_gap() <= self.cache_ttl
+        return self.cache_strategy == 'explicit'
+    
+    def session_usage(self, prefix_tokens: int, turns: int, prefix_cached: bool) -> Dict[str, float]:
+        """turns 轮会话的令牌用量（闭式求和）；turns 为 0 时只加载系统前缀"""
+        if turns == 0:
+            return {'input': prefix_tokens, 'cached': prefix_tokens if prefix_cached else 0, 'output': 0}
+        n, results, outputs = turns, self.tool_result_tokens, self.output_tokens_per_turn
+        # 第 k 轮输入 = 前缀 + k 次工具结果 + (k-1) 次输出
+        total = n * prefix_tokens + results * n * (n + 1) / 2 + outputs * n * (n - 1) / 2
+        cached = float(prefix_tokens if prefix_cached else 0)
+        if self.turns_cached():
+            cached += (n - 1) * prefix_tokens + results * (n - 1) * n / 2 + outputs * (n - 1) * (n - 2) / 2
+        return {'input': total, 'cached': cached, 'output': n * outputs}
+    
+    def session_time(self, usage: Dict[str, float], turns: int) -> float:
+        """会话耗时（小时）：预填充 + 生成 + 调用开销 + 工具执行"""
+        uncached = usage['input'] - usage['cached']
+        seconds = (uncached / self.input_tokens_per_second +
+                   usage['cached'] / (self.input_tokens_per_second * self.cached_speedup) +
+                   usage['output'] / self.output_tokens_per_second +
+                   max(1, turns) * self.call_overhead_seconds +
+                   turns * self.tool_execution_seconds)
+        return seconds / 3600
+    
+    def session_cost(self, usage: Dict[str, float]) -> float:
+        """会话的令牌费用（美元），不含显式缓存的存储费用"""
+        uncached = usage['input'] - usage['cached']
+        write = self.cache_write_multiplier if self.cache_strategy == 'ttl' else 1.0
+        return (uncached * self.input_price * write + usage['cached'] * self.cached_input_price +
+                usage['output'] * self.output_price) / 1e6
+
+def default_llm_tools() -> List[LLMToolConfig]:
+    """默认配置：Claude Code（Sonnet 级模型）和 Gemini CLI（Pro 级模型）"""
+    return [
+        # Claude 没有按存储计费的显式缓存，按每5分钟一次缓存读取保活折算
+        LLMToolConfig('Claude Code', storage_price_per_mtok_hour=3.6),
+        LLMToolConfig('Gemini CLI', input_tokens_per_second=6000.0, output_tokens_per_second=100.0,
+                      input_price=1.25, output_price=10.0, cached_input_price=0.31,
+                      system_prompt_tokens=8000, cache_write_multiplier=1.0,
+                      storage_price_per_mtok_hour=4.5)
+    ]
+
+def estimate_tokens(text: str) -> int:
+    """粗略估计令牌数：中日韩字符约每字 1 个令牌，其余约每 4 个字符 1 个令牌"""
+    cjk = sum(1 for char in text if '\u3040' <= char <= '\u9fff')
+    return cjk + (len(text) - cjk + 3) // 4
+
+@functools.lru_cache(maxsize=None)
+def prompt_file_tokens(path: Optional[Path], fallback: str = '') -> int:
+    """角色Prompt（roles/<目录>/prompt.md）的令牌数；文件不存在时按 fallback 估算"""
+    if path is not None:
+        try:
+            return estimate_tokens(path.read_text(encoding='utf-8'))
+        except OSError:
+            pass
+    return estimate_tokens(fallback)
+
+def default_role_registry() -> RoleRegistry:
+    """
+    默认的4角色团队（产品经理优先），角色定义来自 roles/*/role.yaml
+    
+    完整的角色名册可用 RoleRegistry.discover() 加载。
+    """
+    return RoleRegistry.discover(include=list(DEFAULT_ROLE_KEYS))
+
+# 区域间往返时延（毫秒，对称）；GitHub API 和 Webhook 从美国东部（Virginia）发出
+REGION_RTT_MS = {
+    ('Tokyo', 'Singapore'): 70.0,
+    ('Tokyo', 'NYC1'): 165.0,
+    ('Singapore', 'NYC1'): 235.0,
+    ('Tokyo', 'Virginia'): 150.0,
+    ('Singapore', 'Virginia'): 215.0,
+    ('NYC1', 'Virginia'): 8.0
+}
+
+@dataclass
+class NetworkConfig:
+    """
+    跨区域网络配置（时延单位：毫秒，带宽单位：Mbps，数据量单位：KB/MB）
+    
+    角色之间的消息都经由 GitHub 传递：发送方写入（API往返）→ GitHub 投递
+    Webhook（经接收方容器的 Cloudflare Tunnel）→ 接收方轮询读取（API往返）。
+    每个容器的隧道是一条吞吐量为 tunnel_mbps 的共享链路（TunnelLink），
+    同时到达的 Webhook 和消息在隧道上排队传输。
+    GitHub API 请求串行发送，每个请求一次往返。代码拉取/推送受 TCP 窗口限制，
+    吞吐量为 min(link_mbps, tcp_window_kb / RTT)，距离越远越慢。
+    enabled=False 时所有网络耗时为 0。
+    """
+    rtt_ms: Dict[Tuple[str, str], float] = field(default_factory=lambda: dict(REGION_RTT_MS))
+    github_region: str = 'Virginia'
+    local_rtt_ms: float = 1.0
+    tunnel_mbps: float = 20.0
+    link_mbps: float = 200.0
+    tcp_window_kb: float = 256.0
+    webhook_payload_kb: float = 25.0
+    api_payload_kb: float = 10.0
+    message_kb: float = 5.0
+    repo_sync_mb: float = 150.0  # 每个开发任务拉取和推送代码的数据量
+    enabled: bool = True
+    
+    def rtt(self, a: str, b: str) -> float:
+        """往返时延（小时）"""
+        if not self.enabled:
+            return 0.0
+        if a == b:
+            return self.local_rtt_ms / 3.6e6
+        rtt = self.rtt_ms.get((a, b), self.rtt_ms.get((b, a)))
+        if rtt is None:
+            raise ValueError(f"未配置区域 {a} 与 {b} 之间的时延")
+        return rtt / 3.6e6
+    
+    def _transfer(self, size_kb: float, mbps: float) -> float:
+        return size_kb * 8 / 1000 / mbps / 3600 if self.enabled else 0.0
+    
+    def request_time(self, region: str) -> float:
+        """一次 GitHub API 请求的耗时（小时）"""
+        return self.rtt(region, self.github_region) + self._transfer(self.api_payload_kb, self.link_mbps)
+    
+    def tunnel_time(self, size_kb: float) -> float:
+        """size_kb 的载荷独占一条隧道时的传输时间（小时）"""
+        return self._transfer(size_kb, self.tunnel_mbps)
+    
+    def webhook_latency(self, region: str) -> float:
+        """GitHub 投递 Webhook 到达容器隧道入口的单程时延（小时，不含隧道传输）"""
+        return self.rtt(self.github_region, region) / 2
+    
+    def message_latency(self, source: str, target: str) -> float:
+        """角色间直接消息（评论、答复）经 GitHub 中转的单程时延（小时，不含隧道传输）"""
+        return (self.rtt(source, self.github_region) + self.rtt(self.github_region, target)) / 2
+    
+    def bulk_time(self, region: str, size_mb: float) -> float:
+        """容器与 GitHub 之间批量传输的耗时（小时），吞吐量受 TCP 窗口 / RTT 限制"""
+        rtt = self.rtt(region, self.github_region)
+        if rtt <= 0:
+            return 0.0
+        window_mbps = self.tcp_window_kb * 8 / 1000 / (rtt * 3600)
+        return rtt + self._transfer(size_mb * 1000, min(self.link_mbps, window_mbps))
+
+class TunnelLink:
+    """
+    一个容器的 Cloudflare Tunnel：先到先服务的单链路，经过它的 Webhook 和消息共享吞吐量
+    
+    每次传输的时长在到达时已知，按到达顺序惰性计算完成时间，无需仿真进程；
+    隧道空闲时的耗时与单独计算传输时间完全相同。
+    """
+    
+    def __init__(self):
+        self.busy_until = 0.0
+        self.transfers = 0
+        self.busy_time = 0.0
+        self.queue_time = 0.0
+    
+    def delay(self, now: float, latency: float, transfer: float) -> float:
+        """载荷经 latency 到达隧道，排在之前的传输之后再传输 transfer；返回总耗时"""
+        arrival = now + latency
+        wait = max(0.0, self.busy_until - arrival)
+        self.busy_until = arrival + wait + transfer
+        self.transfers += 1
+        self.busy_time += transfer
+        self.queue_time += wait
+        return latency + wait + transfer
 
 class BeeSwarmRealisticSimulation:
     """Bee Swarm 真实事件驱动仿真"""
     
-    def __init__(self):
-        self.env = simpy.Environment()
-        self.random = random.Random(RANDOM_SEED)
+    def __init__(self, profile: bool = False, workload: Optional[WorkloadConfig] = None,
+                 verbose: bool = True, seed: int = RANDOM_SEED,
+                 github: Optional[GitHubAPIConfig] = None,
+                 ai_pools: Optional[List[AIToolPoolConfig]] = None,
+                 lifecycle: Optional[ContainerLifecycleConfig] = None,
+                 setup: Optional[SetupConfig] = None,
+                 fleet: Optional[FleetConfig] = None,
+                 network: Optional[NetworkConfig] = None,
+                 llm_tools: Optional[List[LLMToolConfig]] = None,
+                 registry: Optional[RoleRegistry] = None):
+        # profile=True 时使用带剖析功能的环境，运行结束后输出热点报告
+        # workload 为空时运行单Issue演示，否则按 WorkloadConfig 持续生成Issue
+        self.profile = profile
+        self.workload = workload
+        self.verbose = verbose
+        self.duration = workload.duration if workload else SIMULATION_TIME
+        self.env = ProfiledEnvironment() if profile else simpy.Environment()
+        self.random = random.Random(seed)
+        # Issue到达流使用独立随机数流，配置不同的运行可以共享同一工作负载
+        self.workload_random = random.Random(seed + 1)
+        # 配置步骤工期使用独立随机数流，集群形态（步骤数）不影响后续工作时间的抽样
+        self.setup_random = random.Random(seed + 3)
+        # 提示缓存命中抽样使用独立随机数流，缓存策略不影响其他抽样
+        self.llm_random = random.Random(seed + 4)
+        if profile:
+            self.log_event = self.env.profile_events(self.log_event)
         
         # 创建资源
-        self.vps_preparation = simpy.Resource(self.env, capacity=2)
-        self.container_deployment = simpy.Resource(self.env, capacity=3)
-        self.github_api = simpy.Resource(self.env, capacity=3)
-        self.ai_tools = simpy.Resource(self.env, capacity=2)
+        self.setup_config = setup or SetupConfig()
+        self.vps_preparation = simpy.Resource(self.env, capacity=self.setup_config.vps_slots)
+        self.container_deployment = simpy.Resource(self.env, capacity=self.setup_config.deploy_slots)
+        self.operators = simpy.PriorityResource(self.env, capacity=self.setup_config.operators)
+        self.operator_busy_time = 0.0
+        self.github_config = github or GitHubAPIConfig()
+        self.github_api = simpy.Resource(self.env, capacity=self.github_config.concurrency)
+        self.github = GitHubRateLimiter(self.env, self.github_config, seed)
+        # 每个AI工具一个并发池（Claude Code / Gemini CLI）
+        self.ai_pools = {config.tool: AIToolPool(self.env, config)
+                         for config in (ai_pools or default_ai_pools())}
         
         # 基础设施
         self.vps_instances = []
         self.containers = []
+        self.containers_by_role = {}
+        self.setup_steps = {}
+        self.setup_start_time = None
         
-        # 创建 AI 角色 (产品经理优先)
+        # 创建 AI 角色（来自角色注册表，产品经理优先）
+        self.registry = registry or default_role_registry()
+        if self.registry.pm is None:
+            raise ValueError("角色注册表中没有产品经理角色")
+        self.pm_id = self.registry.pm.role_id
         self.roles = {
-            'pm-01': Role(
-                name='Product Manager AI',
-                container_id='pm-01',
-                ai_tool='Claude Code',
-                prompt_template="你是一个产品经理AI，负责需求分析、任务分配和项目协调。使用Claude Code进行PRD编写和任务分解。",
-                default_tasks=['需求分析', '竞品调研', '用户反馈分析'],
-                is_pm=True
-            ),
-            'be-01': Role(
-                name='Backend Developer AI',
-                container_id='be-01',
-                ai_tool='Gemini CLI',
-                prompt_template="你是一个后端开发AI，负责API设计、数据库设计和系统架构。使用Gemini CLI进行代码开发。",
-                default_tasks=['API性能优化', '数据库维护', '系统监控']
-            ),
-            'fe-01': Role(
-                name='Frontend Developer AI',
-                container_id='fe-01',
-                ai_tool='Gemini CLI',
-                prompt_template="你是一个前端开发AI，负责用户界面设计和前端功能实现。使用Gemini CLI进行代码开发。",
-                default_tasks=['UI组件库维护', '性能优化', '用户体验分析']
-            ),
-            'de-01': Role(
-                name='DevOps Engineer AI',
-                container_id='de-01',
-                ai_tool='Gemini CLI',
-                prompt_template="你是一个DevOps工程师AI，负责部署、监控和系统运维。使用Gemini CLI进行自动化脚本编写。",
-                default_tasks=['系统监控', '安全扫描', '性能分析']
+            spec.role_id: Role(
+                name=spec.name,
+                container_id=spec.role_id,
+                ai_tool=spec.ai_tool,
+                prompt_template=spec.description,
+                default_tasks=list(spec.default_tasks),
+                is_pm=spec.is_pm,
+                cpu_demand=spec.cpu_demand,
+                memory_gb=spec.memory_gb
             )
+            for spec in self.registry
         }
+        unknown_tools = {role.ai_tool for role in self.roles.values()} - set(self.ai_pools)
+        if unknown_tools:
+            raise ValueError(f"未配置AI工具池: {', '.join(sorted(unknown_tools))}")
+        
+        # 集群形态：每个角色的容器副本及其所在VPS
+        # 注册表中的副本数为默认值，FleetConfig.role_replicas 中的设置优先
+        self.fleet = fleet or FleetConfig()
+        self.fleet = replace(self.fleet, role_replicas={**self.registry.replica_counts(),
+                                                        **self.fleet.role_replicas})
+        self.worker_roles = {worker_id: role_id for role_id, worker_id
+                             in self.fleet.workers(list(self.roles))}
+        self.role_workers = {role_id: [worker_id for worker_id, owner in self.worker_roles.items()
+                                       if owner == role_id] for role_id in self.roles}
+        self.container_placement = self.fleet.placement(
+            [(worker_id, self.roles[role_id].cpu_demand, self.roles[role_id].memory_gb)
+             for worker_id, role_id in self.worker_roles.items()])
+        self.used_hosts = sorted(set(self.container_placement.values()))
+        # 每台VPS上正在进行本地计算的CPU需求（时间加权），以及CPU超卖造成的额外耗时
+        self.host_cpu = {index: TimeWeightedValue(self.env.now) for index in self.used_hosts}
+        self.contention_delay = 0.0
+        
+        # 跨区域网络：每个容器所在区域，以及按类型累计的网络耗时（小时）
+        self.network = network or NetworkConfig()
+        self.worker_region = {worker_id: self.fleet.vps[index]['region']
+                              for worker_id, index in self.container_placement.items()}
+        self.network_delay = {'webhook': 0.0, 'github_api': 0.0, 'repo_sync': 0.0, 'messages': 0.0}
+        # 每个容器的隧道，以及每个容器自上一项工作结束以来的网络耗时（计入下一项工作的路径）
+        self.tunnels = {worker_id: TunnelLink() for worker_id in self.worker_roles}
+        self.worker_network = {}
+        
+        # 每个AI工具的令牌模型；每个角色的系统前缀长度，以及每个容器上次调用模型的时间（提示缓存）
+        self.llm_tools = {config.tool: config for config in (llm_tools or default_llm_tools())}
+        self.prompt_tokens = {spec.role_id: prompt_file_tokens(spec.prompt_path, spec.description)
+                              for spec in self.registry}
+        self.prompt_cache_used = {}
+        self.llm_stats = {tool: {'sessions': 0, 'turns': 0, 'input_tokens': 0.0, 'cached_tokens': 0.0,
+                                 'output_tokens': 0.0, 'prefix_lookups': 0, 'prefix_hits': 0,
+                                 'token_cost': 0.0, 'session_hours': 0.0}
+                          for tool in self.llm_tools}
+        
+        # 每个容器实例的Agent生命周期，容器激活时创建
+        self.lifecycle_config = lifecycle or ContainerLifecycleConfig()
+        self.lifecycles = {}
         
         # 数据存储
         self.tasks = []
         self.github_issues = []
         self.event_log = []
         
+        # 时间加权账本：角色从激活起计算可用时间
+        self.accounting = FlowAccounting(self.env.now)
+        
+        # 共享资源的排队等待时间（小时）
+        self.resource_waits = {'ai_tools': [], 'github_api': []}
+        
+        # 负载模式：每个角色一个任务队列，由定时触发或推送Webhook唤醒
+        self.role_queues = {}
+        self.role_signals = {}
+        self.setup_done = self.env.event()
+        self.setup_end_time = None
+        self.issues_by_id = {}
+        self.webhook_stats = {'cron': 0, 'push': 0, 'coalesced': 0, 'lost': 0}
+        self.pending_push = set()
+        self.trigger_random = random.Random(seed + 2)
+        if workload:
+            self.role_queues = {role_id: simpy.Store(self.env) for role_id in self.roles}
+            self.role_signals = {role_id: self.env.event() for role_id in self.roles}
+        
         # 项目状态
         self.project_status = {
             'setup_completed': False,
@@ -174,10 +999,16 @@ class BeeSwarmRealisticSimulation:
         self.setup_phase_completed = False
         self.issue_processed = False
         
+        # 交付预测：从项目状态加载的未关闭Issue，全部关闭时触发 forecast_done
+        self.forecast_pending = None
+        self.forecast_done = self.env.event()
+        
     def log_event(self, event_type: EventType, role_id: str, description: str, 
                   duration: Optional[float] = None, is_important: bool = False):
         """记录事件，重要事件使用高亮显示"""
         self.project_status['total_events'] += 1
+        if not self.verbose:
+            return
         
         time_str = f"[{self.env.now:6.1f}h]"
         role_str = f"{self.roles[role_id].name}" if role_id in self.roles else "System"
@@ -193,129 +1024,195 @@ class BeeSwarmRealisticSimulation:
             else:
                 print(f"{time_str} {role_str}: {event_str} - {desc_str}")
     
-    def setup_phase(self):
-        """前期配置阶段"""
-        print(f"\n{Fore.BLUE}🔧 开始前期配置阶段...{Style.RESET_ALL}")
+    def build_setup_plan(self) -> Dict[str, SetupStep]:
+        """
+        构建前期配置依赖图
         
-        # 1. VPS准备 (非大厂)
-        yield from self.prepare_vps_instances()
+        每台VPS就绪后即可部署其上的容器，每个容器依次配置Tunnel和注册Webhook；
+        GitHub Actions 配置不依赖基础设施，角色在自身Webhook和定时触发器都就绪后激活。
+        工期按原串行流程的顺序预先抽样，不同运维并行度下的运行使用相同的步骤工期。
+        """
+        steps = {}
         
-        # 2. 容器部署 (产品经理优先)
-        yield from self.deploy_containers()
+        def add(step: SetupStep):
+            steps[step.id] = step
         
-        # 3. Cloudflare Tunnel配置
-        yield from self.setup_cloudflare_tunnels()
+        for i in self.used_hosts:
+            add(SetupStep(id=f"vps-{i+1:02d}", event_type=EventType.VPS_PREPARATION,
+                          duration=self.setup_random.uniform(0.5, 1.5), resource='vps', vps_index=i))
+        # 产品经理优先：同时就绪的步骤按添加顺序（拓扑序号）获得运维人员
+        workers = list(self.worker_roles)
+        for worker_id in workers:
+            add(SetupStep(id=f"container-{worker_id}", event_type=EventType.CONTAINER_DEPLOYMENT,
+                          duration=self.setup_random.uniform(1, 3),
+                          dependencies=[f"vps-{self.container_placement[worker_id] + 1:02d}"],
+                          resource='deploy', role_id=worker_id))
+        for worker_id in workers:
+            add(SetupStep(id=f"tunnel-{worker_id}", event_type=EventType.CLOUDFLARE_TUNNEL_SETUP,
+                          duration=self.setup_random.uniform(0.3, 0.8),
+                          dependencies=[f"container-{worker_id}"], role_id=worker_id))
+        for worker_id in workers:
+            add(SetupStep(id=f"webhook-{worker_id}", event_type=EventType.WEBHOOK_REGISTRATION,
+                          duration=self.setup_random.uniform(0.1, 0.4),
+                          dependencies=[f"tunnel-{worker_id}"], role_id=worker_id))
+        add(SetupStep(id="github-actions", event_type=EventType.GITHUB_ACTION_SETUP,
+                      duration=self.setup_random.uniform(0.5, 1.0)))
+        for worker_id in workers:
+            add(SetupStep(id=f"activate-{worker_id}", event_type=EventType.AI_ROLE_ACTIVATION,
+                          duration=self.setup_random.uniform(0.2, 0.6),
+                          dependencies=[f"webhook-{worker_id}", "github-actions"], role_id=worker_id))
+        return steps
+    
+    def setup_phase(self):
+        """前期配置阶段：按依赖图并行执行配置步骤"""
+        if self.verbose:
+            print(f"\n{Fore.BLUE}🔧 开始前期配置阶段...{Style.RESET_ALL}")
         
-        # 4. Webhook注册
-        yield from self.register_webhooks()
+        self.setup_steps = self.build_setup_plan()
+        self.setup_graph = TaskGraph()
+        for step in self.setup_steps.values():
+            self.setup_graph.add_task(step.id, step.dependencies)
+        self.setup_scheduler = DagScheduler(self.setup_graph)
+        self.setup_start_time = self.env.now
+        all_steps_done = self.env.event()
         
-        # 5. GitHub Action配置
-        yield from self.setup_github_actions()
+        def start(step_ids):
+            for step_id in step_ids:
+                self.env.process(self.run_setup_step(self.setup_steps[step_id], all_steps_done))
         
-        # 6. AI角色激活 (产品经理优先)
-        yield from self.activate_ai_roles()
+        self.start_setup_steps = start
+        start(self.setup_scheduler.initial_ready())
+        yield all_steps_done
         
         self.project_status['setup_completed'] = True
         self.setup_phase_completed = True
-        print(f"\n{Fore.GREEN}✅ 前期配置完成！总耗时: {self.env.now:.1f}小时，总成本: ${self.project_status['setup_cost']:.2f}{Style.RESET_ALL}")
+        self.setup_end_time = self.env.now
+        self.setup_done.succeed()
+        if self.verbose:
+            print(f"\n{Fore.GREEN}✅ 前期配置完成！总耗时: {self.env.now:.1f}小时，总成本: ${self.project_status['setup_cost']:.2f}{Style.RESET_ALL}")
     
-    def prepare_vps_instances(self):
+    def run_setup_step(self, step: SetupStep, all_steps_done: simpy.Event):
+        """执行单个配置步骤：先占用云厂商并发名额，再等待运维人员"""
+        slot = {'vps': self.vps_preparation, 'deploy': self.container_deployment}.get(step.resource)
+        slot_request = slot.request() if slot else None
+        if slot_request:
+            yield slot_request
+        with self.operators.request(priority=self.setup_scheduler.rank[step.id]) as request:
+            yield request
+            step.started_time = self.env.now
+            yield self.env.timeout(step.duration)
+        if slot_request:
+            slot.release(slot_request)
+        step.finished_time = self.env.now
+        self.operator_busy_time += step.duration
+        
+        if step.event_type == EventType.VPS_PREPARATION:
+            self.prepare_vps_instance(step)
+        elif step.event_type == EventType.CONTAINER_DEPLOYMENT:
+            self.deploy_container(step)
+        elif step.event_type == EventType.CLOUDFLARE_TUNNEL_SETUP:
+            self.log_event(EventType.CLOUDFLARE_TUNNEL_SETUP, 'system',
+                          f"配置Tunnel: {self.containers_by_role[step.role_id].webhook_url}", step.duration)
+        elif step.event_type == EventType.WEBHOOK_REGISTRATION:
+            self.log_event(EventType.WEBHOOK_REGISTRATION, 'system',
+                          f"注册Webhook: {self.containers_by_role[step.role_id].webhook_url}", step.duration)
+        elif step.event_type == EventType.GITHUB_ACTION_SETUP:
+            self.log_event(EventType.GITHUB_ACTION_SETUP, 'system',
+                          "配置GitHub Actions定时触发器 (每30分钟)", step.duration)
+        else:
+            self.activate_ai_role(step)
+        
+        self.start_setup_steps(self.setup_scheduler.complete(step.id))
+        if self.setup_scheduler.finished:
+            all_steps_done.succeed()
+    
+    def prepare_vps_instance(self, step: SetupStep):
         """准备VPS实例 (非大厂)"""
-        vps_configs = [
-            {'provider': 'Vultr', 'region': 'Tokyo', 'cost': 0.018},
-            {'provider': 'Linode', 'region': 'Singapore', 'cost': 0.015},
-            {'provider': 'DigitalOcean', 'region': 'NYC1', 'cost': 0.02}
-        ]
-        
-        for i, config in enumerate(vps_configs):
-            with self.vps_preparation.request() as request:
-                yield request
-                
-                setup_time = self.random.uniform(0.5, 1.5)
-                yield self.env.timeout(setup_time)
-                
-                vps = VPSInstance(
-                    id=f"vps-{i+1:02d}",
-                    provider=config['provider'],
-                    region=config['region'],
-                    cost_per_hour=config['cost']
-                )
-                self.vps_instances.append(vps)
-                self.project_status['setup_cost'] += setup_time * config['cost']
-                
-                self.log_event(EventType.VPS_PREPARATION, 'system', 
-                              f"准备VPS: {vps.provider} {vps.region}", setup_time)
+        config = self.fleet.vps[step.vps_index]
+        vps = VPSInstance(
+            id=step.id,
+            provider=config['provider'],
+            region=config['region'],
+            cost_per_hour=config['cost'],
+            cores=config.get('cores', 1),
+            memory_gb=config.get('memory_gb', 2)
+        )
+        self.vps_instances.append(vps)
+        self.project_status['setup_cost'] += step.duration * config['cost']
+        
+        self.log_event(EventType.VPS_PREPARATION, 'system', 
+                      f"准备VPS: {vps.provider} {vps.region}", step.duration)
     
-    def deploy_containers(self):
-        """部署容器 (产品经理优先)"""
-        # 产品经理优先部署
-        role_order = ['pm-01', 'be-01', 'fe-01', 'de-01']
+    def deploy_container(self, step: SetupStep):
+        """部署容器到其依赖的VPS"""
+        worker_id = step.role_id
+        role_id = self.worker_roles[worker_id]
+        vps = next(vps for vps in self.vps_instances if vps.id in step.dependencies)
+        role = self.roles[role_id]
+        container = Container(
+            id=f"container-{worker_id}",
+            role_id=role_id,
+            vps_id=vps.id,
+            webhook_url=f"https://webhook.{worker_id}.bee-swarm.com",
+            status='running',
+            ai_tool=role.ai_tool
+        )
+        self.containers.append(container)
+        self.containers_by_role[worker_id] = container
         
-        for i, role_id in enumerate(role_order):
-            with self.container_deployment.request() as request:
-                yield request
-                
-                vps = self.vps_instances[i % len(self.vps_instances)]
-                deployment_time = self.random.uniform(1, 3)
-                yield self.env.timeout(deployment_time)
-                
-                role = self.roles[role_id]
-                container = Container(
-                    id=f"container-{role_id}",
-                    role_id=role_id,
-                    vps_id=vps.id,
-                    webhook_url=f"https://webhook.{role_id}.bee-swarm.com",
-                    status='running',
-                    ai_tool=role.ai_tool
-                )
-                self.containers.append(container)
-                
-                self.log_event(EventType.CONTAINER_DEPLOYMENT, 'system', 
-                              f"部署容器: {role_id} ({role.ai_tool}) 到 {vps.provider}", deployment_time)
-    
-    def setup_cloudflare_tunnels(self):
-        """配置Cloudflare Tunnel"""
-        for container in self.containers:
-            setup_time = self.random.uniform(0.3, 0.8)
-            yield self.env.timeout(setup_time)
-            
-            self.log_event(EventType.CLOUDFLARE_TUNNEL_SETUP, 'system', 
-                          f"配置Tunnel: {container.webhook_url}", setup_time)
-    
-    def register_webhooks(self):
-        """注册Webhook"""
-        for container in self.containers:
-            registration_time = self.random.uniform(0.1, 0.4)
-            yield self.env.timeout(registration_time)
-            
-            self.log_event(EventType.WEBHOOK_REGISTRATION, 'system', 
-                          f"注册Webhook: {container.webhook_url}", registration_time)
+        self.log_event(EventType.CONTAINER_DEPLOYMENT, 'system', 
+                      f"部署容器: {worker_id} ({role.ai_tool}) 到 {vps.provider}", step.duration)
     
-    def setup_github_actions(self):
-        """配置GitHub Actions"""
-        setup_time = self.random.uniform(0.5, 1.0)
-        yield self.env.timeout(setup_time)
+    def activate_ai_role(self, step: SetupStep):
+        """激活AI角色（的一个容器副本）"""
+        worker_id = step.role_id
+        role_id = self.worker_roles[worker_id]
+        role = self.roles[role_id]
+        role.is_active = True
+        self.accounting.register_worker(worker_id, self.env.now)
+        self.lifecycles[worker_id] = AgentLifecycle(
+            self.lifecycle_config, self.lifecycle_config.keep_warm.get(role_id, 0), self.env.now)
         
-        self.log_event(EventType.GITHUB_ACTION_SETUP, 'system', 
-                      "配置GitHub Actions定时触发器 (每30分钟)", setup_time)
+        if role.is_pm:
+            self.project_status['pm_activated'] = True
+        
+        self.log_event(EventType.AI_ROLE_ACTIVATION, role_id, 
+                      f"激活AI角色: {role.name} ({role.ai_tool})", step.duration)
     
-    def activate_ai_roles(self):
-        """激活AI角色 (产品经理优先)"""
-        # 产品经理优先激活
-        role_order = ['pm-01', 'be-01', 'fe-01', 'de-01']
+    def setup_critical_path(self) -> Dict[str, Any]:
+        """
+        前期配置的关键路径
         
-        for role_id in role_order:
-            activation_time = self.random.uniform(0.2, 0.6)
-            yield self.env.timeout(activation_time)
-            
-            role = self.roles[role_id]
-            role.is_active = True
-            
-            if role.is_pm:
-                self.project_status['pm_activated'] = True
-            
-            self.log_event(EventType.AI_ROLE_ACTIVATION, role_id, 
-                          f"激活AI角色: {role.name} ({role.ai_tool})", activation_time)
+        关键路径只考虑步骤依赖（假设运维人员和云厂商名额不受限），是并行配置
+        所能达到的最短用时；实际用时与它的差距来自运维人员和并发名额的排队。
+        """
+        durations = {step_id: step.duration for step_id, step in self.setup_steps.items()}
+        result = self.setup_graph.critical_path(durations)
+        makespan = (self.setup_end_time - self.setup_start_time
+                    if self.setup_end_time is not None else None)
+        operator_hours = self.setup_config.operators * makespan if makespan else 0.0
+        return {
+            'critical_path': result.path,
+            'critical_path_length': result.length,
+            'sequential_length': sum(durations.values()),
+            'makespan': makespan,
+            'slack': result.slack,
+            'operator_utilization': self.operator_busy_time / operator_hours if operator_hours else 0.0
+        }
+    
+    def print_setup_critical_path(self):
+        """输出前期配置关键路径"""
+        report = self.setup_critical_path()
+        print(f"\n{Fore.BLUE}🧭 前期配置关键路径 (运维人员 {self.setup_config.operators} 名):{Style.RESET_ALL}")
+        chain = " → ".join(f"{step_id}({self.setup_steps[step_id].duration:.1f}h)"
+                           for step_id in report['critical_path'])
+        print(f"  关键路径: {chain}")
+        print(f"  关键路径长度: {report['critical_path_length']:.1f} 小时 "
+              f"(全部串行: {report['sequential_length']:.1f} 小时)")
+        if report['makespan'] is not None:
+            print(f"  实际配置用时: {report['makespan']:.1f} 小时 "
+                  f"(资源排队 {report['makespan'] - report['critical_path_length']:.1f} 小时), "
+                  f"运维人员利用率 {report['operator_utilization'] * 100:.1f}%")
     
     def github_action_trigger(self):
         """GitHub Actions定时触发"""
@@ -331,7 +1228,7 @@ class BeeSwarmRealisticSimulation:
                 # 优先选择产品经理，然后轮询其他角色
                 if self.project_status['pm_activated']:
                     # 产品经理优先处理
-                    yield from self.process_webhook('pm-01')
+                    yield from self.process_webhook(self.pm_id)
                 else:
                     # 轮询其他角色
                     active_roles = [role_id for role_id, role in self.roles.items() 
@@ -369,40 +1266,119 @@ class BeeSwarmRealisticSimulation:
             yield from self.wakeup_ai_agent(role_id)
             yield from self.execute_default_task(role_id)
         
+        self.lifecycles[role_id].sleep(self.env.now)
         role.webhook_calls += 1
     
-    def wakeup_ai_agent(self, role_id):
-        """唤醒AI Agent"""
+    def wakeup_ai_agent(self, role_id, worker_id: Optional[str] = None):
+        """唤醒AI Agent（冷启动或热启动）；worker_id 为角色副本，默认为角色本身"""
+        worker_id = worker_id or role_id
         role = self.roles[role_id]
+        lifecycle = self.lifecycles[worker_id]
         
-        wakeup_time = self.random.uniform(0.1, 0.3)
-        yield self.env.timeout(wakeup_time)
+        cold = lifecycle.wake(self.env.now)
+        low, high = self.lifecycle_config.cold_start if cold else self.lifecycle_config.warm_start
+        self.accounting.start_work(worker_id, self.env.now, task=False)
+        wakeup_time = yield from self.host_work(worker_id, self.random.uniform(low, high))
+        # 重新加载角色Prompt：系统前缀仍在提示缓存中时只需读取缓存
+        wakeup_time += yield from self.llm_session(worker_id)
+        lifecycle.wakeup_time += wakeup_time
+        self.accounting.end_work(worker_id, self.env.now, task=False)
         
+        start_kind = "" if cold else "（热启动）"
         self.log_event(EventType.AI_AGENT_WAKEUP, role_id, 
-                      f"AI Agent唤醒，加载Prompt: {role.prompt_template[:50]}...", wakeup_time)
+                      f"AI Agent唤醒{start_kind}，加载Prompt: {role.prompt_template[:50]}...", wakeup_time)
+    
+    def llm_session(self, worker_id: str, turns: int = 0):
+        """
+        在容器的AI工具中执行一次Agent会话，返回耗时（小时）
+        
+        turns 为 0 时只加载系统前缀（唤醒时读取角色Prompt）。系统前缀是否命中
+        提示缓存取决于工具的缓存策略和该容器上次调用模型的时间。
+        """
+        role_id = self.worker_roles.get(worker_id, worker_id)
+        tool = self.roles[role_id].ai_tool
+        config = self.llm_tools[tool]
+        prefix = config.system_prompt_tokens + self.prompt_tokens[role_id]
+        if config.cache_strategy == 'explicit':
+            cached = True
+        elif config.cache_strategy == 'ttl':
+            last_used = self.prompt_cache_used.get(worker_id)
+            cached = (last_used is not None and self.env.now - last_used <= config.cache_ttl and
+                      self.llm_random.random() < config.cache_hit_rate)
+        else:
+            cached = False
+        
+        usage = config.session_usage(prefix, turns, cached)
+        duration = config.session_time(usage, turns)
+        stats = self.llm_stats[tool]
+        stats['sessions'] += 1
+        stats['turns'] += turns
+        stats['input_tokens'] += usage['input']
+        stats['cached_tokens'] += usage['cached']
+        stats['output_tokens'] += usage['output']
+        stats['prefix_lookups'] += 1
+        stats['prefix_hits'] += cached
+        stats['token_cost'] += config.session_cost(usage)
+        stats['session_hours'] += duration
+        
+        yield self.env.timeout(duration)
+        self.prompt_cache_used[worker_id] = self.env.now
+        return duration
     
-    def process_task(self, role_id, task):
+    def host_work(self, worker_id: str, duration: float):
+        """
+        在容器所在VPS上执行本地计算，返回实际耗时
+        
+        开始时若该VPS上进行中的CPU需求超过核数，耗时按超卖比例拉长
+        （在开始时刻取样，之后加入的工作不再影响本段耗时）。
+        """
+        host = self.container_placement[worker_id]
+        demand = self.roles[self.worker_roles[worker_id]].cpu_demand
+        load = self.host_cpu[host]
+        load.add(self.env.now, demand)
+        actual = duration * max(1.0, load.value / self.fleet.vps[host].get('cores', 1))
+        self.contention_delay += actual - duration
+        yield self.env.timeout(actual)
+        load.add(self.env.now, -demand)
+        return actual
+    
+    def process_task(self, role_id, task, worker_id: Optional[str] = None):
         """处理分配的任务"""
+        worker_id = worker_id or role_id
         role = self.roles[role_id]
         
         task.status = 'in_progress'
+        task.started_time = self.env.now
+        # 任务处理期间（含等待AI工具）角色处于占用状态
+        self.accounting.start_work(worker_id, self.env.now)
         
         self.log_event(EventType.TASK_PROCESSING, role_id, 
                       f"开始任务: {task.title}")
         
+        # 拉取代码（与推送各占同步数据量的一半）
+        region = self.worker_region[worker_id]
+        yield from self.network_wait('repo_sync', self.network.bulk_time(region, self.network.repo_sync_mb / 2),
+                                     worker_id)
+        
         # 使用AI工具进行开发
-        with self.ai_tools.request() as request:
-            yield request
-            ai_time = self.random.uniform(2, 4)
-            yield self.env.timeout(ai_time)
+        pool = self.ai_pools[role.ai_tool]
+        requested = self.env.now
+        yield from pool.acquire()
+        try:
+            self.resource_waits['ai_tools'].append(self.env.now - requested)
+            # 调用轮数随任务规模和复杂度变化
+            complexity = self.random.uniform(0.5, 1.5)
+            turns = max(1, round(self.llm_tools[role.ai_tool].turns_per_task * task.size * complexity))
+            ai_time = yield from self.llm_session(worker_id, turns)
             role.total_work_time += ai_time
             
             self.log_event(EventType.AI_TOOL_USED, role_id, 
-                          f"使用{role.ai_tool}执行任务", ai_time)
+                          f"使用{role.ai_tool}执行任务 ({turns}轮)", ai_time)
+        finally:
+            pool.release()
         
         # 开发时间
-        development_time = self.random.uniform(8, 16)
-        yield self.env.timeout(development_time)
+        development_time = yield from self.host_work(worker_id, self.random.uniform(8, 16) * task.size)
         role.total_work_time += development_time
         
         # 如果是产品经理，创建PRD
@@ -410,9 +1386,15 @@ class BeeSwarmRealisticSimulation:
             self.log_event(EventType.PM_PRD_CREATED, role_id, 
                           f"创建PRD: {task.title}", is_important=True)
         
-        # 创建Pull Request
+        # 创建Pull Request（先获取API配额，再占用并发槽位）
+        requested = self.env.now
+        requests = yield from self.github.acquire(writes=self.github_config.pr_writes)
         with self.github_api.request() as request:
             yield request
+            self.resource_waits['github_api'].append(self.env.now - requested)
+            yield from self.network_wait('repo_sync',
+                                         self.network.bulk_time(region, self.network.repo_sync_mb / 2), worker_id)
+            yield from self.network_wait('github_api', requests * self.network.request_time(region), worker_id)
             pr_time = self.random.uniform(0.2, 0.5)
             yield self.env.timeout(pr_time)
             role.total_work_time += pr_time
@@ -420,16 +1402,42 @@ class BeeSwarmRealisticSimulation:
             self.log_event(EventType.PR_CREATED, role_id, 
                           f"创建PR: 实现 {task.title}", pr_time, is_important=True)
         
+        # PR创建事件通知产品经理
+        if self.role_queues and not role.is_pm:
+            self.notify_role(self.pm_id)
+        
         task.status = 'completed'
         role.completed_tasks += 1
         self.project_status['completed_tasks'] += 1
+        self.accounting.end_work(worker_id, self.env.now)
+        self.accounting.depart(self.env.now, task.created_time)
+        # 唤醒本容器的 Webhook 和轮询（首项工作）以及处理过程中的网络耗时
+        task.network_time = self.worker_network.pop(worker_id, 0.0)
+        self.close_issue_task(task)
+    
+    def close_issue_task(self, task: Task):
+        """任务完成后更新所属Issue，全部任务完成时关闭Issue"""
+        issue = self.issues_by_id.get(task.issue_id)
+        if issue is None:
+            return
+        issue.open_tasks -= 1
+        if issue.open_tasks == 0:
+            issue.status = 'closed'
+            issue.closed_time = self.env.now
+            # 最后完成的任务位于交付周期的关键路径上
+            issue.network_time += task.network_time
+            if self.forecast_pending is not None:
+                self.forecast_pending.discard(issue.id)
+                if not self.forecast_pending and not self.forecast_done.triggered:
+                    self.forecast_done.succeed()
     
     def execute_default_task(self, role_id):
         """执行默认任务"""
         role = self.roles[role_id]
         default_task = self.random.choice(role.default_tasks)
-        default_time = self.random.uniform(1, 3)
-        yield self.env.timeout(default_time)
+        self.accounting.start_work(role_id, self.env.now, task=False)
+        default_time = yield from self.host_work(role_id, self.random.uniform(1, 3))
+        self.accounting.end_work(role_id, self.env.now, task=False)
         role.total_work_time += default_time
         
         self.log_event(EventType.DEFAULT_TASK_EXECUTED, role_id, 
@@ -449,9 +1457,10 @@ class BeeSwarmRealisticSimulation:
                     status="open"
                 )
                 self.github_issues.append(issue)
+                self.issues_by_id[issue.id] = issue
                 
                 # 重要事件：人类创建Issue
-                self.log_event(EventType.HUMAN_ISSUE_CREATED, 'pm-01', 
+                self.log_event(EventType.HUMAN_ISSUE_CREATED, self.pm_id, 
                               f"人类PO发布任务: {issue.title}", is_important=True)
                 
                 # 产品经理创建PRD
@@ -465,50 +1474,232 @@ class BeeSwarmRealisticSimulation:
             
             yield self.env.timeout(self.random.uniform(1, 2))
     
-    def pm_create_prd(self, issue: GitHubIssue):
+    def issue_arrival_process(self):
+        """负载模式：人类PO按泊松过程持续发布Issue，进入产品经理队列"""
+        workload = self.workload
+        rng = self.workload_random
+        weights = [template.get('weight', 1.0) for template in workload.task_templates]
+        low, high = workload.tasks_per_issue
+        sigma = workload.issue_size_sigma
+        yield self.setup_done
+        
+        created = number = 0
+        while workload.max_issues is None or created < workload.max_issues:
+            yield self.env.timeout(rng.expovariate(1.0 / workload.issue_interval))
+            created += 1
+            number += 1
+            # 跳过从项目状态快照加载的Issue编号
+            while f"ISSUE-{number:05d}" in self.issues_by_id:
+                number += 1
+            issue = GitHubIssue(
+                id=f"ISSUE-{number:05d}",
+                title=f"功能需求 #{created}",
+                description="负载模式生成的功能需求",
+                created_by="human_po",
+                created_time=self.env.now,
+                status="open",
+                # 任务按模板权重抽样；对数正态规模倍率，均值为1
+                task_templates=rng.choices(workload.task_templates, weights=weights,
+                                           k=rng.randint(low, high)),
+                size=rng.lognormvariate(-sigma * sigma / 2, sigma)
+            )
+            self.github_issues.append(issue)
+            self.issues_by_id[issue.id] = issue
+            
+            self.log_event(EventType.HUMAN_ISSUE_CREATED, self.pm_id, 
+                          f"人类PO发布任务: {issue.title}", is_important=True)
+            self.role_queues[self.pm_id].put(issue)
+            self.notify_role(self.pm_id)
+    
+    def cron_trigger_process(self):
+        """负载模式：GitHub Actions 定时触发，同时唤醒所有角色（push 模式不启动）"""
+        workload = self.workload
+        interval = workload.cron_interval if workload.trigger_mode == 'cron' else workload.hybrid_cron_interval
+        yield self.setup_done
+        
+        while True:
+            yield self.env.timeout(interval)
+            
+            self.project_status['webhook_calls'] += 1
+            self.log_event(EventType.GITHUB_ACTION_TRIGGER, 'system', 
+                          f"GitHub Action触发 #{self.project_status['webhook_calls']}")
+            
+            for role_id in self.role_signals:
+                self.webhook_stats['cron'] += 1
+                self.signal_role(role_id)
+    
+    def signal_role(self, role_id: str):
+        """唤醒等待中的角色；角色正在处理时会在清空队列前处理新工作"""
+        signal = self.role_signals[role_id]
+        self.role_signals[role_id] = self.env.event()
+        signal.succeed()
+    
+    def notify_role(self, role_id: str):
+        """GitHub事件推送Webhook：debounce 窗口内合并，按 push_loss_rate 丢失"""
+        if self.workload.trigger_mode == 'cron':
+            return
+        if role_id in self.pending_push:
+            self.webhook_stats['coalesced'] += 1
+            return
+        if self.trigger_random.random() < self.workload.push_loss_rate:
+            self.webhook_stats['lost'] += 1
+            return
+        
+        self.pending_push.add(role_id)
+        self.env.timeout(self.workload.debounce).callbacks.append(
+            lambda _event: self._deliver_push(role_id))
+    
+    def _deliver_push(self, role_id: str):
+        self.pending_push.discard(role_id)
+        self.webhook_stats['push'] += 1
+        self.signal_role(role_id)
+    
+    def role_worker(self, role_id, worker_id: Optional[str] = None):
+        """
+        负载模式：角色在定时触发时被唤醒，处理完队列中的全部工作后继续等待
+        
+        同一角色的多个副本（worker_id）共享任务队列，被同一信号唤醒后并行领取任务。
+        """
+        worker_id = worker_id or role_id
+        role = self.roles[role_id]
+        queue = self.role_queues[role_id]
+        yield self.setup_done
+        
+        while True:
+            yield self.role_signals[role_id]
+            region = self.worker_region[worker_id]
+            yield from self.tunnel_wait('webhook', worker_id, self.network.webhook_latency(region),
+                                        self.network.webhook_payload_kb, path=worker_id)
+            # 被唤醒的角色先轮询GitHub上分配给自己的工作
+            yield from self.github_request(worker_id, reads=self.github_config.poll_reads)
+            if not queue.items:
+                self.worker_network.pop(worker_id, None)
+                continue
+            
+            role.webhook_calls += 1
+            self.log_event(EventType.WEBHOOK_RECEIVED, role_id, 
+                          f"Webhook触发任务处理 (队列中 {len(queue.items)} 项)")
+            
+            # 唤醒到队列清空期间角色处于占用状态
+            self.accounting.start_work(worker_id, self.env.now, task=False)
+            yield from self.wakeup_ai_agent(role_id, worker_id)
+            # 检查与领取在同一步完成，副本之间不会争抢同一项工作
+            while queue.items:
+                item = yield queue.get()
+                if role.is_pm:
+                    yield from self.pm_handle_issue(item, worker_id)
+                else:
+                    yield from self.process_task(role_id, item, worker_id)
+            self.lifecycles[worker_id].sleep(self.env.now)
+            self.accounting.end_work(worker_id, self.env.now, task=False)
+    
+    def network_wait(self, kind: str, hours: float, path: Optional[str] = None):
+        """
+        等待一段网络耗时，并按类型（webhook / github_api / repo_sync / messages）累计
+        
+        path 为容器ID时同时计入该容器当前工作的路径网络耗时（见 close_issue_task）。
+        """
+        if hours > 0:
+            self.network_delay[kind] += hours
+            if path is not None:
+                self.worker_network[path] = self.worker_network.get(path, 0.0) + hours
+            yield self.env.timeout(hours)
+    
+    def tunnel_wait(self, kind: str, worker_id: str, latency: float, size_kb: float,
+                    path: Optional[str] = None):
+        """经 worker_id 容器的隧道接收载荷：传播时延之后与同一隧道上的其他传输排队"""
+        hours = self.tunnels[worker_id].delay(self.env.now, latency, self.network.tunnel_time(size_kb))
+        yield from self.network_wait(kind, hours, path)
+    
+    def github_request(self, worker_id: str, reads: int = 0, writes: int = 0):
+        """经限流器发送GitHub API请求，再按容器所在区域计入每个请求的往返时延"""
+        requests = yield from self.github.acquire(reads=reads, writes=writes)
+        yield from self.network_wait('github_api',
+                                     requests * self.network.request_time(self.worker_region[worker_id]),
+                                     worker_id)
+    
+    def pm_handle_issue(self, issue: GitHubIssue, worker_id: Optional[str] = None):
+        """负载模式：产品经理为Issue编写PRD，并拆分为Issue抽样得到的开发任务"""
+        worker_id = worker_id or self.pm_id
+        yield from self.github_request(worker_id, reads=self.github_config.issue_reads)
+        yield from self.pm_create_prd(issue, worker_id)
+        
+        # PRD评论和任务子Issue的写入
+        yield from self.github_request(
+            worker_id,
+            writes=self.github_config.prd_writes + self.github_config.task_writes * len(issue.task_templates))
+        issue.network_time = self.worker_network.pop(worker_id, 0.0)
+        yield from self.create_development_tasks(issue, issue.task_templates, issue.size)
+        self.roles[self.pm_id].completed_tasks += 1
+    
+    def pm_create_prd(self, issue: GitHubIssue, worker_id: Optional[str] = None):
         """产品经理创建PRD"""
-        role = self.roles['pm-01']
+        worker_id = worker_id or self.pm_id
+        role = self.roles[self.pm_id]
         
         # 使用Claude Code创建PRD
-        with self.ai_tools.request() as request:
-            yield request
-            prd_time = self.random.uniform(3, 5)
-            yield self.env.timeout(prd_time)
+        pool = self.ai_pools[role.ai_tool]
+        requested = self.env.now
+        yield from pool.acquire()
+        try:
+            self.resource_waits['ai_tools'].append(self.env.now - requested)
+            # PRD会话比单个开发任务多约三分之一的调用轮数
+            complexity = self.random.uniform(1.0, 1.7)
+            turns = max(1, round(self.llm_tools[role.ai_tool].turns_per_task * issue.size * complexity))
+            self.accounting.start_work(worker_id, self.env.now, task=False)
+            prd_time = yield from self.llm_session(worker_id, turns)
+            self.accounting.end_work(worker_id, self.env.now, task=False)
             role.total_work_time += prd_time
             
-            self.log_event(EventType.PM_PRD_CREATED, 'pm-01', 
+            self.log_event(EventType.PM_PRD_CREATED, self.pm_id, 
                           f"使用Claude Code创建PRD: {issue.title}", prd_time, is_important=True)
+        finally:
+            pool.release()
     
-    def create_development_tasks(self, issue: GitHubIssue):
-        """创建开发任务"""
-        task_templates = [
-            {'title': '后端API设计', 'assigned_role': 'be-01'},
-            {'title': '数据库设计', 'assigned_role': 'be-01'},
-            {'title': '前端注册界面', 'assigned_role': 'fe-01'},
-            {'title': '前端登录界面', 'assigned_role': 'fe-01'},
-            {'title': '部署配置', 'assigned_role': 'de-01'}
-        ]
+    def create_development_tasks(self, issue: GitHubIssue,
+                                 task_templates: Optional[List[Dict[str, Any]]] = None,
+                                 size: float = 1.0):
+        """创建开发任务（负载模式下同时放入对应角色的队列）"""
+        if task_templates is None:
+            task_templates = DEFAULT_TASK_TEMPLATES
         
         for template in task_templates:
+            assigned_role = template.get('assigned_role') or self.route_by_capability(template['capability'])
             task = Task(
                 id=f"TASK-{len(self.tasks)+1:03d}",
                 title=template['title'],
-                assigned_role=template['assigned_role'],
+                assigned_role=assigned_role,
                 status='pending',
                 created_time=self.env.now,
-                issue_id=issue.id
+                issue_id=issue.id,
+                size=size
             )
             self.tasks.append(task)
             self.project_status['total_tasks'] += 1
+            self.accounting.arrive(self.env.now)
+            issue.open_tasks += 1
+            if self.role_queues:
+                self.role_queues[task.assigned_role].put(task)
+                self.notify_role(task.assigned_role)
             
             # 重要事件：任务分配
-            self.log_event(EventType.TASK_ASSIGNMENT, 'pm-01', 
-                          f"分配任务: {template['title']} -> {self.roles[template['assigned_role']].name}", 
+            self.log_event(EventType.TASK_ASSIGNMENT, self.pm_id, 
+                          f"分配任务: {template['title']} -> {self.roles[assigned_role].name}", 
                           is_important=True)
             
             # 添加一个小延迟
             yield self.env.timeout(0.1)
     
+    def route_by_capability(self, capability: str) -> str:
+        """按能力索引选择角色：多个角色具备该能力时选每个副本积压最少的角色"""
+        candidates = self.registry.with_capability(capability)
+        if not candidates:
+            raise ValueError(f"没有角色具备能力: {capability}")
+        if not self.role_queues:
+            return candidates[0].role_id
+        return min(candidates, key=lambda spec: len(self.role_queues[spec.role_id].items) /
+                   len(self.role_workers[spec.role_id])).role_id
+    
     def developer_question_process(self):
         """开发者提问流程"""
         while True:
@@ -524,9 +1715,13 @@ class BeeSwarmRealisticSimulation:
                         self.log_event(EventType.DEVELOPER_QUESTION, role_id, 
                                       f"在任务 '{task.title}' 中提出疑问", is_important=True)
                         
-                        # 产品经理解答
+                        # 产品经理解答（提问和答复经GitHub评论往返）
+                        yield from self.tunnel_wait('messages', self.pm_id, self.network.message_latency(
+                            self.worker_region[role_id], self.worker_region[self.pm_id]), self.network.message_kb)
                         yield self.env.timeout(self.random.uniform(1, 3))
-                        self.log_event(EventType.PM_ANSWER, 'pm-01', 
+                        yield from self.tunnel_wait('messages', role_id, self.network.message_latency(
+                            self.worker_region[self.pm_id], self.worker_region[role_id]), self.network.message_kb)
+                        self.log_event(EventType.PM_ANSWER, self.pm_id, 
                                       f"解答 {self.roles[role_id].name} 的疑问", is_important=True)
             
             yield self.env.timeout(self.random.uniform(10, 20))
@@ -543,7 +1738,7 @@ class BeeSwarmRealisticSimulation:
                         yield self.env.timeout(review_time)
                         
                         # 重要事件：代码审查完成
-                        self.log_event(EventType.CODE_REVIEW_COMPLETE, 'pm-01', 
+                        self.log_event(EventType.CODE_REVIEW_COMPLETE, self.pm_id, 
                                       f"任务 '{task.title}' 代码审查通过", is_important=True)
                         task.reviewed = True
             
@@ -566,33 +1761,321 @@ class BeeSwarmRealisticSimulation:
             
             yield self.env.timeout(self.random.uniform(20, 30))
     
-    def run_simulation(self):
-        """运行仿真"""
-        print(f"{Fore.BLUE}{'='*80}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}🐝 Bee Swarm 真实事件驱动仿真{Style.RESET_ALL}")
-        print(f"{Fore.BLUE}{'='*80}{Style.RESET_ALL}")
-        print(f"配置时间: {SETUP_TIME} 小时")
-        print(f"项目时间: {SIMULATION_TIME} 小时")
-        print(f"AI 角色容器: {len(self.roles)} 个")
-        print(f"产品经理工具: Claude Code")
-        print(f"其他角色工具: Gemini CLI")
-        print(f"{Fore.BLUE}{'='*80}{Style.RESET_ALL}")
+    def start_workload_processes(self):
+        """负载模式的常驻流程：AI工具池扩缩容、定时触发、Issue到达和每个容器的角色进程"""
+        for pool in self.ai_pools.values():
+            if pool.config.policy.interval:
+                self.env.process(pool.autoscale())
+        if self.workload.trigger_mode != 'push':
+            self.env.process(self.cron_trigger_process())
+        self.env.process(self.issue_arrival_process())
+        for worker_id, role_id in self.worker_roles.items():
+            self.env.process(self.role_worker(role_id, worker_id))
+    
+    def run_simulation(self, report: bool = True) -> Optional[Dict[str, Any]]:
+        """运行仿真；负载模式返回 collect_workload_metrics() 的结果"""
+        if report:
+            print(f"{Fore.BLUE}{'='*80}{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}🐝 Bee Swarm 真实事件驱动仿真{Style.RESET_ALL}")
+            print(f"{Fore.BLUE}{'='*80}{Style.RESET_ALL}")
+            print(f"配置时间: {SETUP_TIME} 小时")
+            print(f"项目时间: {self.duration:g} 小时")
+            print(f"AI 角色容器: {len(self.roles)} 个")
+            print(f"产品经理工具: Claude Code")
+            print(f"其他角色工具: Gemini CLI")
+            if self.workload:
+                print(f"Issue平均到达间隔: {self.workload.issue_interval:g} 小时")
+            print(f"{Fore.BLUE}{'='*80}{Style.RESET_ALL}")
         
         # 启动各个流程
         self.env.process(self.setup_phase())
-        self.env.process(self.github_action_trigger())
-        self.env.process(self.human_po_process())
-        self.env.process(self.developer_question_process())
-        self.env.process(self.code_review_process())
-        self.env.process(self.project_release_process())
+        if self.workload:
+            self.start_workload_processes()
+        else:
+            for pool in self.ai_pools.values():
+                if pool.config.policy.interval:
+                    self.env.process(pool.autoscale())
+            self.env.process(self.github_action_trigger())
+            self.env.process(self.human_po_process())
+            self.env.process(self.developer_question_process())
+            self.env.process(self.code_review_process())
+            self.env.process(self.project_release_process())
         
         # 运行仿真
         start_time = time.time()
-        self.env.run(until=SETUP_TIME + SIMULATION_TIME)
+        self.env.run(until=SETUP_TIME + self.duration)
         end_time = time.time()
         
+        metrics = self.collect_workload_metrics() if self.workload else None
+        
         # 输出结果
-        self.print_detailed_results(end_time - start_time)
+        if report:
+            self.print_detailed_results(end_time - start_time)
+            if metrics:
+                self.print_workload_results(metrics)
+        if self.profile:
+            print_hot_path_report(self.env)
+        return metrics
+    
+    def load_project_state(self, state: Dict[str, Any]):
+        """
+        从项目状态快照初始化（负载模式），跳过前期配置阶段
+        
+        state 形如 {"now": 快照时刻, "issues": [...], "tasks": [...]}，Issue 和任务的字段
+        与 GitHubIssue / Task 相同，时间均为项目小时。仿真时钟 0 对应快照时刻。
+        - 已完成的任务只用于统计Issue的剩余任务数；已关闭的Issue不参与预测，也不计入
+          github_issues（负载指标只统计快照时仍未关闭的Issue），快照中的 closed_time 原样保留
+        - 进行中的任务排在其角色队列最前，工作量按 remaining（剩余比例，默认 0.5）折算
+        - 还没有任务的未关闭Issue进入产品经理队列，任务模板取 task_templates，
+          缺省时按负载配置的模板权重抽样
+        """
+        if not self.workload:
+            raise ValueError("load_project_state 需要负载模式（WorkloadConfig）")
+        now = float(state.get('now', 0.0))
+        
+        # 所有容器视为已部署并激活
+        for worker_id, role_id in self.worker_roles.items():
+            self.roles[role_id].is_active = True
+            self.accounting.register_worker(worker_id, self.env.now)
+            self.lifecycles[worker_id] = AgentLifecycle(
+                self.lifecycle_config, self.lifecycle_config.keep_warm.get(role_id, 0), self.env.now)
+        self.project_status.update(setup_completed=True, pm_activated=True)
+        self.setup_phase_completed = True
+        self.setup_start_time = self.setup_end_time = self.env.now
+        self.setup_done.succeed()
+        
+        issue_fields = set(GitHubIssue.__dataclass_fields__)
+        task_fields = set(Task.__dataclass_fields__)
+        issues = []
+        for data in state.get('issues', []):
+            unknown = set(data) - issue_fields
+            if unknown:
+                raise ValueError(f"Issue {data.get('id')} 包含未知字段: {', '.join(sorted(unknown))}")
+            closed_time = data.get('closed_time') if data['status'] == 'closed' else None
+            issue = GitHubIssue(**{**data, 'created_time': data['created_time'] - now,
+                                   'closed_time': closed_time - now if closed_time is not None else None,
+                                   'open_tasks': 0})
+            self.issues_by_id[issue.id] = issue
+            if issue.status != 'closed':
+                issues.append(issue)
+                self.github_issues.append(issue)
+        
+        loaded = []
+        for data in state.get('tasks', []):
+            unknown = set(data) - task_fields - {'remaining'}
+            if unknown:
+                raise ValueError(f"任务 {data.get('id')} 包含未知字段: {', '.join(sorted(unknown))}")
+            if data['assigned_role'] not in self.roles:
+                raise ValueError(f"任务 {data['id']} 分配给未知角色: {data['assigned_role']}")
+            if data['issue_id'] not in self.issues_by_id:
+                raise ValueError(f"任务 {data['id']} 属于未知Issue: {data['issue_id']}")
+            fields = {name: value for name, value in data.items() if name in task_fields}
+            task = Task(**{**fields, 'created_time': data['created_time'] - now})
+            if task.started_time is not None:
+                task.started_time -= now
+            self.tasks.append(task)
+            if task.status == 'completed':
+                continue
+            if task.status == 'in_progress':
+                task.size *= data.get('remaining', 0.5)
+            self.issues_by_id[task.issue_id].open_tasks += 1
+            loaded.append(task)
+        
+        # 进行中的任务优先，其余按创建时间排队
+        loaded.sort(key=lambda task: (task.status != 'in_progress', task.created_time))
+        for task in loaded:
+            task.status = 'pending'
+            self.project_status['total_tasks'] += 1
+            self.accounting.arrive(self.env.now)
+            self.role_queues[task.assigned_role].put(task)
+        
+        workload = self.workload
+        weights = [template.get('weight', 1.0) for template in workload.task_templates]
+        self.forecast_pending = set()
+        for issue in issues:
+            self.forecast_pending.add(issue.id)
+            has_tasks = any(task.issue_id == issue.id for task in self.tasks)
+            if not has_tasks:
+                if not issue.task_templates:
+                    low, high = workload.tasks_per_issue
+                    issue.task_templates = self.workload_random.choices(
+                        workload.task_templates, weights=weights, k=self.workload_random.randint(low, high))
+                self.role_queues[self.pm_id].put(issue)
+            elif issue.open_tasks == 0:
+                # 任务都已完成、Issue尚未关闭：视为在快照时刻关闭
+                issue.status = 'closed'
+                issue.closed_time = self.env.now
+                self.forecast_pending.discard(issue.id)
+        if not self.forecast_pending:
+            self.forecast_done.succeed()
+    
+    def run_forecast(self, horizon: float = 2000.0) -> Dict[str, Optional[float]]:
+        """
+        从 load_project_state() 加载的状态向前运行，直到所有未关闭Issue关闭或达到 horizon
+        
+        返回每个预测Issue的关闭时间（相对快照的小时数，时域内未关闭为 None）。
+        """
+        tracked = sorted(self.forecast_pending or ())
+        self.start_workload_processes()
+        # 快照时刻所有角色被唤醒一次，处理已在队列中的工作
+        self.env.timeout(0).callbacks.append(
+            lambda _event: [self.signal_role(role_id) for role_id in list(self.role_signals)])
+        self.env.run(until=self.env.any_of([self.forecast_done, self.env.timeout(horizon)]))
+        return {issue_id: self.issues_by_id[issue_id].closed_time for issue_id in tracked}
+    
+    def collect_workload_metrics(self) -> Dict[str, Any]:
+        """汇总负载模式指标：Issue交付周期、共享资源排队时间、吞吐量和角色利用率"""
+        now = self.env.now
+        horizon = now - (self.setup_end_time if self.setup_end_time is not None else now)
+        closed = [issue for issue in self.github_issues if issue.closed_time is not None]
+        lead_times = sorted(issue.closed_time - issue.created_time for issue in closed)
+        started = [task for task in self.tasks if task.started_time is not None]
+        
+        metrics = {
+            'issues_created': len(self.github_issues),
+            'issues_closed': len(closed),
+            'open_issues': len(self.github_issues) - len(closed),
+            'arrival_rate': len(self.github_issues) / horizon if horizon > 0 else 0.0,
+            'throughput': len(closed) / horizon if horizon > 0 else 0.0,
+            'tasks_created': self.project_status['total_tasks'],
+            'tasks_completed': self.project_status['completed_tasks'],
+            'task_completion_ratio': (self.project_status['completed_tasks'] /
+                                      self.project_status['total_tasks']
+                                      if self.project_status['total_tasks'] else 1.0),
+            'mean_lead_time': sum(lead_times) / len(lead_times) if lead_times else 0.0,
+            # 含未关闭Issue（按已停留时间计），避免只统计已完成Issue的幸存者偏差
+            'mean_issue_age': (sum((issue.closed_time if issue.closed_time is not None else now)
+                                   - issue.created_time for issue in self.github_issues) /
+                               len(self.github_issues) if self.github_issues else 0.0),
+            'p50_lead_time': _percentile(lead_times, 50),
+            'p95_lead_time': _percentile(lead_times, 95),
+            'role_utilization': {role_id: self.accounting.team_utilization(now, workers)
+                                 for role_id, workers in self.role_workers.items()},
+            'role_backlog': {role_id: len(queue.items)
+                             for role_id, queue in self.role_queues.items()},
+            'max_wip': self.accounting.wip.max_value,
+            'mean_task_latency': self.accounting.littles_law(now)['W'],
+            'ai_pools': {tool: pool.stats(now) for tool, pool in self.ai_pools.items()},
+            'lifecycle': self.lifecycle_stats(now),
+            'webhooks': dict(self.webhook_stats),
+            'webhook_deliveries': self.webhook_stats['cron'] + self.webhook_stats['push'],
+            'agent_sessions': sum(role.webhook_calls for role in self.roles.values()),
+            'mean_pickup_delay': (sum(task.started_time - task.created_time for task in started) /
+                                  len(started) if started else 0.0),
+            'github_requests': self.github.requests,
+            'github_saved_requests': self.github.saved_requests,
+            'github_throttled': self.github.throttled,
+            'github_rate_limit_delay': self.github.delay,
+            'vps_count': len(self.used_hosts),
+            'containers': len(self.worker_roles),
+            'vps_cost_per_hour': sum(self.fleet.vps[index]['cost'] for index in self.used_hosts),
+            'contention_delay': self.contention_delay,
+            'network_delay': dict(self.network_delay),
+            'network_delay_total': sum(self.network_delay.values()),
+            'path_network_time': (sum(issue.network_time for issue in closed) / len(closed)
+                                  if closed else 0.0),
+            'tunnel': {
+                'transfers': sum(tunnel.transfers for tunnel in self.tunnels.values()),
+                'queue_time': sum(tunnel.queue_time for tunnel in self.tunnels.values()),
+                'max_utilization': (max(tunnel.busy_time for tunnel in self.tunnels.values()) / now
+                                    if now > 0 else 0.0)
+            },
+            'host_cpu_load': {f"vps-{index + 1:02d}": self.host_cpu[index].mean(now) /
+                              self.fleet.vps[index].get('cores', 1) for index in self.used_hosts},
+            'llm': self.llm_usage_stats(now)
+        }
+        for name, waits in self.resource_waits.items():
+            ordered = sorted(waits)
+            metrics[f'{name}_mean_wait'] = sum(ordered) / len(ordered) if ordered else 0.0
+            metrics[f'{name}_p95_wait'] = _percentile(ordered, 95)
+        # 总成本：VPS + AI工具池 + Agent驻留（按配置阶段之后的运行时间折算为每小时）
+        metrics['total_cost_per_hour'] = (
+            metrics['vps_cost_per_hour'] +
+            sum(stats['cost_per_hour'] for stats in metrics['ai_pools'].values()) +
+            (metrics['lifecycle']['resident_cost'] / horizon if horizon > 0 else 0.0))
+        return metrics
+    
+    def llm_usage_stats(self, now: float) -> Dict[str, Any]:
+        """按AI工具汇总令牌用量、缓存命中和令牌费用（显式缓存的存储费用从容器激活起计）"""
+        horizon = now - (self.setup_end_time if self.setup_end_time is not None else now)
+        usage = {}
+        for tool, stats in self.llm_stats.items():
+            config = self.llm_tools[tool]
+            storage_cost = 0.0
+            if config.cache_strategy == 'explicit':
+                storage_cost = sum((config.system_prompt_tokens + self.prompt_tokens[role_id]) / 1e6 *
+                                   config.storage_price_per_mtok_hour *
+                                   (now - self.lifecycles[worker_id].start_time)
+                                   for worker_id, role_id in self.worker_roles.items()
+                                   if self.roles[role_id].ai_tool == tool and worker_id in self.lifecycles)
+            cost = stats['token_cost'] + storage_cost
+            usage[tool] = dict(
+                stats,
+                storage_cost=storage_cost,
+                cost=cost,
+                cost_per_hour=cost / horizon if horizon > 0 else 0.0,
+                cache_ratio=stats['cached_tokens'] / stats['input_tokens'] if stats['input_tokens'] else 0.0,
+                prefix_hit_rate=stats['prefix_hits'] / stats['prefix_lookups'] if stats['prefix_lookups'] else 0.0,
+                output_tokens_per_hour=(stats['output_tokens'] / stats['session_hours']
+                                        if stats['session_hours'] else 0.0))
+        return usage
+    
+    def lifecycle_stats(self, now: float) -> Dict[str, Any]:
+        """汇总所有角色的冷/热启动次数、平均唤醒耗时和Agent驻留成本"""
+        lifecycles = self.lifecycles.values()
+        cold = sum(lifecycle.cold_starts for lifecycle in lifecycles)
+        warm = sum(lifecycle.warm_starts for lifecycle in lifecycles)
+        resident = sum(lifecycle.total_resident_hours(now) for lifecycle in lifecycles)
+        wakeups = cold + warm
+        return {
+            'cold_starts': cold,
+            'warm_starts': warm,
+            'cold_start_ratio': cold / wakeups if wakeups else 0.0,
+            'mean_wakeup_time': (sum(lifecycle.wakeup_time for lifecycle in lifecycles) / wakeups
+                                 if wakeups else 0.0),
+            'resident_hours': resident,
+            'resident_cost': resident * self.lifecycle_config.cost_per_resident_hour
+        }
+    
+    def print_workload_results(self, metrics: Dict[str, Any]):
+        """输出负载模式结果"""
+        print(f"\n{Fore.CYAN}📦 多Issue负载统计:{Style.RESET_ALL}")
+        print(f"  Issue: 创建 {metrics['issues_created']} 个, 关闭 {metrics['issues_closed']} 个, "
+              f"未关闭 {metrics['open_issues']} 个")
+        print(f"  到达率: {metrics['arrival_rate']:.3f} Issue/小时, "
+              f"吞吐量: {metrics['throughput']:.3f} Issue/小时")
+        print(f"  交付周期: 平均 {metrics['mean_lead_time']:.1f}h, P50 {metrics['p50_lead_time']:.1f}h, "
+              f"P95 {metrics['p95_lead_time']:.1f}h")
+        print(f"  ai_tools 排队: 平均 {metrics['ai_tools_mean_wait']:.2f}h, "
+              f"P95 {metrics['ai_tools_p95_wait']:.2f}h")
+        print(f"  github_api 排队: 平均 {metrics['github_api_mean_wait']:.2f}h, "
+              f"P95 {metrics['github_api_p95_wait']:.2f}h")
+        print(f"  GitHub API: 请求 {metrics['github_requests']} 次, 批处理节省 "
+              f"{metrics['github_saved_requests']} 次, 被限流 {metrics['github_throttled']} 次, "
+              f"限流等待 {metrics['github_rate_limit_delay']:.1f}h")
+        for tool, stats in metrics['ai_pools'].items():
+            print(f"  {tool} 池 ({stats['policy']}): 平均并发 {stats['mean_capacity']:.2f}, "
+                  f"调用 {stats['calls']} 次, 排队 平均 {stats['mean_wait']:.2f}h / "
+                  f"P95 {stats['p95_wait']:.2f}h, 利用率 {stats['utilization'] * 100:.1f}%, "
+                  f"成本 ${stats['cost']:.2f}")
+        webhooks = metrics['webhooks']
+        print(f"  Webhook ({self.workload.trigger_mode}): 投递 {metrics['webhook_deliveries']} 次 "
+              f"(定时 {webhooks['cron']}, 推送 {webhooks['push']}), 合并 {webhooks['coalesced']} 次, "
+              f"丢失 {webhooks['lost']} 次, 任务平均领取延迟 {metrics['mean_pickup_delay']:.2f}h")
+        for tool, usage in metrics['llm'].items():
+            print(f"  {tool} 令牌: 输入 {usage['input_tokens'] / 1e6:.1f}M (缓存 {usage['cache_ratio'] * 100:.0f}%), "
+                  f"输出 {usage['output_tokens'] / 1e6:.2f}M, 前缀命中 {usage['prefix_hit_rate'] * 100:.0f}%, "
+                  f"令牌费用 ${usage['cost']:.2f}")
+        network = metrics['network_delay']
+        print(f"  网络耗时: Webhook {network['webhook'] * 3600:.0f}秒, API {network['github_api'] * 3600:.0f}秒, "
+              f"代码同步 {network['repo_sync'] * 3600:.0f}秒, 消息 {network['messages'] * 3600:.0f}秒")
+        lifecycle = metrics['lifecycle']
+        print(f"  Agent唤醒: 冷启动 {lifecycle['cold_starts']} 次, 热启动 {lifecycle['warm_starts']} 次, "
+              f"平均耗时 {lifecycle['mean_wakeup_time'] * 60:.1f} 分钟, 驻留 {lifecycle['resident_hours']:.0f}h "
+              f"(${lifecycle['resident_cost']:.2f})")
+        for role_id, backlog in metrics['role_backlog'].items():
+            print(f"  {self.roles[role_id].name}: 利用率 {metrics['role_utilization'][role_id] * 100:.1f}%, "
+                  f"队列积压 {backlog} 项")
     
     def print_detailed_results(self, real_time):
         """输出详细仿真结果"""
@@ -601,12 +2084,12 @@ class BeeSwarmRealisticSimulation:
         print(f"{Fore.BLUE}{'='*80}{Style.RESET_ALL}")
         
         print(f"配置时间: {SETUP_TIME} 小时")
-        print(f"项目时间: {SIMULATION_TIME} 小时")
+        print(f"项目时间: {self.duration:g} 小时")
         print(f"实际运行时间: {real_time:.2f} 秒")
         
         print(f"\n{Fore.YELLOW}💰 基础设施成本:{Style.RESET_ALL}")
         print(f"  配置成本: ${self.project_status['setup_cost']:.2f}")
-        total_vps_cost = sum(vps.cost_per_hour * SIMULATION_TIME for vps in self.vps_instances)
+        total_vps_cost = sum(vps.cost_per_hour * self.duration for vps in self.vps_instances)
         print(f"  运行成本: ${total_vps_cost:.2f}")
         print(f"  总成本: ${self.project_status['setup_cost'] + total_vps_cost:.2f}")
         
@@ -618,14 +2101,25 @@ class BeeSwarmRealisticSimulation:
         print(f"  Webhook调用: {self.project_status['webhook_calls']}")
         
         print(f"\n{Fore.CYAN}👥 角色工作量统计:{Style.RESET_ALL}")
+        now = self.env.now
         for role_id, role in self.roles.items():
-            utilization = role.total_work_time / SIMULATION_TIME * 100
+            # 占用时间 / 激活后的可用时间（不含配置阶段）
+            workers = self.role_workers[role_id]
+            utilization = self.accounting.team_utilization(now, workers) * 100
             print(f"  {role.name} ({role.ai_tool}):")
             print(f"    完成任务: {role.completed_tasks} 个")
             print(f"    总工作时间: {role.total_work_time:.1f} 小时")
+            print(f"    占用时间: {sum(self.accounting.busy_time(worker, now) for worker in workers):.1f} 小时")
             print(f"    利用率: {utilization:.1f}%")
             print(f"    Webhook调用: {role.webhook_calls} 次")
         
+        littles_law = self.accounting.littles_law(now)
+        print(f"\n{Fore.CYAN}⏱️ 任务流统计 (时间加权):{Style.RESET_ALL}")
+        print(f"  平均WIP: {self.accounting.wip.mean(now):.2f}")
+        print(f"  平均排队任务数: {self.accounting.wip.mean(now) - self.accounting.in_service.mean(now):.2f}")
+        print(f"  Little定律: L = {littles_law['L']:.2f}, λW = {littles_law['lambda_W']:.2f} "
+              f"(偏差 {littles_law['relative_gap'] * 100:.1f}%)")
+        
         print(f"\n{Fore.MAGENTA}🎯 重要事件节点:{Style.RESET_ALL}")
         important_events = [event for event in self.event_log 
                            if event.event_type.value.startswith(('🎯', '📋', '❓', '💡', '🔀', '✅', '🚀'))]
@@ -636,13 +2130,759 @@ class BeeSwarmRealisticSimulation:
         print(f"  VPS 实例: {len(self.vps_instances)} 个")
         print(f"  容器实例: {len(self.containers)} 个")
         print(f"  活跃AI角色: {sum(1 for role in self.roles.values() if role.is_active)} 个")
+        if self.setup_phase_completed:
+            self.print_setup_critical_path()
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """已排序数据的百分位数（最近秩法）"""
+    if not ordered:
+        return 0.0
+    # 先乘后除，q·n/100 为整数时不受浮点误差影响
+    index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered) / 100) - 1))
+    return ordered[index]
+
+def load_project_state_file(path) -> Dict[str, Any]:
+    """读取项目状态快照（JSON）"""
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+_FORECAST_STATE: Optional[Dict[str, Any]] = None
+
+def _init_forecast_worker(state: Dict[str, Any], workload: WorkloadConfig, horizon: float):
+    global _FORECAST_STATE
+    _FORECAST_STATE = {'state': state, 'workload': workload, 'horizon': horizon}
+
+def _forecast_replication(seed: int) -> Dict[str, Optional[float]]:
+    """一次预测重复：从快照加载并运行到所有Issue关闭或达到时域"""
+    simulation = BeeSwarmRealisticSimulation(workload=_FORECAST_STATE['workload'],
+                                             verbose=False, seed=seed)
+    simulation.load_project_state(_FORECAST_STATE['state'])
+    return simulation.run_forecast(_FORECAST_STATE['horizon'])
+
+def forecast_delivery(state: Dict[str, Any], replications: int = 1000, horizon: float = 2000.0,
+                      workers: Optional[int] = None, seed: int = RANDOM_SEED,
+                      workload: Optional[WorkloadConfig] = None,
+                      new_issues: bool = False) -> Dict[str, Any]:
+    """
+    蒙特卡洛交付预测：从项目状态快照运行 replications 次，给出每个未关闭Issue的
+    P50/P85/P95 完成时间
+    
+    第 r 次重复使用种子 seed + r，多进程并行（workers=1 时串行）。new_issues=False
+    时不再生成新Issue，只预测快照中的积压；True 时新Issue按负载配置继续到达并争用容量。
+    时域内未关闭的重复按 horizon 计入百分位数（结果为下界），并单独统计按期完成比例。
+    快照带 exported_at（ISO 时间）时同时换算为日期。
+    """
+    workload = replace(workload or WorkloadConfig(), duration=horizon)
+    if not new_issues:
+        workload = replace(workload, max_issues=0)
+    seeds = [seed + replication for replication in range(replications)]
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or replications <= 1:
+        _init_forecast_worker(state, workload, horizon)
+        runs = [_forecast_replication(run_seed) for run_seed in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_forecast_worker,
+                                 initargs=(state, workload, horizon)) as executor:
+            runs = list(executor.map(_forecast_replication, seeds,
+                                     chunksize=max(1, replications // (workers * 4))))
+    
+    exported_at = datetime.fromisoformat(state['exported_at']) if state.get('exported_at') else None
+    titles = {issue['id']: issue.get('title', '') for issue in state.get('issues', [])}
+    issues = []
+    for issue_id in (runs[0] if runs else {}):
+        times = sorted(horizon if run[issue_id] is None else run[issue_id] for run in runs)
+        row = {'issue_id': issue_id, 'title': titles.get(issue_id, ''),
+               'on_time': sum(run[issue_id] is not None for run in runs) / len(runs)}
+        for q in (50, 85, 95):
+            row[f'p{q}'] = _percentile(times, q)
+            if exported_at:
+                row[f'p{q}_date'] = exported_at + timedelta(hours=row[f'p{q}'])
+        issues.append(row)
+    
+    finish = sorted(horizon if None in run.values() else max(run.values(), default=0.0)
+                    for run in runs)
+    return {
+        'replications': replications,
+        'horizon': horizon,
+        'exported_at': exported_at,
+        'issues': issues,
+        'all_done': {f'p{q}': _percentile(finish, q) for q in (50, 85, 95)},
+        'wall_time': time.perf_counter() - started
+    }
+
+def print_delivery_forecast(forecast: Dict[str, Any]):
+    """输出每个Issue的完成时间百分位数（相对快照的小时数，有导出时间时附日期）"""
+    print(f"\n{Fore.CYAN}📅 交付预测 ({forecast['replications']} 次蒙特卡洛重复，"
+          f"时域 {forecast['horizon']:g} 小时){Style.RESET_ALL}")
+    print(f"{'Issue':<14}{'P50(h)':>9}{'P85(h)':>9}{'P95(h)':>9}{'按期完成':>9}  标题")
+    rows = forecast['issues'] + [{'issue_id': '全部', 'title': '', 'on_time': None,
+                                  **forecast['all_done']}]
+    for row in rows:
+        on_time = f"{row['on_time'] * 100:>8.1f}%" if row['on_time'] is not None else f"{'':>9}"
+        print(f"{row['issue_id']:<14}{row['p50']:>9.1f}{row['p85']:>9.1f}{row['p95']:>9.1f}"
+              f"{on_time}  {row['title']}")
+        if forecast['exported_at']:
+            dates = [f"P{q} {(forecast['exported_at'] + timedelta(hours=row[f'p{q}'])):%m-%d %H:%M}"
+                     for q in (50, 85, 95)]
+            print(f"{'':<14}预计: {' / '.join(dates)}")
+    print(f"\n耗时 {forecast['wall_time']:.1f} 秒")
+
+def _mean_metrics(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """对多次重复运行的数值指标取平均（嵌套字典逐项平均，非数值指标取第一次运行的值）"""
+    mean = {}
+    for key, value in runs[0].items():
+        if isinstance(value, dict):
+            mean[key] = _mean_metrics([run[key] for run in runs])
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            mean[key] = sum(run[key] for run in runs) / len(runs)
+        else:
+            mean[key] = value
+    return mean
+
+def saturation_sweep(issue_intervals: List[float], duration: float = 2000.0,
+                     seed: int = RANDOM_SEED, threshold: float = 0.9,
+                     utilization_limit: float = 0.95) -> List[Dict[str, Any]]:
+    """
+    逐步提高Issue到达率，寻找4容器部署的吞吐饱和点
+    
+    每个到达间隔使用相同随机种子运行一次负载模式仿真；任务完成比例低于
+    threshold（积压随时间持续增长）或瓶颈角色利用率超过 utilization_limit
+    时视为饱和。
+    """
+    rows = []
+    for interval in issue_intervals:
+        simulation = BeeSwarmRealisticSimulation(
+            workload=WorkloadConfig(issue_interval=interval, duration=duration),
+            verbose=False, seed=seed)
+        metrics = simulation.run_simulation(report=False)
+        metrics['issue_interval'] = interval
+        metrics['bottleneck'] = max(metrics['role_utilization'],
+                                    key=metrics['role_utilization'].get)
+        metrics['saturated'] = (
+            metrics['task_completion_ratio'] < threshold or
+            metrics['role_utilization'][metrics['bottleneck']] > utilization_limit
+        )
+        rows.append(metrics)
+    return rows
+
+def print_saturation_report(rows: List[Dict[str, Any]]):
+    """输出饱和扫描结果"""
+    print(f"\n{Fore.CYAN}📈 吞吐饱和扫描 (4容器部署){Style.RESET_ALL}")
+    print(f"{'间隔(h)':>8}{'到达率':>9}{'吞吐量':>9}{'完成比例':>9}{'平均周期':>9}{'P95周期':>9}"
+          f"{'AI排队':>8}{'API排队':>8}  瓶颈角色")
+    for row in rows:
+        status = f"{Fore.RED}饱和{Style.RESET_ALL}" if row['saturated'] else "正常"
+        print(f"{row['issue_interval']:>8g}{row['arrival_rate']:>9.3f}{row['throughput']:>9.3f}"
+              f"{row['task_completion_ratio'] * 100:>8.1f}%{row['mean_lead_time']:>9.1f}"
+              f"{row['p95_lead_time']:>9.1f}{row['ai_tools_mean_wait']:>8.2f}"
+              f"{row['github_api_mean_wait']:>8.2f}  {row['bottleneck']} "
+              f"({row['role_utilization'][row['bottleneck']] * 100:.0f}%) {status}")
+    
+    stable = [row for row in rows if not row['saturated']]
+    if stable:
+        best = max(stable, key=lambda row: row['arrival_rate'])
+        print(f"\n最高稳定到达率: {best['arrival_rate']:.3f} Issue/小时 "
+              f"(平均间隔 {best['issue_interval']:g} 小时)")
+
+def compare_github_rate_limits(workload: Optional[WorkloadConfig] = None,
+                               limited: Optional[GitHubAPIConfig] = None,
+                               batch_size: int = 5, seed: int = RANDOM_SEED) -> List[Dict[str, Any]]:
+    """
+    比较不限流、限流、限流+批处理三种GitHub API配置
+    
+    三次运行使用相同的工作负载和随机种子，差异只来自限流模型。默认限流配置
+    对应多个蜂群共享同一token时单个蜂群分到的配额。
+    """
+    workload = workload or WorkloadConfig(issue_interval=30.0, duration=2000.0)
+    limited = limited or GitHubAPIConfig(hourly_quota=12, write_quota_per_hour=6, write_burst=5)
+    configs = [
+        ('不限流', replace(limited, hourly_quota=None, write_quota_per_hour=None)),
+        ('限流', limited),
+        (f'限流+批处理x{batch_size}', replace(limited, batch_size=batch_size))
+    ]
+    
+    rows = []
+    for label, config in configs:
+        simulation = BeeSwarmRealisticSimulation(workload=workload, verbose=False,
+                                                 seed=seed, github=config)
+        metrics = simulation.run_simulation(report=False)
+        metrics['label'] = label
+        rows.append(metrics)
+    return rows
+
+def print_rate_limit_comparison(rows: List[Dict[str, Any]]):
+    """输出限流对比，以及限流损失的吞吐量和批处理挽回的比例"""
+    print(f"\n{Fore.CYAN}🚦 GitHub API 限流与批处理对比{Style.RESET_ALL}")
+    print(f"{'配置':<16}{'吞吐量':>9}{'平均周期':>9}{'平均停留':>9}{'P95周期':>9}{'请求数':>8}{'被限流':>8}{'限流等待(h)':>12}")
+    for row in rows:
+        print(f"{row['label']:<16}{row['throughput']:>9.4f}{row['mean_lead_time']:>9.1f}"
+              f"{row['mean_issue_age']:>9.1f}{row['p95_lead_time']:>9.1f}{row['github_requests']:>8}{row['github_throttled']:>8}"
+              f"{row['github_rate_limit_delay']:>12.1f}")
+    
+    unlimited, limited, batched = rows
+    throughput_loss = unlimited['throughput'] - limited['throughput']
+    age_loss = limited['mean_issue_age'] - unlimited['mean_issue_age']
+    print(f"\n限流损失: 吞吐量 {throughput_loss / unlimited['throughput'] * 100 if unlimited['throughput'] else 0:.1f}%, "
+          f"Issue平均停留 {age_loss:+.1f}h")
+    if age_loss > 0:
+        recovered = (limited['mean_issue_age'] - batched['mean_issue_age']) / age_loss
+        print(f"批处理挽回: 停留时间损失的 {recovered * 100:.0f}%")
+    if throughput_loss > 0:
+        recovered = (batched['throughput'] - limited['throughput']) / throughput_loss
+        print(f"批处理挽回: 吞吐量损失的 {recovered * 100:.0f}%")
+
+def size_ai_pools(budget_per_hour: float, capacities: Tuple[int, ...] = (1, 2, 3, 4),
+                  workload: Optional[WorkloadConfig] = None,
+                  seed: int = RANDOM_SEED) -> List[Dict[str, Any]]:
+    """
+    在预算内寻找使任务平均延迟最小的AI工具并发配置
+    
+    候选配置包括每个工具固定并发数的全部组合，以及排队阈值和定时两种自动
+    扩缩容策略。成本为各工具池平均每小时成本之和。
+    """
+    workload = workload or WorkloadConfig(issue_interval=30.0, duration=2000.0)
+    
+    candidates = []
+    for claude, gemini in itertools.product(capacities, repeat=2):
+        pools = default_ai_pools()
+        pools[0].initial, pools[1].initial = claude, gemini
+        candidates.append((f"fixed C{claude}/G{gemini}", pools))
+    
+    pools = default_ai_pools()
+    for config in pools:
+        config.policy = QueueThresholdScaling()
+    candidates.append(("queue-threshold", pools))
+    
+    pools = default_ai_pools()
+    for config in pools:
+        # 工作时段（9-18点）扩容
+        config.policy = ScheduledScaling([(0, 1), (9, config.initial + 1), (18, 1)])
+    candidates.append(("scheduled", pools))
+    
+    rows = []
+    for label, pools in candidates:
+        simulation = BeeSwarmRealisticSimulation(workload=workload, verbose=False,
+                                                 seed=seed, ai_pools=pools)
+        metrics = simulation.run_simulation(report=False)
+        cost_per_hour = sum(stats['cost_per_hour'] for stats in metrics['ai_pools'].values())
+        rows.append({
+            'label': label,
+            'mean_task_latency': metrics['mean_task_latency'],
+            'mean_issue_age': metrics['mean_issue_age'],
+            'ai_tools_mean_wait': metrics['ai_tools_mean_wait'],
+            'cost_per_hour': cost_per_hour,
+            'within_budget': cost_per_hour <= budget_per_hour,
+            'ai_pools': metrics['ai_pools']
+        })
+    return rows
+
+def print_ai_pool_sizing(rows: List[Dict[str, Any]], budget_per_hour: float):
+    """输出AI工具池配置对比，标出预算内延迟最小的配置"""
+    print(f"\n{Fore.CYAN}🤖 AI工具并发配置 (预算 ${budget_per_hour:.2f}/小时){Style.RESET_ALL}")
+    print(f"{'配置':<18}{'任务延迟(h)':>12}{'Issue停留(h)':>13}{'AI排队(h)':>11}{'成本($/h)':>11}")
+    feasible = [row for row in rows if row['within_budget']]
+    best = min(feasible, key=lambda row: row['mean_task_latency']) if feasible else None
+    for row in sorted(rows, key=lambda row: row['cost_per_hour']):
+        marker = " ⭐" if row is best else ("" if row['within_budget'] else " (超预算)")
+        print(f"{row['label']:<18}{row['mean_task_latency']:>12.1f}{row['mean_issue_age']:>13.1f}"
+              f"{row['ai_tools_mean_wait']:>11.2f}{row['cost_per_hour']:>11.2f}{marker}")
+    if best:
+        print(f"\n推荐配置: {best['label']}，任务平均延迟 {best['mean_task_latency']:.1f}h，"
+              f"成本 ${best['cost_per_hour']:.2f}/小时")
+    else:
+        print("\n没有满足预算的配置")
+
+def pareto_front(rows: List[Dict[str, Any]], objectives: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    返回非支配的行（Pareto 前沿）
+    
+    objectives 为 {指标: 'min' 或 'max'}。若另一行在所有指标上都不差且至少一项
+    更好，则该行被支配。
+    """
+    def better_or_equal(a, b, key, sense):
+        return a[key] <= b[key] if sense == 'min' else a[key] >= b[key]
+    
+    def dominates(a, b):
+        return (all(better_or_equal(a, b, key, sense) for key, sense in objectives.items()) and
+                any(a[key] != b[key] for key in objectives))
+    
+    return [row for row in rows if not any(dominates(other, row) for other in rows if other is not row)]
+
+def fleet_candidates(vps_types: Tuple[str, ...] = ('small', 'medium', 'large'),
+                     replica_grid: Optional[Dict[str, Tuple[int, ...]]] = None,
+                     registry: Optional[RoleRegistry] = None,
+                     extra_vps: Tuple[int, ...] = (0, 1, 2),
+                     strategies: Optional[List[PlacementStrategy]] = None) -> List[FleetConfig]:
+    """
+    生成候选集群：同规格VPS × VPS数量 × 放置策略 × 角色副本数组合，另加当前默认集群
+    
+    replica_grid 默认为注册表中每个非产品经理角色 1 或 2 个副本。VPS数量从内存
+    能容纳全部容器（按各角色的 memory_gb）的最少台数起，再多开 extra_vps 台：
+    台数越多、每台容器越少，CPU超卖越轻但VPS成本越高。放置结果相同的候选
+    （例如装箱放置用不到多开的VPS，而未放置容器的VPS不计成本）只保留一个。
+    """
+    registry = registry or default_role_registry()
+    replica_grid = replica_grid or {spec.role_id: (1, 2) for spec in registry if not spec.is_pm}
+    strategies = strategies or [RoundRobinPlacement(), BinPackingPlacement(), SpreadPlacement()]
+    candidates = [FleetConfig()]
+    seen = set()
+    for combination in itertools.product(*replica_grid.values()):
+        replicas = dict(zip(replica_grid, combination))
+        # 与仿真相同的部署顺序（副本轮次），放置结果才与仿真一致
+        layout = FleetConfig(role_replicas={**registry.replica_counts(), **replicas})
+        demands = [(worker_id, registry.get(role_id).cpu_demand, registry.get(role_id).memory_gb)
+                   for role_id, worker_id in layout.workers([spec.role_id for spec in registry])]
+        memory = sum(memory for _, _, memory in demands)
+        shape = " ".join(f"{role_id.split('-')[0]}{replica}" for role_id, replica in replicas.items())
+        for vps_type, extra, strategy in itertools.product(vps_types, extra_vps, strategies):
+            spec = VPS_CATALOG[vps_type]
+            count = int(math.ceil(memory / spec['memory_gb'])) + extra
+            fleet = FleetConfig(vps=[dict(spec) for _ in range(count)], role_replicas=replicas,
+                                placement_strategy=strategy,
+                                label=f"{count}x{vps_type} {strategy.name} {shape}")
+            try:
+                placement = fleet.placement(demands)
+            except ValueError:
+                continue
+            key = (vps_type, tuple(combination), tuple(sorted(placement.items())))
+            if key not in seen:
+                seen.add(key)
+                candidates.append(fleet)
+    return candidates
+
+def optimize_fleet(candidates: Optional[List[FleetConfig]] = None,
+                   workload: Optional[WorkloadConfig] = None,
+                   seed: int = RANDOM_SEED, replications: int = 3,
+                   registry: Optional[RoleRegistry] = None) -> List[Dict[str, Any]]:
+    """
+    评估候选集群，返回全部结果并标记 Pareto 前沿
+    
+    每个候选用相同的一批随机种子运行（公共随机数），结果取平均。目标为总成本
+    最低、Issue吞吐量最高、Issue平均停留时间（含未关闭Issue）最短。
+    registry 为仿真的角色名册（默认4角色团队），候选缺省时按它生成。
+    """
+    workload = workload or WorkloadConfig(issue_interval=24.0, duration=2000.0)
+    registry = registry or default_role_registry()
+    rows = []
+    for fleet in candidates or fleet_candidates(registry=registry):
+        runs = []
+        for replication in range(replications):
+            simulation = BeeSwarmRealisticSimulation(workload=workload, verbose=False,
+                                                     seed=seed + replication, fleet=fleet,
+                                                     registry=registry)
+            runs.append(simulation.run_simulation(report=False))
+        row = _mean_metrics(runs)
+        row['label'] = fleet.label
+        row['fleet'] = fleet
+        rows.append(row)
+    
+    front = pareto_front(rows, {'total_cost_per_hour': 'min', 'throughput': 'max', 'mean_issue_age': 'min'})
+    for row in rows:
+        row['pareto'] = any(row is member for member in front)
+    return rows
+
+def print_fleet_pareto(rows: List[Dict[str, Any]]):
+    """输出集群配置的成本/吞吐量/交付周期 Pareto 前沿"""
+    front = sorted((row for row in rows if row['pareto']), key=lambda row: row['total_cost_per_hour'])
+    print(f"\n{Fore.CYAN}🖥️ 集群配置 Pareto 前沿 ({len(front)}/{len(rows)} 个候选非支配){Style.RESET_ALL}")
+    print(f"{'集群':<36}{'VPS':>4}{'容器':>5}{'VPS($/h)':>10}{'总成本($/h)':>12}{'吞吐量':>8}"
+          f"{'Issue停留(h)':>13}{'P95周期(h)':>11}")
+    for row in front:
+        print(f"{row['label']:<36}{row['vps_count']:>4.0f}{row['containers']:>5.0f}"
+              f"{row['vps_cost_per_hour']:>10.3f}{row['total_cost_per_hour']:>12.2f}{row['throughput']:>8.3f}"
+              f"{row['mean_issue_age']:>13.1f}{row['p95_lead_time']:>11.1f}")
+    baseline = next((row for row in rows if row['label'] == 'default'), None)
+    if baseline and not baseline['pareto']:
+        print(f"\n当前默认集群被支配: 总成本 ${baseline['total_cost_per_hour']:.2f}/小时, "
+              f"吞吐量 {baseline['throughput']:.3f}, Issue停留 {baseline['mean_issue_age']:.1f}h")
+
+def compare_placement_strategies(fleet: Optional[FleetConfig] = None,
+                                 workload: Optional[WorkloadConfig] = None,
+                                 strategies: Optional[List[PlacementStrategy]] = None,
+                                 seed: int = RANDOM_SEED, replications: int = 5) -> List[Dict[str, Any]]:
+    """
+    在同一集群上比较容器放置策略对任务延迟和成本的影响（多个随机种子取平均）
+    
+    默认集群为 1 台 large + 2 台 small 的混合规格，后端和前端各 2 个副本。
+    """
+    fleet = fleet or FleetConfig(vps=[dict(VPS_CATALOG['large']), dict(VPS_CATALOG['small']),
+                                      dict(VPS_CATALOG['small'])],
+                                 role_replicas={'be-01': 2, 'fe-01': 2}, label='mixed')
+    workload = workload or WorkloadConfig(issue_interval=24.0, duration=2000.0)
+    rows = []
+    for strategy in strategies or [RoundRobinPlacement(), BinPackingPlacement(), SpreadPlacement()]:
+        runs = []
+        for replication in range(replications):
+            simulation = BeeSwarmRealisticSimulation(
+                workload=workload, verbose=False, seed=seed + replication,
+                fleet=replace(fleet, placement_strategy=strategy))
+            metrics = simulation.run_simulation(report=False)
+            metrics['max_host_cpu_load'] = max(metrics['host_cpu_load'].values())
+            metrics['contention_per_task'] = (metrics['contention_delay'] / metrics['tasks_completed']
+                                              if metrics['tasks_completed'] else 0.0)
+            runs.append(metrics)
+        row = _mean_metrics(runs)
+        row['label'] = strategy.name
+        rows.append(row)
+    return rows
+
+def print_placement_comparison(rows: List[Dict[str, Any]]):
+    """输出放置策略对比"""
+    print(f"\n{Fore.CYAN}📦 容器放置策略对比{Style.RESET_ALL}")
+    print(f"{'策略':<13}{'VPS':>4}{'VPS($/h)':>10}{'最高CPU负载':>12}{'超卖延迟/任务(h)':>17}"
+          f"{'任务延迟(h)':>12}{'Issue停留(h)':>13}")
+    for row in rows:
+        print(f"{row['label']:<13}{row['vps_count']:>4.0f}{row['vps_cost_per_hour']:>10.3f}"
+              f"{row['max_host_cpu_load'] * 100:>11.0f}%{row['contention_per_task']:>17.2f}"
+              f"{row['mean_task_latency']:>12.1f}{row['mean_issue_age']:>13.1f}")
+
+def compare_network_layouts(workload: Optional[WorkloadConfig] = None,
+                            seed: int = RANDOM_SEED, replications: int = 5) -> List[Dict[str, Any]]:
+    """
+    比较多区域分布与同区域部署的网络耗时和交付周期（多个随机种子取平均）
+    
+    网络带来的额外交付周期按每个已关闭Issue关键路径上的网络耗时计算（PM处理和最后
+    完成的任务，各自包括唤醒容器的Webhook和轮询），不受调度顺序变化带来的随机波动
+    影响；不包括网络耗时让其他工作排队更久的间接影响，利用率不高时可以忽略。
+    """
+    workload = workload or WorkloadConfig(duration=2000.0)
+    
+    def colocated(region: str) -> FleetConfig:
+        return FleetConfig(vps=[dict(config, region=region) for config in SETUP_VPS_CONFIGS],
+                           label=f"co-located {region}")
+    
+    layouts = [
+        ('no network', FleetConfig(), NetworkConfig(enabled=False)),
+        ('multi-region', FleetConfig(), NetworkConfig()),
+        ('co-located NYC1', colocated('NYC1'), NetworkConfig()),
+        ('co-located Tokyo', colocated('Tokyo'), NetworkConfig()),
+        ('co-located Singapore', colocated('Singapore'), NetworkConfig())
+    ]
+    rows = []
+    for label, fleet, network in layouts:
+        runs = []
+        for replication in range(replications):
+            simulation = BeeSwarmRealisticSimulation(workload=workload, verbose=False, seed=seed + replication,
+                                                     fleet=fleet, network=network)
+            metrics = simulation.run_simulation(report=False)
+            issues = metrics['issues_created'] or 1
+            metrics['network_per_issue'] = {kind: hours / issues
+                                            for kind, hours in metrics['network_delay'].items()}
+            runs.append(metrics)
+        row = _mean_metrics(runs)
+        row['label'] = label
+        rows.append(row)
+    return rows
+
+def print_network_comparison(rows: List[Dict[str, Any]]):
+    """输出网络布局对比：每个Issue的网络耗时、关键路径上增加的交付周期（分钟）和隧道排队"""
+    print(f"\n{Fore.CYAN}🌐 跨区域网络布局对比 (每个Issue的网络耗时, 分钟){Style.RESET_ALL}")
+    print(f"{'布局':<22}{'Webhook':>8}{'API':>7}{'代码同步':>9}{'合计':>7}{'交付周期增加':>13}"
+          f"{'隧道排队(秒)':>13}{'隧道利用率':>11}")
+    for row in rows:
+        network = row['network_per_issue']
+        tunnel = row['tunnel']
+        print(f"{row['label']:<22}{network['webhook'] * 60:>8.2f}{network['github_api'] * 60:>7.2f}"
+              f"{network['repo_sync'] * 60:>9.2f}{sum(network.values()) * 60:>7.2f}"
+              f"{row['path_network_time'] * 60:>13.2f}{tunnel['queue_time'] * 3600:>13.3f}"
+              f"{tunnel['max_utilization'] * 100:>10.3f}%")
+
+# 提示缓存策略：(名称, 对工具配置的修改)
+LLM_CACHE_STRATEGIES = [
+    ('no cache', dict(cache_strategy='none')),
+    ('ttl 5m', dict(cache_strategy='ttl', cache_ttl=5 / 60)),
+    ('ttl 1h', dict(cache_strategy='ttl', cache_ttl=1.0)),
+    ('explicit', dict(cache_strategy='explicit'))
+]
+
+def llm_task_profiles(tools: Optional[List[LLMToolConfig]] = None,
+                      role_id: str = 'be-01', session_gap: float = 0.25) -> List[Dict[str, Any]]:
+    """
+    规模为 1 的开发任务在各AI工具和缓存策略下的令牌用量、耗时和费用（解析计算）
+    
+    系统前缀按 role_id 的角色Prompt计算。session_gap 为距该容器上次调用模型的小时数：
+    显式缓存的系统前缀总是命中，TTL缓存只在 session_gap 不超过 cache_ttl 时命中
+    （按命中计算，不乘 cache_hit_rate）。
+    """
+    spec = default_role_registry().get(role_id)
+    rows = []
+    for base in tools or default_llm_tools():
+        prefix = base.system_prompt_tokens + prompt_file_tokens(spec.prompt_path, spec.description)
+        for label, changes in LLM_CACHE_STRATEGIES:
+            config = replace(base, **changes)
+            turns = config.turns_per_task
+            prefix_cached = (config.cache_strategy == 'explicit' or
+                             (config.cache_strategy == 'ttl' and session_gap <= config.cache_ttl))
+            usage = config.session_usage(prefix, turns, prefix_cached)
+            session_time = config.session_time(usage, turns)
+            model_time = session_time - turns * config.tool_execution_seconds / 3600
+            rows.append({
+                'tool': config.tool,
+                'strategy': label,
+                'prefix_tokens': prefix,
+                'input_tokens': usage['input'],
+                'cached_tokens': usage['cached'],
+                'output_tokens': usage['output'],
+                'model_time': model_time,
+                'session_time': session_time,
+                'output_tokens_per_second': usage['output'] / (model_time * 3600) if model_time > 0 else 0.0,
+                'cost': config.session_cost(usage)
+            })
+    return rows
+
+def compare_llm_caching(workload: Optional[WorkloadConfig] = None,
+                        seed: int = RANDOM_SEED, replications: int = 3) -> List[Dict[str, Any]]:
+    """在相同工作负载下比较提示缓存策略（两个AI工具使用同一策略，多个随机种子取平均）"""
+    workload = workload or WorkloadConfig(duration=2000.0)
+    rows = []
+    for label, changes in LLM_CACHE_STRATEGIES:
+        tools = [replace(config, **changes) for config in default_llm_tools()]
+        runs = []
+        for replication in range(replications):
+            simulation = BeeSwarmRealisticSimulation(workload=workload, verbose=False,
+                                                     seed=seed + replication, llm_tools=tools)
+            runs.append(simulation.run_simulation(report=False))
+        row = _mean_metrics(runs)
+        row['label'] = label
+        rows.append(row)
+    return rows
+
+def print_llm_comparison(profiles: List[Dict[str, Any]], rows: List[Dict[str, Any]]):
+    """输出AI工具吞吐量对比和提示缓存策略对比"""
+    print(f"\n{Fore.CYAN}🧠 AI工具令牌吞吐量 (规模为1的开发任务){Style.RESET_ALL}")
+    print(f"{'工具':<13}{'缓存策略':<10}{'输入(M)':>8}{'缓存比例':>9}{'输出(K)':>8}{'模型耗时(分钟)':>15}"
+          f"{'输出令牌/秒':>11}{'会话(h)':>8}{'费用($)':>8}")
+    for row in profiles:
+        print(f"{row['tool']:<13}{row['strategy']:<10}{row['input_tokens'] / 1e6:>8.2f}"
+              f"{row['cached_tokens'] / row['input_tokens'] * 100:>8.0f}%{row['output_tokens'] / 1e3:>8.0f}"
+              f"{row['model_time'] * 60:>15.1f}{row['output_tokens_per_second']:>11.1f}"
+              f"{row['session_time']:>8.2f}{row['cost']:>8.2f}")
+    
+    print(f"\n{Fore.CYAN}🗂️ 提示缓存策略对比 (负载模式){Style.RESET_ALL}")
+    print(f"{'策略':<10}{'工具':<13}{'前缀命中':>9}{'缓存比例':>9}{'令牌费用/h':>11}{'存储费用($)':>12}"
+          f"{'唤醒(分钟)':>11}{'Issue停留(h)':>13}")
+    for row in rows:
+        for tool, usage in row['llm'].items():
+            print(f"{row['label']:<10}{tool:<13}{usage['prefix_hit_rate'] * 100:>8.0f}%"
+                  f"{usage['cache_ratio'] * 100:>8.0f}%{usage['cost_per_hour']:>11.3f}"
+                  f"{usage['storage_cost']:>12.2f}{row['lifecycle']['mean_wakeup_time'] * 60:>11.1f}"
+                  f"{row['mean_issue_age']:>13.1f}")
+
+def roster_fleet(registry: RoleRegistry, vps_type: str = 'medium', label: str = 'roster') -> FleetConfig:
+    """为注册表中的全部容器副本开通同规格VPS：从内存下限起逐台增加，直到分散放置成功"""
+    spec = VPS_CATALOG[vps_type]
+    demands = [(instance, registry.get(role_id).cpu_demand, registry.get(role_id).memory_gb)
+               for role_id, instance in registry.instances()]
+    count = max(1, int(math.ceil(sum(memory for _, _, memory in demands) / spec['memory_gb'])))
+    while True:
+        fleet = FleetConfig(vps=[dict(spec) for _ in range(count)], placement_strategy=SpreadPlacement(),
+                            label=f"{label} {count}x{vps_type}")
+        try:
+            fleet.placement(demands)
+            return fleet
+        except ValueError:
+            count += 1
+
+def compare_rosters(registry: Optional[RoleRegistry] = None, replicas: int = 2,
+                    workload: Optional[WorkloadConfig] = None,
+                    seed: int = RANDOM_SEED, replications: int = 3) -> List[Dict[str, Any]]:
+    """
+    比较默认4角色团队与 roles/ 目录中的完整角色名册（每个角色1个和 replicas 个副本）
+    
+    所有名册运行同一工作负载：Issue任务取 workload.task_templates（默认 DEFAULT_TASK_TEMPLATES），
+    按能力路由到具备该能力、积压最少的角色，因此模板中的能力必须是每个名册都具备的；
+    完整名册的VPS按全部容器的内存需求开通（见 roster_fleet）。
+    """
+    workload = workload or WorkloadConfig(duration=2000.0)
+    registry = registry or RoleRegistry.discover()
+    scaled = registry.with_replicas({spec.role_id: replicas for spec in registry if not spec.is_pm})
+    configs = [
+        ('default 4 roles', default_role_registry(), FleetConfig()),
+        ('roster x1', registry, roster_fleet(registry)),
+        (f"roster x{replicas}", scaled, roster_fleet(scaled))
+    ]
+    rows = []
+    for label, roster, fleet in configs:
+        runs = []
+        for replication in range(replications):
+            simulation = BeeSwarmRealisticSimulation(workload=workload, verbose=False, seed=seed + replication,
+                                                     fleet=fleet, registry=roster)
+            runs.append(simulation.run_simulation(report=False))
+        row = _mean_metrics(runs)
+        row.update(label=label, roles=len(roster))
+        rows.append(row)
+    return rows
+
+def print_roster_comparison(rows: List[Dict[str, Any]]):
+    """输出角色名册对比和完整名册的各角色利用率"""
+    print(f"\n{Fore.CYAN}🐝 角色名册对比{Style.RESET_ALL}")
+    print(f"{'名册':<17}{'角色':>5}{'容器':>5}{'VPS':>5}{'总成本($/h)':>12}{'吞吐量':>8}{'平均周期(h)':>12}"
+          f"{'Issue停留(h)':>13}")
+    for row in rows:
+        print(f"{row['label']:<17}{row['roles']:>5}{row['containers']:>5.0f}{row['vps_count']:>5.0f}"
+              f"{row['total_cost_per_hour']:>12.2f}{row['throughput']:>8.3f}{row['mean_lead_time']:>12.1f}"
+              f"{row['mean_issue_age']:>13.1f}")
+    for row in rows[1:]:
+        busiest = sorted(row['role_utilization'].items(), key=lambda item: -item[1])
+        print(f"  {row['label']} 角色利用率: " +
+              ", ".join(f"{role_id} {utilization * 100:.0f}%" for role_id, utilization in busiest))
+
+def sweep_container_lifecycle(idle_timeouts: Tuple[float, ...] = (0.0, 0.25, 0.5, 1.0, 2.0, 4.0),
+                              workload: Optional[WorkloadConfig] = None,
+                              base: Optional[ContainerLifecycleConfig] = None,
+                              seed: int = RANDOM_SEED,
+                              replications: int = 5,
+                              registry: Optional[RoleRegistry] = None) -> List[Dict[str, Any]]:
+    """
+    扫描空闲驻留时长和常驻Agent，比较唤醒延迟与VPS驻留成本
+    
+    每个 idle_timeout 一组配置，最后追加名册（默认4角色团队）中每个角色常驻1个Agent
+    的配置。唤醒耗时相对任务时长很小，因此每组配置用 replications 个随机种子取平均。
+    """
+    workload = workload or WorkloadConfig(issue_interval=30.0, duration=2000.0)
+    base = base or ContainerLifecycleConfig()
+    registry = registry or default_role_registry()
+    configs = [(f"idle {timeout:g}h", replace(base, idle_timeout=timeout)) for timeout in idle_timeouts]
+    configs.append(("keep-warm 1", replace(base, keep_warm={spec.role_id: 1 for spec in registry})))
+    
+    rows = []
+    for label, config in configs:
+        runs = []
+        for replication in range(replications):
+            simulation = BeeSwarmRealisticSimulation(workload=workload, verbose=False,
+                                                     seed=seed + replication, lifecycle=config,
+                                                     registry=registry)
+            metrics = simulation.run_simulation(report=False)
+            run = dict(metrics['lifecycle'])
+            run.update(mean_issue_age=metrics['mean_issue_age'],
+                       mean_task_latency=metrics['mean_task_latency'])
+            runs.append(run)
+        row = _mean_metrics(runs)
+        row['label'] = label
+        rows.append(row)
+    return rows
+
+def print_lifecycle_sweep(rows: List[Dict[str, Any]]):
+    """输出容器生命周期扫描结果"""
+    print(f"\n{Fore.CYAN}🧊 Agent冷启动/热驻留权衡{Style.RESET_ALL}")
+    print(f"{'配置':<14}{'冷启动比例':>10}{'唤醒(分钟)':>11}{'任务延迟(h)':>12}{'Issue停留(h)':>13}"
+          f"{'驻留(h)':>9}{'驻留成本($)':>12}")
+    for row in rows:
+        print(f"{row['label']:<14}{row['cold_start_ratio'] * 100:>9.1f}%{row['mean_wakeup_time'] * 60:>11.1f}"
+              f"{row['mean_task_latency']:>12.1f}{row['mean_issue_age']:>13.1f}"
+              f"{row['resident_hours']:>9.0f}{row['resident_cost']:>12.2f}")
+
+def compare_trigger_modes(workload: Optional[WorkloadConfig] = None,
+                          seed: int = RANDOM_SEED, replications: int = 5) -> List[Dict[str, Any]]:
+    """在相同工作负载下比较 cron、push、hybrid 三种触发模式（多个随机种子取平均）"""
+    workload = workload or WorkloadConfig(issue_interval=48.0, duration=2000.0)
+    rows = []
+    for mode in ('cron', 'push', 'hybrid'):
+        runs = []
+        for replication in range(replications):
+            simulation = BeeSwarmRealisticSimulation(workload=replace(workload, trigger_mode=mode),
+                                                     verbose=False, seed=seed + replication)
+            runs.append(simulation.run_simulation(report=False))
+        row = _mean_metrics(runs)
+        row['label'] = mode
+        rows.append(row)
+    return rows
+
+def print_trigger_comparison(rows: List[Dict[str, Any]]):
+    """输出触发模式对比：端到端交付周期、任务领取延迟和Webhook数量"""
+    print(f"\n{Fore.CYAN}🔔 触发模式对比 (cron / push / hybrid){Style.RESET_ALL}")
+    print(f"{'模式':<8}{'平均周期':>9}{'P95周期':>9}{'Issue停留':>10}{'领取延迟':>9}{'Webhook':>9}"
+          f"{'合并':>7}{'丢失':>6}{'Agent会话':>10}")
+    for row in rows:
+        webhooks = row['webhooks']
+        print(f"{row['label']:<8}{row['mean_lead_time']:>9.1f}{row['p95_lead_time']:>9.1f}"
+              f"{row['mean_issue_age']:>10.1f}{row['mean_pickup_delay']:>9.2f}"
+              f"{row['webhook_deliveries']:>9.0f}{webhooks['coalesced']:>7.0f}{webhooks['lost']:>6.0f}"
+              f"{row['agent_sessions']:>10.0f}")
+
+def compare_setup_parallelism(operator_counts: Tuple[int, ...] = (1, 2, 3, 4),
+                              seed: int = RANDOM_SEED, replications: int = 5) -> List[Dict[str, Any]]:
+    """只运行前期配置阶段，比较不同运维人员数下的配置用时（多个随机种子取平均）"""
+    rows = []
+    for operators in operator_counts:
+        runs = []
+        for replication in range(replications):
+            simulation = BeeSwarmRealisticSimulation(verbose=False, seed=seed + replication,
+                                                     setup=SetupConfig(operators=operators))
+            simulation.env.process(simulation.setup_phase())
+            simulation.env.run(until=simulation.setup_done)
+            report = simulation.setup_critical_path()
+            runs.append({key: report[key] for key in
+                         ('critical_path_length', 'sequential_length', 'makespan', 'operator_utilization')})
+        row = _mean_metrics(runs)
+        row['operators'] = operators
+        rows.append(row)
+    return rows
+
+def print_setup_comparison(rows: List[Dict[str, Any]]):
+    """输出前期配置并行度对比"""
+    print(f"\n{Fore.CYAN}🔧 前期配置并行度对比{Style.RESET_ALL}")
+    print(f"{'运维人员':<8}{'实际用时(h)':>12}{'关键路径(h)':>12}{'全部串行(h)':>12}{'运维利用率':>11}")
+    for row in rows:
+        print(f"{row['operators']:<8}{row['makespan']:>12.1f}{row['critical_path_length']:>12.1f}"
+              f"{row['sequential_length']:>12.1f}{row['operator_utilization'] * 100:>10.1f}%")
 
 def main():
     """主函数"""
     print(f"{Fore.CYAN}🚀 启动 Bee Swarm 真实事件驱动仿真...{Style.RESET_ALL}")
     
+    if '--saturation' in sys.argv:
+        print_saturation_report(saturation_sweep([96, 64, 48, 36, 30, 24, 18, 12]))
+        return
+    if '--ai-pools' in sys.argv:
+        budget = 4.0
+        print_ai_pool_sizing(size_ai_pools(budget), budget)
+        return
+    if '--lifecycle' in sys.argv:
+        print_lifecycle_sweep(sweep_container_lifecycle())
+        return
+    if '--triggers' in sys.argv:
+        print_trigger_comparison(compare_trigger_modes())
+        return
+    if '--fleet' in sys.argv:
+        print_fleet_pareto(optimize_fleet())
+        return
+    if '--network' in sys.argv:
+        print_network_comparison(compare_network_layouts())
+        return
+    if '--llm' in sys.argv:
+        print_llm_comparison(llm_task_profiles(), compare_llm_caching())
+        return
+    if '--roster' in sys.argv:
+        print_roster_comparison(compare_rosters())
+        return
+    if '--placement' in sys.argv:
+        print_placement_comparison(compare_placement_strategies())
+        return
+    if '--setup' in sys.argv:
+        print_setup_comparison(compare_setup_parallelism())
+        return
+    if '--forecast' in sys.argv:
+        # --forecast [状态文件]：缺省使用示例快照
+        index = sys.argv.index('--forecast') + 1
+        path = (sys.argv[index] if index < len(sys.argv) and not sys.argv[index].startswith('--')
+                else Path(__file__).with_name('project_state_example.json'))
+        print_delivery_forecast(forecast_delivery(load_project_state_file(path)))
+        return
+    if '--rate-limit' in sys.argv:
+        print_rate_limit_comparison(compare_github_rate_limits())
+        return
+    
+    # --workload 运行多Issue负载模式（默认不逐条打印事件，--verbose 打开）
+    workload = WorkloadConfig() if '--workload' in sys.argv else None
+    
     # 创建仿真实例
-    simulation = BeeSwarmRealisticSimulation()
+    simulation = BeeSwarmRealisticSimulation(
+        profile='--profile' in sys.argv,
+        workload=workload,
+        verbose=workload is None or '--verbose' in sys.argv
+    )
     
     # 运行仿真
     simulation.run_simulation()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Bee Swarm 容量規劃
+在給定到達率下，搜索使 P95 週期時間滿足 SLA 的最小團隊規模和審查者人數，
+每個候選配置的重複次數按序貫置信區間控制
+"""
+
+import argparse
+import math
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from scenario_comparison import ScenarioConfig, WorkflowType, run_scenario_simulation
+
+
+@dataclass
+class StaffingEvaluation:
+    """某一人員配置的序貫評估結果"""
+    team_size: int
+    reviewer_count: int
+    p95_samples: List[float]
+    confidence: float
+    meets: bool
+    decided: bool
+
+    @property
+    def replications(self) -> int:
+        return len(self.p95_samples)
+
+    @property
+    def mean_p95(self) -> float:
+        return float(np.mean(self.p95_samples))
+
+
+@dataclass
+class CapacityPlan:
+    """
+    容量規劃結果
+
+    confidence 為「該配置真實的 P95 均值不超過目標」的單側置信度，
+    decided=False 表示達到最大重複次數仍未達到要求的置信度；feasible=False 表示搜索上限內沒有滿足 SLA 的配置。
+    """
+    target_p95: float
+    arrival_interval: float
+    feasible: bool
+    team_size: int
+    reviewer_count: int
+    mean_p95: float
+    confidence: float
+    decided: bool
+    replications: int
+    config: ScenarioConfig
+    evaluations: pd.DataFrame
+    simulations: int
+    wall_time: float
+
+
+def replication_p95(config: ScenarioConfig, duration: float, seed: int,
+                    scale_mode: bool = False) -> float:
+    """
+    一次重複的 P95 週期時間
+
+    模擬結束時仍未完成的任務以其已用時間計入（週期時間的下界），
+    避免過載配置因只統計已完成任務而顯得更快。
+    """
+    result = run_scenario_simulation(config, duration, seed=seed, scale_mode=scale_mode)
+    cycle_times = np.concatenate([np.asarray(result.metrics['cycle_times'], dtype=float),
+                                  np.asarray(result.metrics['open_task_ages'], dtype=float)])
+    return float(np.percentile(cycle_times, 95)) if len(cycle_times) else 0.0
+
+
+def sla_confidence(samples: List[float], target: float) -> float:
+    """單側 t 檢驗：真實均值 ≤ target 的置信度"""
+    if len(samples) < 2:
+        return 1.0 if samples and samples[0] <= target else 0.0
+    std_error = float(np.std(samples, ddof=1)) / math.sqrt(len(samples))
+    mean = float(np.mean(samples))
+    if std_error == 0:
+        return 1.0 if mean <= target else 0.0
+    return float(stats.t.cdf((target - mean) / std_error, df=len(samples) - 1))
+
+
+class CapacityPlanner:
+    """
+    SLA 驅動的容量規劃器
+
+    假設 P95 週期時間隨團隊規模和審查者人數單調不增。先用二分法求審查者充足
+    （max_reviewers）時的最小團隊規模，它是任何審查者人數下的下界；再從 1 名
+    審查者起逐個二分，上界取上一個審查者人數的結果和當前最優總人數，團隊規模
+    觸及下界或總人數（開發者 + 審查者）不可能更少時停止。每個配置先運行 min_replications 次，置信度落在
+    (1 − confidence, confidence) 之間時按 batch 追加重複，直到作出判斷或達到
+    max_replications（此時按均值判斷並標記為未定）。所有配置的第 r 次重複使用
+    相同的種子 seed + r（共同隨機數），相鄰配置的比較不受抽樣噪聲干擾。
+    """
+
+    def __init__(self, target_p95: float, arrival_interval: float,
+                 base: Optional[ScenarioConfig] = None, duration: float = 720,
+                 confidence: float = 0.9, min_replications: int = 5,
+                 max_replications: int = 30, batch: int = 5, max_team: int = 40,
+                 max_reviewers: int = 10, seed: int = 0, scale_mode: bool = False):
+        if not 0.5 < confidence < 1:
+            raise ValueError("confidence 必須在 (0.5, 1) 之間")
+        self.target_p95 = target_p95
+        self.base = replace(base or ScenarioConfig(name='capacity', workflow_type=WorkflowType.AGILE,
+                                                   team_size=1),
+                            arrival_interval=arrival_interval)
+        self.duration = duration
+        self.confidence = confidence
+        self.min_replications = max(2, min_replications)
+        self.max_replications = max(self.min_replications, max_replications)
+        self.batch = batch
+        self.max_team = max_team
+        self.max_reviewers = max_reviewers
+        self.seed = seed
+        self.scale_mode = scale_mode
+        self.evaluations: Dict[Tuple[int, int], StaffingEvaluation] = {}
+        self.simulations = 0
+
+    def _config(self, team_size: int, reviewer_count: int) -> ScenarioConfig:
+        return replace(self.base, name=f"team-{team_size}-rev-{reviewer_count}",
+                       team_size=team_size, reviewer_count=reviewer_count)
+
+    def evaluate(self, team_size: int, reviewer_count: int) -> StaffingEvaluation:
+        """序貫重複評估一個配置（結果按配置緩存）"""
+        key = (team_size, reviewer_count)
+        if key in self.evaluations:
+            return self.evaluations[key]
+
+        config = self._config(team_size, reviewer_count)
+        samples: List[float] = []
+        while True:
+            count = self.min_replications if not samples else self.batch
+            for replication in range(len(samples), min(len(samples) + count, self.max_replications)):
+                samples.append(replication_p95(config, self.duration, self.seed + replication,
+                                               self.scale_mode))
+                self.simulations += 1
+            confidence = sla_confidence(samples, self.target_p95)
+            decided = confidence >= self.confidence or confidence <= 1 - self.confidence
+            if decided or len(samples) >= self.max_replications:
+                break
+
+        evaluation = StaffingEvaluation(team_size, reviewer_count, samples, confidence,
+                                        meets=confidence >= (self.confidence if decided else 0.5),
+                                        decided=decided)
+        self.evaluations[key] = evaluation
+        return evaluation
+
+    def minimal_team(self, reviewer_count: int, upper: int, lower: int = 0) -> Optional[int]:
+        """
+        二分查找滿足 SLA 的最小團隊規模；upper 也不滿足時返回 None
+
+        lower 為已知不滿足的團隊規模（0 人視為不滿足）。
+        """
+        if not self.evaluate(upper, reviewer_count).meets:
+            return None
+        low, high = lower, upper  # 不變量：high 滿足，low 不滿足
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self.evaluate(middle, reviewer_count).meets:
+                high = middle
+            else:
+                low = middle
+        return high
+
+    def plan(self) -> CapacityPlan:
+        started = time.perf_counter()
+        reviewed = self.base.workflow_type in (WorkflowType.AGILE, WorkflowType.CONTINUOUS)
+        max_reviewers = self.max_reviewers if reviewed else 1
+        best: Optional[Tuple[int, int]] = None
+
+        # 審查者充足時的最小團隊規模是任何審查者人數下的下界
+        floor = self.minimal_team(max_reviewers, self.max_team)
+        if floor is not None:
+            best = (floor, max_reviewers)
+            upper = self.max_team
+            for reviewer_count in range(1, max_reviewers):
+                if floor + reviewer_count >= sum(best):
+                    break
+                # 只有總人數更少的配置才值得確認
+                limit = min(upper, sum(best) - reviewer_count - 1)
+                team_size = self.minimal_team(reviewer_count, limit, floor - 1)
+                if team_size is None:
+                    continue
+                upper = team_size
+                best = (team_size, reviewer_count)
+                if team_size == floor:
+                    break
+
+        table = pd.DataFrame([{
+            'team_size': evaluation.team_size,
+            'reviewer_count': evaluation.reviewer_count,
+            'replications': evaluation.replications,
+            'mean_p95': evaluation.mean_p95,
+            'confidence': evaluation.confidence,
+            'meets': evaluation.meets,
+            'decided': evaluation.decided
+        } for evaluation in self.evaluations.values()])
+
+        chosen = self.evaluations[best] if best else self.evaluations[(self.max_team, max_reviewers)]
+        return CapacityPlan(
+            target_p95=self.target_p95,
+            arrival_interval=self.base.arrival_interval,
+            feasible=best is not None,
+            team_size=chosen.team_size,
+            reviewer_count=chosen.reviewer_count,
+            mean_p95=chosen.mean_p95,
+            confidence=chosen.confidence,
+            decided=chosen.decided,
+            replications=chosen.replications,
+            config=self._config(chosen.team_size, chosen.reviewer_count),
+            evaluations=table,
+            simulations=self.simulations,
+            wall_time=time.perf_counter() - started
+        )
+
+
+def plan_capacity(target_p95: float, arrival_interval: float, **options) -> CapacityPlan:
+    """CapacityPlanner(target_p95, arrival_interval, **options).plan() 的簡寫"""
+    return CapacityPlanner(target_p95, arrival_interval, **options).plan()
+
+
+def print_capacity_plan(plan: CapacityPlan):
+    """輸出規劃結果和評估過的配置"""
+    print(f"📐 P95 cycle time <= {plan.target_p95:g}h at one task every "
+          f"{plan.arrival_interval:g}h ({24 / plan.arrival_interval:.1f} tasks/day)")
+    print(plan.evaluations.sort_values(['reviewer_count', 'team_size']).to_string(
+        index=False, float_format=lambda value: f"{value:.3f}"))
+    if plan.feasible:
+        reviewers = (f" + {plan.reviewer_count} reviewer(s)" if plan.config.workflow_type
+                     in (WorkflowType.AGILE, WorkflowType.CONTINUOUS) else "")
+        print(f"\n✅ Minimal staffing: {plan.team_size} developers{reviewers} "
+              f"(mean P95 {plan.mean_p95:.1f}h, {plan.confidence:.1%} confidence, "
+              f"{plan.replications} replications"
+              + ("" if plan.decided else ", undecided at the replication cap") + ")")
+    else:
+        print(f"\n❌ No staffing up to {plan.team_size} developers meets the target "
+              f"(mean P95 {plan.mean_p95:.1f}h)")
+    print(f"   {plan.simulations} simulations in {plan.wall_time:.1f}s")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Minimal team size and reviewer count for a P95 cycle-time SLA")
+    parser.add_argument('--target', type=float, required=True, help="P95 cycle time target (hours)")
+    rate = parser.add_mutually_exclusive_group()
+    rate.add_argument('--arrival-interval', type=float, default=None, help="mean hours between tasks")
+    rate.add_argument('--arrival-rate', type=float, default=None, help="tasks per day")
+    parser.add_argument('--workflow', choices=[workflow.value for workflow in WorkflowType], default='agile')
+    parser.add_argument('--duration', type=float, default=720)
+    parser.add_argument('--confidence', type=float, default=0.9)
+    parser.add_argument('--min-replications', type=int, default=5)
+    parser.add_argument('--max-replications', type=int, default=30)
+    parser.add_argument('--max-team', type=int, default=40)
+    parser.add_argument('--max-reviewers', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scale-mode', action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.arrival_rate:
+        arrival_interval = 24 / args.arrival_rate
+    else:
+        arrival_interval = args.arrival_interval or ScenarioConfig.arrival_interval
+    base = ScenarioConfig(name='capacity', workflow_type=WorkflowType(args.workflow), team_size=1)
+    print_capacity_plan(plan_capacity(
+        args.target, arrival_interval, base=base, duration=args.duration,
+        confidence=args.confidence, min_replications=args.min_replications,
+        max_replications=args.max_replications, max_team=args.max_team,
+        max_reviewers=args.max_reviewers, seed=args.seed, scale_mode=args.scale_mode))
+
+
+if __name__ == "__main__":
+    main()
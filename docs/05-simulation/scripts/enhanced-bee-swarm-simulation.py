@@ -5,12 +5,15 @@ Bee Swarm 增強版事件驅動仿真
 
 import simpy
 import random
+import sys
 import time
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from enum import Enum
 import colorama
 from colorama import Fore, Back, Style
+from simulation_profiler import ProfiledEnvironment, print_hot_path_report
+from task_graph import TaskGraph, DagScheduler
 
 # 初始化颜色支持
 colorama.init()
@@ -145,9 +148,13 @@ class GitHubRepository:
 class EnhancedBeeSwarmSimulation:
     """增強版 Bee Swarm 仿真 - 融合基礎設施和完整開發流程"""
     
-    def __init__(self):
-        self.env = simpy.Environment()
+    def __init__(self, profile: bool = False):
+        # profile=True 時使用帶剖析功能的環境，運行結束後輸出熱點報告
+        self.profile = profile
+        self.env = ProfiledEnvironment() if profile else simpy.Environment()
         self.random = random.Random(42)
+        if profile:
+            self.log_event = self.env.profile_events(self.log_event)
         
         # 基礎設施資源 (保持原有)
         self.vps_preparation = simpy.Resource(self.env, capacity=2)
@@ -194,6 +201,13 @@ class EnhancedBeeSwarmSimulation:
             }
         }
         
+        # 交付計劃依賴圖與每個角色的就緒隊列（按拓撲序號排序）
+        self.plan_tasks: Dict[str, Task] = {}
+        self.task_graph = TaskGraph()
+        self.scheduler = None
+        self.dag_start_time = None
+        self.ready_queues = {role_id: simpy.PriorityStore(self.env) for role_id in self.roles}
+        
         # 項目狀態追蹤
         self.project_status = {
             'phase': 'setup',  # setup -> requirements -> design -> development -> testing -> deployment
@@ -204,6 +218,7 @@ class EnhancedBeeSwarmSimulation:
             'uat_sessions': 0,
             'deployments': 0
         }
+        self.build_delivery_plan()
         
     def log_event(self, event_type: EventType, actor: str, description: str, 
                   duration: Optional[float] = None, metadata: Dict = None):
@@ -265,12 +280,80 @@ class EnhancedBeeSwarmSimulation:
         self.project_status['setup_completed'] = True
         self.project_status['phase'] = 'requirements'
     
+    def build_delivery_plan(self):
+        """
+        構建交付計劃依賴圖
+        
+        每個任務的 dependencies 指向其前置任務，工期在構建時抽樣並記錄在
+        metadata['duration']，前端、後端和 DevOps 的工作可以並行推進。
+        """
+        # (id, 標題, 負責角色, 階段, 工期範圍, 依賴, 完成事件, 開始事件)
+        plan = [
+            ('T01', '基於Epic創建詳細PRD', 'pm-01', 'requirements', (1, 2), [],
+             EventType.PRD_CREATED, None),
+            ('T02', '分解用戶故事並分配任務', 'pm-01', 'requirements', (0.5, 0.5), ['T01'],
+             EventType.TASK_ASSIGNMENT, None),
+            ('T03', '設計用戶註冊API端點', 'be-01', 'design', (1, 2), ['T02'],
+             EventType.API_DESIGN_CREATED, EventType.TECHNICAL_DESIGN_STARTED),
+            ('T04', '設計用戶數據庫模式', 'be-01', 'design', (1, 2), ['T02'],
+             EventType.DATABASE_SCHEMA_DESIGNED, None),
+            ('T05', '設計用戶註冊UI原型', 'fe-01', 'design', (1, 2), ['T02'],
+             EventType.UI_MOCKUP_CREATED, EventType.TECHNICAL_DESIGN_STARTED),
+            ('T06', '澄清用戶註冊流程和驗證邏輯', 'pm-01', 'design', (0.5, 1.5), ['T05'],
+             EventType.PM_ANSWER, EventType.DEVELOPER_QUESTION),
+            ('T07', '與後端完成API接口對齊', 'fe-01', 'design', (1, 2), ['T03', 'T05'],
+             EventType.API_ALIGNMENT_COMPLETE, EventType.API_ALIGNMENT_REQUEST),
+            ('T08', '實現用戶註冊API', 'be-01', 'development', (3, 5), ['T03', 'T04'],
+             EventType.API_ENDPOINT_IMPLEMENTED, EventType.CODING_STARTED),
+            ('T09', '實現用戶註冊UI', 'fe-01', 'development', (3, 5), ['T06', 'T07'],
+             EventType.UI_COMPONENT_CREATED, EventType.FEATURE_BRANCH_CREATED),
+            ('T10', '配置CI/CD流水線', 'de-01', 'development', (2, 3), ['T02'],
+             EventType.BUILD_COMPLETED, EventType.BUILD_TRIGGERED),
+            ('T11', '部署預發環境', 'de-01', 'development', (1, 2), ['T10'],
+             EventType.DEPLOYMENT_COMPLETED, EventType.DEPLOYMENT_STARTED),
+            ('T12', '編寫用戶註冊API單元測試', 'be-01', 'testing', (1, 1.5), ['T08'],
+             EventType.TEST_PASSED, EventType.UNIT_TEST_WRITTEN),
+            ('T13', '前端註冊UI代碼審查', 'pm-01', 'testing', (1, 2), ['T09'],
+             EventType.CODE_REVIEW_APPROVED, EventType.PR_CREATED),
+            ('T14', '後端註冊API代碼審查', 'pm-01', 'testing', (1, 2), ['T12'],
+             EventType.CODE_REVIEW_APPROVED, EventType.PR_CREATED),
+            ('T15', '用戶註冊功能UAT', 'pm-01', 'testing', (2, 3), ['T11', 'T13', 'T14'],
+             EventType.UAT_COMPLETED, EventType.UAT_STARTED),
+            ('T16', '部署用戶註冊功能到生產環境', 'de-01', 'deployment', (1.5, 2.5), ['T15'],
+             EventType.DEPLOYMENT_COMPLETED, EventType.DEPLOYMENT_STARTED),
+            ('T17', '教育遊戲用戶註冊系統正式發布', 'pm-01', 'deployment', (0.5, 0.5), ['T16'],
+             EventType.PROJECT_RELEASE, None)
+        ]
+        # 完成時關閉的用戶故事
+        stories = {'T04': 'US-003', 'T08': 'US-002', 'T09': 'US-001'}
+        # 開始事件由其他角色發起（前端提出疑問，產品經理解答）
+        start_actors = {'T06': 'fe-01'}
+        # 審查任務開始時由作者創建PR
+        pull_requests = {'T13': ('PR-001', '用戶註冊UI實現', 'fe-01'),
+                         'T14': ('PR-002', '用戶註冊API實現', 'be-01')}
+        
+        for task_id, title, assignee, phase, (low, high), deps, done_event, start_event in plan:
+            task = Task(task_id, title, "task", "HIGH", assignee, dependencies=deps,
+                        metadata={'phase': phase, 'duration': self.random.uniform(low, high),
+                                  'done_event': done_event, 'start_event': start_event})
+            if task_id in stories:
+                task.metadata['story'] = stories[task_id]
+            if task_id in start_actors:
+                task.metadata['start_actor'] = start_actors[task_id]
+            if task_id in pull_requests:
+                task.metadata['pull_request'] = pull_requests[task_id]
+            self.plan_tasks[task_id] = task
+            self.task_graph.add_task(task_id, deps)
+        
+        self.scheduler = DagScheduler(self.task_graph)
+        self.project_status['total_tasks'] = len(self.plan_tasks)
+    
     def requirements_phase(self):
-        """需求分析階段"""
+        """需求階段：人類創建Epic後啟動依賴圖調度"""
         while not self.project_status['setup_completed']:
             yield self.env.timeout(1)
         
-        print(f"\n{Fore.GREEN}📋 Phase 2: 需求分析階段{Style.RESET_ALL}")
+        print(f"\n{Fore.GREEN}📋 Phase 2: 需求分析與依賴圖調度{Style.RESET_ALL}")
         
         # 人類創建 Epic
         epic = Task(
@@ -283,14 +366,11 @@ class EnhancedBeeSwarmSimulation:
         self.repo.create_epic(epic)
         self.log_event(EventType.EPIC_CREATED, "Human", f"創建Epic: {epic.title}")
         
-        # 產品經理處理Epic
-        yield self.env.timeout(self.random.uniform(1, 2))
-        
-        # 創建PRD
-        self.log_event(EventType.PRD_CREATED, "Product Manager AI", 
-                      "基於Epic創建詳細PRD")
-        
-        # 分解用戶故事
+        self.dag_start_time = self.env.now
+        self.release_tasks(self.scheduler.initial_ready())
+    
+    def create_user_stories(self):
+        """分解用戶故事並分配"""
         user_stories = [
             Task("US-001", "用戶註冊頁面UI", "user_story", "HIGH", "fe-01"),
             Task("US-002", "用戶註冊API", "user_story", "HIGH", "be-01"),
@@ -298,111 +378,133 @@ class EnhancedBeeSwarmSimulation:
         ]
         
         for story in user_stories:
+            story.created_time = self.env.now
             self.repo.create_issue(story)
             self.log_event(EventType.USER_STORY_CREATED, "Product Manager AI", 
                           f"創建用戶故事: {story.title}")
-        
-        # 任務分配
-        yield self.env.timeout(0.5)
-        for story in user_stories:
-            self.log_event(EventType.TASK_ASSIGNMENT, "Product Manager AI", 
-                          f"分配任務 '{story.title}' 給 {self.roles[story.assignee]['name']}")
-        
-        self.project_status['phase'] = 'design'
     
-    def development_collaboration(self):
-        """開發協作流程"""
-        while self.project_status['phase'] not in ['design', 'development']:
-            yield self.env.timeout(1)
-        
-        print(f"\n{Fore.CYAN}💻 Phase 3: 開發協作階段{Style.RESET_ALL}")
-        
-        # 前端開始開發
-        yield self.env.timeout(1)
-        self.log_event(EventType.FEATURE_BRANCH_CREATED, "Frontend Developer AI", 
-                      "feature/user-registration-ui")
-        self.log_event(EventType.CODING_STARTED, "Frontend Developer AI", 
-                      "開始實現用戶註冊UI")
-        
-        # 後端API設計
-        yield self.env.timeout(0.5)
-        self.log_event(EventType.API_DESIGN_CREATED, "Backend Developer AI", 
-                      "設計用戶註冊API端點")
-        
-        # API對齊請求
-        yield self.env.timeout(2)
-        self.log_event(EventType.API_ALIGNMENT_REQUEST, "Frontend Developer AI", 
-                      "請求與後端進行API對齊")
-        
-        # 產品經理介入解答
-        yield self.env.timeout(0.5)
-        self.log_event(EventType.DEVELOPER_QUESTION, "Frontend Developer AI", 
-                      "關於用戶註冊流程的產品邏輯疑問")
-        
-        yield self.env.timeout(1)
-        self.log_event(EventType.PM_ANSWER, "Product Manager AI", 
-                      "澄清用戶註冊流程和驗證邏輯")
-        
-        # API對齊完成
-        yield self.env.timeout(1.5)
-        self.log_event(EventType.API_ALIGNMENT_COMPLETE, "Backend Developer AI", 
-                      "與前端完成API接口對齊")
-        
-        self.project_status['api_alignments'] += 1
-        self.project_status['phase'] = 'testing'
+    def release_tasks(self, task_ids):
+        """依賴已滿足的任務按拓撲序號進入負責角色的就緒隊列"""
+        for task_id in task_ids:
+            task = self.plan_tasks[task_id]
+            task.metadata['ready_time'] = self.env.now
+            self.ready_queues[task.assignee].put(
+                simpy.PriorityItem(self.scheduler.rank[task_id], task))
     
-    def testing_and_deployment(self):
-        """測試和部署階段"""
-        while self.project_status['phase'] != 'testing':
-            yield self.env.timeout(1)
-        
-        print(f"\n{Fore.MAGENTA}🧪 Phase 4: 測試和部署階段{Style.RESET_ALL}")
-        
-        # 創建PR
-        yield self.env.timeout(2)
-        self.log_event(EventType.PR_CREATED, "Frontend Developer AI", 
-                      "PR: 用戶註冊UI實現")
-        self.log_event(EventType.PR_CREATED, "Backend Developer AI", 
-                      "PR: 用戶註冊API實現")
-        
-        # 代碼審查
-        yield self.env.timeout(1.5)
-        self.log_event(EventType.CODE_REVIEW_APPROVED, "Product Manager AI", 
-                      "前端註冊UI代碼審查通過")
-        
-        # 單元測試
-        yield self.env.timeout(1)
-        self.log_event(EventType.UNIT_TEST_WRITTEN, "Backend Developer AI", 
-                      "編寫用戶註冊API單元測試")
-        self.log_event(EventType.TEST_PASSED, "Backend Developer AI", 
-                      "API單元測試全部通過")
-        
-        # UAT階段
-        yield self.env.timeout(2)
-        self.log_event(EventType.UAT_STARTED, "Product Manager AI", 
-                      "開始用戶註冊功能UAT")
-        
-        yield self.env.timeout(3)
-        self.log_event(EventType.UAT_COMPLETED, "Product Manager AI", 
-                      "UAT通過，功能符合預期")
-        
-        self.project_status['uat_sessions'] += 1
-        
-        # 部署
-        yield self.env.timeout(1)
-        self.log_event(EventType.DEPLOYMENT_STARTED, "DevOps Engineer AI", 
-                      "開始部署用戶註冊功能到生產環境")
-        
-        yield self.env.timeout(2)
-        self.log_event(EventType.DEPLOYMENT_COMPLETED, "DevOps Engineer AI", 
-                      "部署成功，功能已上線")
-        
-        # 項目發布
-        yield self.env.timeout(0.5)
-        self.log_event(EventType.PROJECT_RELEASE, "Product Manager AI", 
-                      "🎉 教育遊戲用戶註冊系統正式發布！")
-        
-        self.project_status['deployments'] += 1
+    def role_worker(self, role_id):
+        """角色依次處理就緒隊列中的任務，首次收到任務時激活"""
+        role = self.roles[role_id]
+        while True:
+            item = yield self.ready_queues[role_id].get()
+            task = item.item
+            if not role['active']:
+                role['active'] = True
+                self.log_event(EventType.AI_ROLE_ACTIVATION, role['name'], 
+                              f"{role['name']} 激活，開始處理依賴圖任務")
+            yield from self.run_plan_task(role_id, task)
+    
+    def run_plan_task(self, role_id, task: Task):
+        """執行單個計劃任務，完成後釋放其後繼任務"""
+        role = self.roles[role_id]
+        metadata = task.metadata
+        role['current_task'] = task.id
+        task.status = "進行中"
+        metadata['start_time'] = self.env.now
+        self.advance_phase(metadata['phase'])
+        
+        if 'pull_request' in metadata:
+            pr_id, pr_title, author = metadata['pull_request']
+            self.repo.create_pr(Task(pr_id, pr_title, "pull_request", "HIGH", author,
+                                     created_time=self.env.now))
+            self.log_event(EventType.PR_CREATED, self.roles[author]['name'], f"PR: {pr_title}")
+        elif metadata['start_event']:
+            actor = self.roles[metadata.get('start_actor', role_id)]['name']
+            self.log_event(metadata['start_event'], actor, task.title)
+        
+        yield self.env.timeout(metadata['duration'])
+        
+        task.status = "已完成"
+        task.completed_time = self.env.now
+        role['current_task'] = None
+        role['busy_time'] = role.get('busy_time', 0.0) + metadata['duration']
+        self.project_status['completed_tasks'] += 1
+        self.log_event(metadata['done_event'], role['name'], task.title, metadata['duration'])
+        
+        if task.id == 'T02':
+            self.create_user_stories()
+        if 'story' in metadata:
+            self.repo.issues[metadata['story']].status = "已完成"
+        if task.id == 'T07':
+            self.project_status['api_alignments'] += 1
+        elif task.id == 'T15':
+            self.project_status['uat_sessions'] += 1
+        elif task.id == 'T16':
+            self.project_status['deployments'] += 1
+        elif task.id == 'T17':
+            self.project_status['phase'] = 'released'
+        
+        self.release_tasks(self.scheduler.complete(task.id))
+    
+    def advance_phase(self, phase: str):
+        """項目階段取已開始任務中最靠後的階段"""
+        order = ['setup', 'requirements', 'design', 'development', 'testing', 'deployment', 'released']
+        if order.index(phase) > order.index(self.project_status['phase']):
+            self.project_status['phase'] = phase
+    
+    def critical_path_report(self) -> Dict[str, Any]:
+        """
+        關鍵路徑與每個角色的鬆弛時間
+        
+        依賴圖的關鍵路徑只考慮依賴關係（假設角色無限並行）；實際工期還包含
+        同一角色串行處理造成的等待，兩者之差即角色資源約束帶來的延遲。
+        """
+        durations = {task_id: task.metadata['duration'] for task_id, task in self.plan_tasks.items()}
+        result = self.task_graph.critical_path(durations)
+        
+        finished = [task for task in self.plan_tasks.values() if task.completed_time is not None]
+        makespan = (max(task.completed_time for task in finished) - self.dag_start_time
+                    if finished and self.scheduler.finished else None)
+        
+        role_slack = {}
+        for role_id in self.roles:
+            tasks = [task_id for task_id, task in self.plan_tasks.items() if task.assignee == role_id]
+            if tasks:
+                slacks = [result.slack[task_id] for task_id in tasks]
+                role_slack[role_id] = {
+                    'tasks': len(tasks),
+                    'work_hours': sum(durations[task_id] for task_id in tasks),
+                    'min_slack': min(slacks),
+                    'mean_slack': sum(slacks) / len(slacks),
+                    'critical_tasks': sum(1 for task_id in tasks if task_id in result.path)
+                }
+        return {
+            'critical_path': result.path,
+            'critical_path_length': result.length,
+            'makespan': makespan,
+            'sequential_length': sum(durations.values()),
+            'slack': result.slack,
+            'role_slack': role_slack
+        }
+    
+    def print_critical_path(self):
+        """輸出關鍵路徑分析"""
+        report = self.critical_path_report()
+        print(f"\n🧭 關鍵路徑分析:")
+        chain = " → ".join(f"{task_id}({self.plan_tasks[task_id].metadata['duration']:.1f}h)"
+                           for task_id in report['critical_path'])
+        print(f"  關鍵路徑: {chain}")
+        print(f"  關鍵路徑長度: {report['critical_path_length']:.1f} 小時 "
+              f"(全部串行: {report['sequential_length']:.1f} 小時)")
+        if report['makespan'] is not None:
+            print(f"  實際交付用時: {report['makespan']:.1f} 小時 "
+                  f"(角色串行等待 {report['makespan'] - report['critical_path_length']:.1f} 小時)")
+        else:
+            print(f"  實際交付用時: 未完成 ({self.project_status['completed_tasks']}/"
+                  f"{self.project_status['total_tasks']} 任務)")
+        print(f"  {'角色':<24}{'任務':>4}{'工時(h)':>9}{'最小鬆弛(h)':>12}{'平均鬆弛(h)':>12}{'關鍵任務':>9}")
+        for role_id, stats in report['role_slack'].items():
+            print(f"  {self.roles[role_id]['name']:<24}{stats['tasks']:>4}{stats['work_hours']:>9.1f}"
+                  f"{stats['min_slack']:>12.1f}{stats['mean_slack']:>12.1f}{stats['critical_tasks']:>9}")
     
     def github_action_cycle(self):
         """GitHub Action 30分鐘循環 (保持原有機制)"""
@@ -435,8 +537,8 @@ class EnhancedBeeSwarmSimulation:
         # 啟動所有流程
         self.env.process(self.setup_infrastructure())
         self.env.process(self.requirements_phase())
-        self.env.process(self.development_collaboration())
-        self.env.process(self.testing_and_deployment())
+        for role_id in self.roles:
+            self.env.process(self.role_worker(role_id))
         self.env.process(self.github_action_cycle())
         
         # 運行仿真
@@ -446,6 +548,8 @@ class EnhancedBeeSwarmSimulation:
         
         # 輸出結果
         self.print_enhanced_results(end_time - start_time)
+        if self.profile:
+            print_hot_path_report(self.env)
     
     def print_enhanced_results(self, real_time):
         """輸出增強版結果"""
@@ -479,8 +583,11 @@ class EnhancedBeeSwarmSimulation:
         print(f"  模擬時間: {self.env.now:.1f} 小時")
         print(f"  實際執行時間: {real_time:.2f} 秒")
         print(f"  當前階段: {self.project_status['phase']}")
+        print(f"  完成任務: {self.project_status['completed_tasks']}/{self.project_status['total_tasks']}")
+        
+        self.print_critical_path()
 
 if __name__ == "__main__":
     print("啟動增強版 Bee Swarm 仿真...")
-    sim = EnhancedBeeSwarmSimulation()
+    sim = EnhancedBeeSwarmSimulation(profile='--profile' in sys.argv)
     sim.run_simulation(duration_hours=24) 
\ No newline at end of file
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Bee Swarm 參數掃描引擎
+在 ScenarioConfig 字段上生成網格、隨機或拉丁超立方設計，用進程池並行運行
+run_scenario_simulation，結果按配置緩存並整理為整潔（tidy）表格
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scenario_comparison import ScenarioConfig, WorkflowType, run_scenario_simulation
+
+# 緩存鍵的版本號：模擬器語義改變時遞增，使舊的緩存結果失效
+CACHE_VERSION = 2
+
+
+@dataclass(frozen=True)
+class Parameter:
+    """
+    可掃描的 ScenarioConfig 字段
+
+    values 非空時為離散取值（例如 workflow_type），否則在 [low, high] 內取值；
+    integer=True 時取整（例如 team_size）。
+    """
+    name: str
+    low: float = 0.0
+    high: float = 1.0
+    integer: bool = False
+    values: Tuple[Any, ...] = ()
+
+    def from_unit(self, u: float) -> Any:
+        """把 [0, 1) 內的數映射為參數值"""
+        if self.values:
+            return self.values[min(len(self.values) - 1, int(u * len(self.values)))]
+        if self.integer:
+            return int(min(self.high, self.low + int(u * (self.high - self.low + 1))))
+        return self.low + u * (self.high - self.low)
+
+    def levels(self, count: int) -> List[Any]:
+        """網格設計的取值：離散參數取全部值，連續參數取 count 個等距點"""
+        if self.values:
+            return list(self.values)
+        if count == 1:
+            points = [(self.low + self.high) / 2]
+        else:
+            points = list(np.linspace(self.low, self.high, count))
+        if self.integer:
+            return sorted({int(round(point)) for point in points})
+        return [float(point) for point in points]
+
+
+# 默認掃描空間
+DEFAULT_PARAMETERS = (
+    Parameter('team_size', 2, 12, integer=True),
+    Parameter('automation_level', 0.0, 1.0),
+    Parameter('documentation_overhead', 0.0, 0.5),
+    Parameter('meeting_overhead', 0.0, 0.3),
+    Parameter('defect_rate', 0.0, 0.3),
+    Parameter('rework_multiplier', 1.0, 3.0)
+)
+
+# 每次運行記錄的指標
+KPI_COLUMNS = ['tasks_created', 'tasks_completed', 'completion_rate', 'average_cycle_time',
+               'p95_cycle_time', 'throughput', 'defect_count', 'rework_count', 'team_utilization']
+
+
+def grid_design(parameters: Sequence[Parameter], levels: int = 3) -> List[Dict[str, Any]]:
+    """全因子網格設計"""
+    names = [parameter.name for parameter in parameters]
+    return [dict(zip(names, combination))
+            for combination in itertools.product(*(parameter.levels(levels) for parameter in parameters))]
+
+
+def random_design(parameters: Sequence[Parameter], samples: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """獨立均勻隨機抽樣"""
+    rng = np.random.default_rng(seed)
+    units = rng.random((samples, len(parameters)))
+    return [{parameter.name: parameter.from_unit(u) for parameter, u in zip(parameters, row)}
+            for row in units]
+
+
+def latin_hypercube_design(parameters: Sequence[Parameter], samples: int,
+                           seed: int = 0) -> List[Dict[str, Any]]:
+    """拉丁超立方抽樣：每個參數的 samples 個等概率區間各抽一個點，區間順序隨機配對"""
+    rng = np.random.default_rng(seed)
+    units = np.empty((samples, len(parameters)))
+    for column in range(len(parameters)):
+        units[:, column] = (rng.permutation(samples) + rng.random(samples)) / samples
+    return [{parameter.name: parameter.from_unit(u) for parameter, u in zip(parameters, row)}
+            for row in units]
+
+
+def make_design(kind: str, parameters: Sequence[Parameter], samples: int = 100,
+                levels: int = 3, seed: int = 0) -> List[Dict[str, Any]]:
+    """按名稱生成設計：'grid'、'random' 或 'lhs'"""
+    if kind == 'grid':
+        return grid_design(parameters, levels)
+    if kind == 'random':
+        return random_design(parameters, samples, seed)
+    if kind == 'lhs':
+        return latin_hypercube_design(parameters, samples, seed)
+    raise ValueError(f"未知的設計類型: {kind}")
+
+
+def _plain(value: Any) -> Any:
+    """枚舉和 numpy 標量轉為可 JSON 序列化的值"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def scenario_key(config: ScenarioConfig, duration: float, seed: int, scale_mode: bool) -> str:
+    """緩存鍵：配置字段（不含名稱）和運行參數的哈希"""
+    fields = {name: _plain(value) for name, value in asdict(config).items() if name != 'name'}
+    payload = json.dumps([CACHE_VERSION, fields, duration, seed, scale_mode], sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def evaluate_config(config: ScenarioConfig, duration: float, seed: int,
+                    scale_mode: bool = False) -> Dict[str, Any]:
+    """
+    運行一次模擬，返回 KPI 字典（在工作進程中執行）
+
+    週期時間 KPI 把結束時仍未完成的任務以其已用時間計入（週期時間的下界），
+    避免短時長運行只統計少數已完成任務而偏樂觀；沒有完成任何任務的運行
+    記為 duration，即任何運行都不會超過的最差值。
+    """
+    start = time.perf_counter()
+    result = run_scenario_simulation(config, duration, seed=seed, scale_mode=scale_mode)
+    cycle_times = np.concatenate([np.asarray(result.metrics['cycle_times'], dtype=float),
+                                  np.asarray(result.metrics['open_task_ages'], dtype=float)])
+    if result.tasks_completed:
+        average_cycle_time = float(np.mean(cycle_times))
+        p95_cycle_time = float(np.percentile(cycle_times, 95))
+    else:
+        average_cycle_time = p95_cycle_time = float(duration)
+    return {
+        'tasks_created': result.tasks_created,
+        'tasks_completed': result.tasks_completed,
+        'completion_rate': result.completion_rate,
+        'average_cycle_time': average_cycle_time,
+        'p95_cycle_time': p95_cycle_time,
+        'throughput': result.throughput,
+        'defect_count': result.defect_count,
+        'rework_count': result.rework_count,
+        'team_utilization': result.team_utilization,
+        'wall_time': time.perf_counter() - start
+    }
+
+
+def _evaluate_job(job: Tuple[ScenarioConfig, float, int, bool]) -> Dict[str, Any]:
+    return evaluate_config(*job)
+
+
+class ResultCache:
+    """
+    JSON Lines 結果緩存
+
+    每行為 {"key": ..., "kpis": {...}}，新結果追加寫入並立即落盤，掃描中斷後
+    重新運行會跳過已完成的點。只由主進程讀寫，工作進程不接觸緩存文件。
+    path 為 None 時只在內存中緩存。
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as handle:
+                for line in handle:
+                    line = line.strip()
+                    if line:
+                        entry = json.loads(line)
+                        self.entries[entry['key']] = entry['kpis']
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(key)
+
+    def put(self, key: str, kpis: Dict[str, Any]):
+        self.entries[key] = kpis
+        if self.path:
+            with open(self.path, 'a', encoding='utf-8') as handle:
+                handle.write(json.dumps({'key': key, 'kpis': kpis}) + '\n')
+
+
+def build_config(base: ScenarioConfig, point: Dict[str, Any], name: str) -> ScenarioConfig:
+    """把設計點應用到基準配置上（workflow_type 可以是枚舉值或字符串）"""
+    values = dict(point)
+    if isinstance(values.get('workflow_type'), str):
+        values['workflow_type'] = WorkflowType(values['workflow_type'])
+    unknown = set(values) - set(ScenarioConfig.__dataclass_fields__)
+    if unknown:
+        raise ValueError(f"ScenarioConfig 沒有字段: {', '.join(sorted(unknown))}")
+    return replace(base, name=name, **{key: _plain(value) if key != 'workflow_type' else value
+                                       for key, value in values.items()})
+
+
+def run_sweep(points: Sequence[Dict[str, Any]], base: Optional[ScenarioConfig] = None,
+              duration: float = 240, replications: int = 1, seed: int = 0,
+              workers: Optional[int] = None, cache: Optional[ResultCache] = None,
+              scale_mode: bool = False, chunksize: int = 4,
+              progress: Optional[Callable[[int, int], None]] = None) -> pd.DataFrame:
+    """
+    運行掃描，返回每個（設計點, 重複）一行的整潔表格
+
+    重複 r 使用隨機種子 seed + r，所有設計點共享同一組種子（公共隨機數），
+    點之間的差異不被抽樣噪聲掩蓋。緩存命中的運行不再提交；workers 為 1 時
+    在當前進程中順序運行，默認使用全部 CPU。
+    """
+    base = base or ScenarioConfig(name='sweep', workflow_type=WorkflowType.AGILE, team_size=4)
+    cache = cache if cache is not None else ResultCache()
+    rows, jobs, pending = [], [], []
+    for index, point in enumerate(points):
+        config = build_config(base, point, f"point-{index}")
+        for replication in range(replications):
+            run_seed = seed + replication
+            key = scenario_key(config, duration, run_seed, scale_mode)
+            row = {'point': index, **{name: _plain(value) for name, value in point.items()},
+                   'replication': replication, 'seed': run_seed}
+            rows.append(row)
+            if key in cache:
+                row.update(cache.get(key), cached=True)
+            else:
+                row['cached'] = False
+                jobs.append((config, duration, run_seed, scale_mode))
+                pending.append((row, key))
+
+    workers = workers or os.cpu_count() or 1
+    total, done = len(jobs), 0
+    if workers == 1 or total <= 1:
+        results = map(_evaluate_job, jobs)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_evaluate_job, jobs, chunksize=chunksize)
+    try:
+        for (row, key), kpis in zip(pending, results):
+            cache.put(key, kpis)
+            row.update(kpis)
+            done += 1
+            if progress:
+                progress(done, total)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return pd.DataFrame(rows)
+
+
+def summarize_sweep(table: pd.DataFrame, kpis: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """按設計點匯總重複運行：每個 KPI 的均值和標準差"""
+    kpis = list(kpis or [column for column in KPI_COLUMNS if column in table])
+    parameters = [column for column in table.columns
+                  if column not in set(KPI_COLUMNS) | {'replication', 'seed', 'cached', 'wall_time'}]
+    grouped = table.groupby(parameters, sort=False)[kpis]
+    summary = grouped.mean()
+    if table['replication'].nunique() > 1:
+        summary = summary.join(grouped.std().add_suffix('_std'))
+    return summary.reset_index()
+
+
+@dataclass
+class HalvingResult:
+    """逐次減半搜索結果；budget 以模擬小時（時長 × 重複次數）計"""
+    best: Dict[str, Any]
+    best_score: float
+    rungs: pd.DataFrame
+    budget: float
+    full_budget: float
+
+    @property
+    def savings(self) -> float:
+        """全部候選都按最高保真度評估所需預算與實際預算之比"""
+        return self.full_budget / self.budget if self.budget else 0.0
+
+
+def halving_schedule(candidates: int, eta: int = 3, min_duration: float = 48,
+                     max_duration: float = 480, min_replications: int = 1,
+                     max_replications: int = 4, keep: int = 1) -> List[Tuple[int, float, int]]:
+    """
+    逐次減半的保真度階梯：[(候選數, 模擬時長, 重複次數), ...]
+
+    每一級保留前 1/eta 的候選，保真度乘以 eta：先延長模擬時長到 max_duration，
+    再增加重複次數到 max_replications。候選數不超過 keep 或保真度已到上限時停止，
+    最後一級總是使用最高保真度。
+    """
+    schedule = []
+    count, duration, replications = candidates, float(min_duration), min_replications
+    while True:
+        at_max = duration >= max_duration and replications >= max_replications
+        if count <= keep or at_max:
+            schedule.append((count, float(max_duration), max_replications))
+            return schedule
+        schedule.append((count, duration, replications))
+        count = max(keep, -(-count // eta))
+        if duration < max_duration:
+            duration = min(max_duration, duration * eta)
+        else:
+            replications = min(max_replications, replications * eta)
+
+
+def successive_halving(points: Sequence[Dict[str, Any]], base: Optional[ScenarioConfig] = None,
+                       kpi: str = 'average_cycle_time', maximize: bool = False,
+                       eta: int = 3, min_duration: float = 48, max_duration: float = 480,
+                       min_replications: int = 1, max_replications: int = 4, keep: int = 1,
+                       seed: int = 0, workers: Optional[int] = None,
+                       cache: Optional[ResultCache] = None,
+                       scale_mode: bool = False) -> HalvingResult:
+    """
+    多保真度逐次減半（Successive Halving）
+
+    所有候選先用短時長、少重複評估，按 kpi 的均值淘汰後 (1 − 1/eta) 的候選，
+    騰出的預算用於以更高保真度評估倖存者，直到只剩 keep 個候選。每一級內所有
+    候選共享同一組隨機種子，排序不受抽樣噪聲的影響。與最後一名倖存者同分的
+    候選無法區分（例如短時長內都沒有完成任務），一併晉級下一級，而不是按
+    輸入順序淘汰。
+    """
+    schedule = halving_schedule(len(points), eta, min_duration, max_duration,
+                                min_replications, max_replications, keep)
+    survivors = list(range(len(points)))
+    ranked: List[float] = []
+    frames, budget = [], 0.0
+    for rung, (count, duration, replications) in enumerate(schedule):
+        while count < len(ranked) and ranked[count] == ranked[count - 1]:
+            count += 1
+        survivors = survivors[:count]
+        table = run_sweep([points[index] for index in survivors], base, duration, replications,
+                          seed, workers, cache, scale_mode)
+        scores = table.groupby('point')[kpi].mean()
+        order = scores.sort_values(ascending=not maximize, kind='stable').index
+        survivors = [survivors[local] for local in order]
+        ranked = list(scores.loc[order].values)
+        budget += duration * replications * len(table['point'].unique())
+        summary = pd.DataFrame({'candidate': survivors, 'score': ranked})
+        summary.insert(0, 'rung', rung)
+        summary['duration'] = duration
+        summary['replications'] = replications
+        frames.append(summary)
+
+    best = survivors[0]
+    return HalvingResult(best=dict(points[best]), best_score=float(frames[-1]['score'].iloc[0]),
+                         rungs=pd.concat(frames, ignore_index=True), budget=budget,
+                         full_budget=len(points) * max_duration * max_replications)
+
+
+def parse_parameter(spec: str) -> Parameter:
+    """解析命令行參數範圍：name=low:high（整數字段自動取整）或 name=a,b,c（離散取值）"""
+    name, _, values = spec.partition('=')
+    if name not in ScenarioConfig.__dataclass_fields__ or name == 'name':
+        raise ValueError(f"ScenarioConfig 沒有可掃描的字段: {name}")
+    integer = ScenarioConfig.__dataclass_fields__[name].type in (int, 'int')
+    if ':' in values:
+        low, high = (float(value) for value in values.split(':'))
+        return Parameter(name, low, high, integer=integer)
+    items = [item for item in values.split(',') if item]
+    if name == 'workflow_type':
+        return Parameter(name, values=tuple(WorkflowType(item) for item in items))
+    cast = int if integer else float
+    return Parameter(name, values=tuple(cast(item) for item in items))
+
+
+def print_halving_result(result: HalvingResult, kpi: str):
+    """輸出每一級的候選數和保真度，以及最佳配置"""
+    print(f"✂️  Successive halving on {kpi}")
+    print(f"{'Rung':>4}{'Candidates':>12}{'Duration(h)':>13}{'Reps':>6}{'Best score':>12}")
+    for rung, frame in result.rungs.groupby('rung'):
+        print(f"{rung:>4}{len(frame):>12}{frame['duration'].iloc[0]:>13.0f}"
+              f"{frame['replications'].iloc[0]:>6}{frame['score'].iloc[0]:>12.3f}")
+    print(f"Budget: {result.budget:,.0f} simulated hours vs {result.full_budget:,.0f} "
+          f"for a full sweep at top fidelity ({result.savings:.1f}x less)")
+    print("Best configuration: " + ", ".join(
+        f"{name}={_plain(value):.3g}" if isinstance(_plain(value), float) else f"{name}={_plain(value)}"
+        for name, value in result.best.items()) + f" -> {kpi} {result.best_score:.3f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Parameter sweep over ScenarioConfig fields")
+    parser.add_argument('--design', choices=['grid', 'random', 'lhs'], default='lhs')
+    parser.add_argument('--samples', type=int, default=50, help="points for random/lhs designs")
+    parser.add_argument('--levels', type=int, default=3, help="levels per continuous field for grid designs")
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=LOW:HIGH|A,B,C',
+                        help="field to sweep (repeatable); defaults to the six standard fields")
+    parser.add_argument('--workflow', choices=[workflow.value for workflow in WorkflowType], default='agile')
+    parser.add_argument('--duration', type=float, default=240)
+    parser.add_argument('--replications', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cache', default=None, help="JSON Lines cache file reused across runs")
+    parser.add_argument('--output', default=None, help="write the per-run table to CSV")
+    parser.add_argument('--scale-mode', action='store_true')
+    parser.add_argument('--sort-by', default='throughput')
+    parser.add_argument('--halving', action='store_true',
+                        help="successive halving on --kpi instead of a full sweep")
+    parser.add_argument('--kpi', default='average_cycle_time')
+    parser.add_argument('--maximize', action='store_true')
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--min-duration', type=float, default=48)
+    args = parser.parse_args(argv)
+
+    parameters = [parse_parameter(spec) for spec in args.param] or list(DEFAULT_PARAMETERS)
+    points = make_design(args.design, parameters, args.samples, args.levels, args.seed)
+    base = ScenarioConfig(name='sweep', workflow_type=WorkflowType(args.workflow), team_size=4)
+    cache = ResultCache(args.cache)
+
+    if args.halving:
+        print_halving_result(successive_halving(
+            points, base, args.kpi, args.maximize, args.eta, args.min_duration, args.duration,
+            1, args.replications, seed=args.seed, workers=args.workers, cache=cache,
+            scale_mode=args.scale_mode), args.kpi)
+        return
+
+    print(f"🔄 Sweeping {len(points)} points x {args.replications} replications "
+          f"({args.design}, {len(cache)} cached results)")
+    started = time.perf_counter()
+
+    def progress(done: int, total: int):
+        if done == total or done % max(1, total // 20) == 0:
+            print(f"   {done}/{total} runs", file=sys.stderr)
+
+    table = run_sweep(points, base, args.duration, args.replications, args.seed,
+                      args.workers, cache, args.scale_mode, progress=progress)
+    elapsed = time.perf_counter() - started
+    print(f"✅ {len(table)} runs ({int(table['cached'].sum())} from cache) in {elapsed:.1f}s")
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"💾 Results saved to '{args.output}'")
+    summary = summarize_sweep(table).sort_values(args.sort_by, ascending=False)
+    columns = [parameter.name for parameter in parameters] + [
+        'throughput', 'average_cycle_time', 'p95_cycle_time', 'team_utilization']
+    print(f"\n🏆 Top configurations by {args.sort_by}:")
+    print(summary[columns].head(10).to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Bee Swarm 角色註冊表
+從 roles/*/role.yaml 和 roles/*/prompt.md 發現角色，支持每個角色多個副本和按能力索引查找
+"""
+
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+# 倉庫根目錄下的 roles/（本文件位於 docs/05-simulation/scripts/）
+ROLES_DIR = Path(__file__).resolve().parents[3] / 'roles'
+
+
+@dataclass
+class RoleSpec:
+    """
+    角色定義（對應 roles/<key>/role.yaml）
+
+    role_id 為第一個容器實例的名稱，其餘副本命名為 <role_id>-2、<role_id>-3……
+    task_templates 為該角色通常承接的 Issue 任務（標題和抽樣權重）。
+    """
+    role_id: str
+    name: str
+    ai_tool: str
+    description: str = ''
+    capabilities: List[str] = field(default_factory=list)
+    default_tasks: List[str] = field(default_factory=list)
+    task_templates: List[Dict[str, Any]] = field(default_factory=list)
+    is_pm: bool = False
+    cpu_demand: float = 1.0
+    memory_gb: float = 1.0
+    replicas: int = 1
+    key: str = ''
+    prompt_path: Optional[Path] = None
+
+    def instance_ids(self) -> List[str]:
+        return [self.role_id if replica == 1 else f"{self.role_id}-{replica}"
+                for replica in range(1, self.replicas + 1)]
+
+    @classmethod
+    def from_directory(cls, directory: Path) -> 'RoleSpec':
+        """讀取 role.yaml；prompt.md 存在時記錄其路徑"""
+        with open(directory / 'role.yaml', encoding='utf-8') as handle:
+            data = yaml.safe_load(handle) or {}
+        missing = [name for name in ('role_id', 'name', 'ai_tool') if name not in data]
+        if missing:
+            raise ValueError(f"{directory / 'role.yaml'} 缺少字段: {', '.join(missing)}")
+        unknown = set(data) - set(cls.__dataclass_fields__) - {'prompt_path'}
+        if unknown:
+            raise ValueError(f"{directory / 'role.yaml'} 包含未知字段: {', '.join(sorted(unknown))}")
+        prompt = directory / 'prompt.md'
+        data.setdefault('key', directory.name)
+        return cls(prompt_path=prompt if prompt.exists() else None, **data)
+
+
+class RoleRegistry:
+    """
+    角色註冊表
+
+    角色按註冊順序保存（產品經理始終排在最前，作為任務分配的協調者），
+    同時維護能力 → 角色的倒排索引，便於按能力路由任務。
+    """
+
+    def __init__(self, specs: Optional[List[RoleSpec]] = None):
+        self.specs: Dict[str, RoleSpec] = {}
+        self.capability_index: Dict[str, List[str]] = {}
+        for spec in specs or []:
+            self.register(spec)
+
+    @classmethod
+    def discover(cls, roles_dir: Path = ROLES_DIR,
+                 include: Optional[List[str]] = None) -> 'RoleRegistry':
+        """掃描 roles_dir 下含 role.yaml 的目錄；include 為目錄名白名單，角色按 include 的順序排列"""
+        directories = sorted(path.parent for path in Path(roles_dir).glob('*/role.yaml'))
+        if include is not None:
+            found = {path.name: path for path in directories}
+            missing = [name for name in include if name not in found]
+            if missing:
+                raise ValueError(f"{roles_dir} 中找不到角色: {', '.join(missing)}")
+            directories = [found[name] for name in include]
+        specs = [RoleSpec.from_directory(path) for path in directories]
+        return cls(sorted(specs, key=lambda spec: not spec.is_pm))
+
+    def register(self, spec: RoleSpec):
+        if spec.role_id in self.specs:
+            raise ValueError(f"重複的角色: {spec.role_id}")
+        if spec.replicas < 1:
+            raise ValueError(f"角色 {spec.role_id} 的副本數必須至少為 1")
+        if spec.is_pm and self.pm is not None:
+            raise ValueError(f"只能有一個產品經理角色: {self.pm.role_id}, {spec.role_id}")
+        self.specs[spec.role_id] = spec
+        for capability in spec.capabilities:
+            self.capability_index.setdefault(capability, []).append(spec.role_id)
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def __iter__(self) -> Iterator[RoleSpec]:
+        return iter(self.specs.values())
+
+    def __contains__(self, role_id: str) -> bool:
+        return role_id in self.specs
+
+    def get(self, role_id: str) -> RoleSpec:
+        return self.specs[role_id]
+
+    @property
+    def pm(self) -> Optional[RoleSpec]:
+        return next((spec for spec in self.specs.values() if spec.is_pm), None)
+
+    def with_capability(self, capability: str) -> List[RoleSpec]:
+        """具備某項能力的角色（按註冊順序）"""
+        return [self.specs[role_id] for role_id in self.capability_index.get(capability, [])]
+
+    def with_replicas(self, replicas: Dict[str, int]) -> 'RoleRegistry':
+        """返回調整了部分角色副本數的新註冊表"""
+        unknown = set(replicas) - set(self.specs)
+        if unknown:
+            raise ValueError(f"未知角色: {', '.join(sorted(unknown))}")
+        return RoleRegistry([replace(spec, replicas=replicas.get(spec.role_id, spec.replicas))
+                             for spec in self.specs.values()])
+
+    def replica_counts(self) -> Dict[str, int]:
+        return {role_id: spec.replicas for role_id, spec in self.specs.items()}
+
+    def instances(self) -> List[Tuple[str, str]]:
+        """所有 (角色, 容器實例) 對"""
+        return [(spec.role_id, instance) for spec in self.specs.values()
+                for instance in spec.instance_ids()]
+
+    def task_templates(self) -> List[Dict[str, Any]]:
+        """
+        匯總各角色的任務模板，按角色的首要能力（capabilities[0]）標記路由目標
+
+        仿真在創建任務時按能力查找角色，而不是綁定具體角色實例。
+        """
+        templates = []
+        for spec in self.specs.values():
+            if spec.is_pm or not spec.capabilities:
+                continue
+            for template in spec.task_templates:
+                templates.append({'title': template['title'],
+                                  'capability': template.get('capability', spec.capabilities[0]),
+                                  'weight': template.get('weight', 1.0)})
+        return templates
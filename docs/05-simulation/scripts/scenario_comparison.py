@@ -10,10 +10,21 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from typing import Dict, List, Any, Tuple
-from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Any, Tuple, Optional
+from dataclasses import dataclass, field, replace
 from enum import Enum
+import copy
+import itertools
 import json
+import math
+import sys
+import time
+import tracemalloc
+from array import array
+from collections import deque
+from simulation_profiler import ProfiledEnvironment
+from simulation_stats import FlowAccounting
+from trace_replay import TraceEvent, TraceReader, trace_summary
 
 class WorkflowType(Enum):
     WATERFALL = "waterfall"
@@ -31,7 +42,10 @@ class ScenarioConfig:
     documentation_overhead: float = 0.2
     meeting_overhead: float = 0.1
     defect_rate: float = 0.1
-    rework_multiplier: float = 1.5
+    rework_multiplier: float = 1.0  # 返工（發現缺陷或審查退回後再次開發）耗時相對首次開發的倍數
+    arrival_interval: float = 8.0  # 平均任務到達間隔（小時）
+    reviewer_count: int = 1
+    review_rework_probability: float = 0.2  # 審查後退回修改的概率
 
 @dataclass
 class SimulationResult:
@@ -51,9 +65,13 @@ class SimulationResult:
 class EnhancedTeamSimulator:
     """增強的團隊模擬器"""
     
-    def __init__(self, env: simpy.Environment, config: ScenarioConfig):
+    def __init__(self, env: simpy.Environment, config: ScenarioConfig,
+                 seed: Optional[int] = None, trace: Optional[Iterable[TraceEvent]] = None):
         self.env = env
         self.config = config
+        self.random = random.Random(seed)
+        # 回放軌跡時，每個到達事件生成一個任務，取代合成的泊松到達
+        self.trace = iter(trace) if trace is not None else None
         self.tasks = []
         self.completed_tasks = []
         self.metrics = {
@@ -68,37 +86,59 @@ class EnhancedTeamSimulator:
         self.task_queue = simpy.Store(env)
         self.review_queue = simpy.Store(env)
         
+        # 時間加權賬本：忙碌時間、WIP 和排隊長度在狀態變化時更新
+        self.accounting = FlowAccounting(env.now)
+        self.developer_keys = [f"dev-{i}" for i in range(config.team_size)]
+        self.reviewer_keys = [f"reviewer-{i}" for i in range(config.reviewer_count)]
+        for key in self.developer_keys + self.reviewer_keys:
+            self.accounting.register_worker(key, env.now)
+        
     def generate_tasks(self):
         """任務生成器"""
         task_id = 0
+        if self.trace is not None:
+            for event in self.trace:
+                yield self.env.timeout(max(0.0, event.time - self.env.now))
+                task = self._create_task(task_id, event)
+                self.tasks.append(task)
+                self.accounting.arrive(self.env.now)
+                yield self.task_queue.put(task)
+                task_id += 1
+            return
         while True:
             # 根據工作流程類型調整任務生成頻率
             if self.config.workflow_type == WorkflowType.WATERFALL:
-                # 瀑布模式：批量生成任務
-                yield self.env.timeout(random.expovariate(1/48))  # 每48小時一批
-                batch_size = random.randint(5, 15)
+                # 瀑布模式：批量生成任務（默認每48小時一批）
+                yield self.env.timeout(self.random.expovariate(1 / self._batch_interval()))
+                batch_size = self.random.randint(5, 15)
                 for _ in range(batch_size):
                     task = self._create_task(task_id)
                     self.tasks.append(task)
+                    self.accounting.arrive(self.env.now)
                     yield self.task_queue.put(task)
                     task_id += 1
             else:
                 # 敏捷/持續模式：持續生成任務
-                yield self.env.timeout(random.expovariate(1/8))
+                yield self.env.timeout(self.random.expovariate(1 / self.config.arrival_interval))
                 task = self._create_task(task_id)
                 self.tasks.append(task)
+                self.accounting.arrive(self.env.now)
                 yield self.task_queue.put(task)
                 task_id += 1
     
-    def _create_task(self, task_id: int) -> Dict[str, Any]:
-        """創建任務"""
-        complexity = max(1, min(10, random.normalvariate(5, 2)))
+    def _batch_interval(self) -> float:
+        """瀑布模式的批次間隔，批次平均 10 個任務"""
+        return self.config.arrival_interval * 6
+    
+    def _create_task(self, task_id: int, event: Optional[TraceEvent] = None) -> Dict[str, Any]:
+        """創建任務（軌跡事件帶有複雜度時使用它，否則抽樣）"""
+        complexity = _trace_complexity(event) or max(1, min(10, self.random.normalvariate(5, 2)))
         return {
             'id': task_id,
             'created_at': self.env.now,
             'complexity': complexity,
             'status': 'created',
-            'has_defect': random.random() < self.config.defect_rate,
+            'has_defect': self.random.random() < self.config.defect_rate,
             'rework_count': 0,
             'completed_at': None
         }
@@ -112,53 +152,69 @@ class EnhancedTeamSimulator:
             task['assigned_to'] = developer_id
             task['started_at'] = self.env.now
             
-            # 計算工作時間
-            base_time = task['complexity'] * 2
-            
-            # 根據工作流程類型調整
-            if self.config.workflow_type == WorkflowType.WATERFALL:
-                # 瀑布模式：更多文檔時間
-                work_time = base_time * (1 + self.config.documentation_overhead)
-            elif self.config.workflow_type == WorkflowType.AGILE:
-                # 敏捷模式：會議開銷
-                work_time = base_time * (1 + self.config.meeting_overhead)
-            else:  # CONTINUOUS
-                # 持續模式：自動化減少工作量
-                work_time = base_time * (1 - self.config.automation_level * 0.3)
-            
-            # 加入隨機變化
-            work_time *= random.uniform(0.8, 1.2)
-            
-            yield self.env.timeout(work_time)
+            worker = self.developer_keys[developer_id]
+            self.accounting.start_work(worker, self.env.now)
+            yield self.env.timeout(self._work_time(task['complexity'], task['rework_count'] > 0))
+            self.accounting.end_work(worker, self.env.now)
             
             # 檢查是否有缺陷
-            if task['has_defect'] and random.random() < 0.8:  # 80%概率發現缺陷
+            if task['has_defect'] and self.random.random() < 0.8:  # 80%概率發現缺陷
                 # 需要返工
                 task['rework_count'] += 1
-                task['has_defect'] = random.random() < (self.config.defect_rate * 0.5)  # 返工後缺陷率降低
+                task['has_defect'] = self.random.random() < (self.config.defect_rate * 0.5)  # 返工後缺陷率降低
                 yield self.task_queue.put(task)  # 重新排隊
                 continue
             
             # 根據工作流程決定是否需要審查
-            if (self.config.workflow_type in [WorkflowType.AGILE, WorkflowType.CONTINUOUS] 
-                and random.random() < 0.9):  # 90%的任務需要審查
+            if self._needs_review():
                 yield self.review_queue.put(task)
             else:
                 # 直接完成
                 self._complete_task(task)
     
-    def reviewer_work(self):
+    def _work_time(self, complexity: float, rework: bool = False) -> float:
+        """計算開發工作時間；返工按 rework_multiplier 倍計算"""
+        base_time = complexity * 2
+        if rework:
+            base_time *= self.config.rework_multiplier
+        
+        # 根據工作流程類型調整
+        if self.config.workflow_type == WorkflowType.WATERFALL:
+            # 瀑布模式：更多文檔時間
+            work_time = base_time * (1 + self.config.documentation_overhead)
+        elif self.config.workflow_type == WorkflowType.AGILE:
+            # 敏捷模式：會議開銷
+            work_time = base_time * (1 + self.config.meeting_overhead)
+        else:  # CONTINUOUS
+            # 持續模式：自動化減少工作量
+            work_time = base_time * (1 - self.config.automation_level * 0.3)
+        
+        # 加入隨機變化
+        return work_time * self.random.uniform(0.8, 1.2)
+    
+    def _needs_review(self) -> bool:
+        """敏捷/持續模式下 90% 的任務需要審查"""
+        return (self.config.workflow_type in [WorkflowType.AGILE, WorkflowType.CONTINUOUS]
+                and self.random.random() < 0.9)
+    
+    def _review_time(self, complexity: float) -> float:
+        """計算審查時間"""
+        return complexity * 0.5 * self.random.uniform(0.5, 1.5)
+    
+    def reviewer_work(self, reviewer_id: int = 0):
         """審查者工作流程"""
+        worker = self.reviewer_keys[reviewer_id]
         while True:
             task = yield self.review_queue.get()
             task['status'] = 'in_review'
             
             # 審查時間
-            review_time = task['complexity'] * 0.5 * random.uniform(0.5, 1.5)
-            yield self.env.timeout(review_time)
+            self.accounting.start_work(worker, self.env.now)
+            yield self.env.timeout(self._review_time(task['complexity']))
+            self.accounting.end_work(worker, self.env.now)
             
             # 審查結果
-            if random.random() < 0.2:  # 20%概率需要修改
+            if self.random.random() < self.config.review_rework_probability:
                 task['rework_count'] += 1
                 yield self.task_queue.put(task)
             else:
@@ -170,6 +226,7 @@ class EnhancedTeamSimulator:
         task['status'] = 'completed'
         task['cycle_time'] = task['completed_at'] - task['created_at']
         self.completed_tasks.append(task)
+        self.accounting.depart(self.env.now, task['created_at'])
         
         # 記錄指標
         self.metrics['cycle_times'].append(task['cycle_time'])
@@ -191,41 +248,367 @@ class EnhancedTeamSimulator:
             # 收集隊列長度
             queue_length = len(self.task_queue.items) + len(self.review_queue.items)
             self.metrics['queue_lengths'].append(queue_length)
-
-def run_scenario_simulation(config: ScenarioConfig, duration: int = 240) -> SimulationResult:
-    """運行場景模擬"""
-    env = simpy.Environment()
-    simulator = EnhancedTeamSimulator(env, config)
     
-    # 啟動進程
-    env.process(simulator.generate_tasks())
-    env.process(simulator.metrics_collector())
+    def open_task_ages(self) -> List[float]:
+        """未完成任務至今的已用時間（其週期時間的下界）"""
+        return [self.env.now - task['created_at'] for task in self.tasks
+                if task['completed_at'] is None]
     
-    # 創建開發者
-    for i in range(config.team_size):
-        env.process(simulator.developer_work(i))
+    @property
+    def tasks_created(self) -> int:
+        return len(self.tasks)
     
-    # 創建審查者（如果需要）
-    if config.workflow_type in [WorkflowType.AGILE, WorkflowType.CONTINUOUS]:
-        env.process(simulator.reviewer_work())
+    @property
+    def tasks_completed(self) -> int:
+        return len(self.completed_tasks)
+    
+    @property
+    def defect_count(self) -> int:
+        return len(self.metrics['defects'])
+    
+    @property
+    def rework_count(self) -> int:
+        return len(self.metrics['rework_events'])
+
+def _trace_complexity(event: Optional[TraceEvent]) -> Optional[float]:
+    if event is None or event.complexity is None:
+        return None
+    return max(1, min(10, event.complexity))
+
+class _ScaleTask:
+    """大規模模式下的輕量任務，只在處理中存活"""
+    __slots__ = ('created_at', 'complexity', 'has_defect', 'rework_count')
+    
+    def __init__(self, created_at: float, complexity: float, has_defect: bool):
+        self.created_at = created_at
+        self.complexity = complexity
+        self.has_defect = has_defect
+        self.rework_count = 0
+
+@dataclass
+class SimulationSnapshot:
+    """ScaledTeamSimulator 在某一時刻的完整狀態（不含 SimPy 環境和回調）"""
+    time: float
+    config: ScenarioConfig
+    rng_state: tuple
+    state: Dict[str, Any]
+
+class ScaledTeamSimulator(EnhancedTeamSimulator):
+    """
+    大規模團隊模擬器
+    
+    與 EnhancedTeamSimulator 的流程語義相同（缺陷返工、審查、FIFO 排隊），
+    但不為每位開發者創建 SimPy 進程，也不讓數千個 get() 事件爭用同一個 Store：
+    空閒開發者/審查者放在池中，任務到達時直接交接給空閒者，否則進入 FIFO 隊列；
+    工作完成由 Timeout 回調處理。每個任務只產生 2-3 個 SimPy 事件，
+    已完成任務不保留，內存只與在途任務數和週期時間數組（每任務 8 字節）成正比。
+    
+    全部狀態都是顯式的（空閒池、隊列、處理中任務及其完成時間、下一次到達時間、
+    RNG 狀態和各項累計），因此可以在運行中途 snapshot()，再用 restore()
+    以修改後的配置從快照繼續多個分支。
+    """
+    
+    def __init__(self, env: simpy.Environment, config: ScenarioConfig,
+                 seed: Optional[int] = None, trace: Optional[Iterable[TraceEvent]] = None):
+        super().__init__(env, config, seed, trace)
+        self.idle_developers = list(range(config.team_size))
+        self.idle_reviewers = list(range(config.reviewer_count))
+        self.pending = deque()
+        self.pending_review = deque()
+        self.working: Dict[int, Tuple[float, _ScaleTask]] = {}    # 開發者 → (完成時間, 任務)
+        self.reviewing: Dict[int, Tuple[float, _ScaleTask]] = {}
+        self.metrics['cycle_times'] = array('d')
+        self._next_arrival = 0.0
+        self._next_event: Optional[TraceEvent] = None
+        self._next_daily = 0.0
+        
+        self._created = 0
+        self._completed = 0
+        self._defects = 0
+        self._reworked = 0
+        self._completed_today = 0
+    
+    def start(self):
+        """註冊到達和每日指標回調"""
+        self._schedule_arrival()
+        self._schedule_daily_metrics()
+    
+    def _schedule_arrival(self):
+        if self.trace is not None:
+            # 軌跡只預讀下一個事件，內存與軌跡長度無關；讀完後不再有到達
+            self._next_event = next(self.trace, None)
+            if self._next_event is None:
+                return
+            delay = max(0.0, self._next_event.time - self.env.now)
+        elif self.config.workflow_type == WorkflowType.WATERFALL:
+            delay = self.random.expovariate(1 / self._batch_interval())
+        else:
+            delay = self.random.expovariate(1 / self.config.arrival_interval)
+        self._next_arrival = self.env.now + delay
+        self.env.timeout(delay).callbacks.append(self._on_arrival)
+    
+    def _on_arrival(self, event):
+        if self.trace is None and self.config.workflow_type == WorkflowType.WATERFALL:
+            batch_size = self.random.randint(5, 15)
+        else:
+            batch_size = 1
+        
+        now = self.env.now
+        for _ in range(batch_size):
+            complexity = (_trace_complexity(self._next_event)
+                          or max(1, min(10, self.random.normalvariate(5, 2))))
+            task = _ScaleTask(now, complexity,
+                              self.random.random() < self.config.defect_rate)
+            self._created += 1
+            self.accounting.arrive(now)
+            self._submit(task)
+        
+        self._schedule_arrival()
+    
+    def _submit(self, task: _ScaleTask):
+        """交給空閒開發者，否則排隊"""
+        if self.idle_developers:
+            self._start_work(self.idle_developers.pop(), task)
+        else:
+            self.pending.append(task)
+    
+    def _start_work(self, developer_id: int, task: _ScaleTask):
+        self.accounting.start_work(self.developer_keys[developer_id], self.env.now)
+        work_time = self._work_time(task.complexity, task.rework_count > 0)
+        self.working[developer_id] = (self.env.now + work_time, task)
+        timeout = self.env.timeout(work_time, (developer_id, task))
+        timeout.callbacks.append(self._on_work_done)
+    
+    def _on_work_done(self, event):
+        developer_id, task = event.value
+        del self.working[developer_id]
+        self.accounting.end_work(self.developer_keys[developer_id], self.env.now)
+        
+        if task.has_defect and self.random.random() < 0.8:
+            task.rework_count += 1
+            task.has_defect = self.random.random() < (self.config.defect_rate * 0.5)
+            self.pending.append(task)
+        elif self._needs_review():
+            self._submit_review(task)
+        else:
+            self._finish(task)
+        
+        # 釋放開發者：先處理隊首任務，與 Store 的 FIFO 語義一致；分支縮減人數時超出的開發者退出
+        if developer_id >= self.config.team_size:
+            return
+        if self.pending:
+            self._start_work(developer_id, self.pending.popleft())
+        else:
+            self.idle_developers.append(developer_id)
+    
+    def _submit_review(self, task: _ScaleTask):
+        if self.idle_reviewers:
+            self._start_review(self.idle_reviewers.pop(), task)
+        else:
+            self.pending_review.append(task)
+    
+    def _start_review(self, reviewer_id: int, task: _ScaleTask):
+        self.accounting.start_work(self.reviewer_keys[reviewer_id], self.env.now)
+        review_time = self._review_time(task.complexity)
+        self.reviewing[reviewer_id] = (self.env.now + review_time, task)
+        timeout = self.env.timeout(review_time, (reviewer_id, task))
+        timeout.callbacks.append(self._on_review_done)
+    
+    def _on_review_done(self, event):
+        reviewer_id, task = event.value
+        del self.reviewing[reviewer_id]
+        self.accounting.end_work(self.reviewer_keys[reviewer_id], self.env.now)
+        
+        if self.random.random() < self.config.review_rework_probability:
+            task.rework_count += 1
+            self._submit(task)
+        else:
+            self._finish(task)
+        
+        if reviewer_id >= self.config.reviewer_count:
+            return
+        if self.pending_review:
+            self._start_review(reviewer_id, self.pending_review.popleft())
+        else:
+            self.idle_reviewers.append(reviewer_id)
+    
+    def _finish(self, task: _ScaleTask):
+        self._completed += 1
+        self._completed_today += 1
+        self.metrics['cycle_times'].append(self.env.now - task.created_at)
+        self.accounting.depart(self.env.now, task.created_at)
+        if task.has_defect:
+            self._defects += 1
+        if task.rework_count > 0:
+            self._reworked += 1
+    
+    def open_task_ages(self) -> List[float]:
+        """排隊中和處理中任務的已用時間"""
+        now = self.env.now
+        queued = [task for queue in (self.pending, self.pending_review) for task in queue]
+        in_service = [task for _, task in itertools.chain(self.working.values(), self.reviewing.values())]
+        return [now - task.created_at for task in queued + in_service]
+    
+    def _schedule_daily_metrics(self, delay: float = 24):
+        self._next_daily = self.env.now + delay
+        self.env.timeout(delay).callbacks.append(self._on_daily_metrics)
+    
+    def _on_daily_metrics(self, event):
+        self.metrics['daily_completion'].append(self._completed_today)
+        self.metrics['queue_lengths'].append(len(self.pending) + len(self.pending_review))
+        self._completed_today = 0
+        self._schedule_daily_metrics()
+    
+    _STATE = ('idle_developers', 'idle_reviewers', 'pending', 'pending_review', 'working',
+              'reviewing', 'metrics', 'accounting', 'developer_keys', 'reviewer_keys',
+              '_created', '_completed', '_defects', '_reworked', '_completed_today',
+              '_next_arrival', '_next_event', '_next_daily')
+    
+    def snapshot(self) -> 'SimulationSnapshot':
+        """
+        深拷貝當前狀態；快照之後原模擬可以繼續運行，互不影響
+        
+        回放軌跡時只記錄 TraceReader 的讀取位置，分支重新打開文件從該位置繼續；
+        其他可迭代對象無法複製，不支持快照。
+        """
+        state = copy.deepcopy({name: getattr(self, name) for name in self._STATE})
+        if self.trace is not None:
+            if not isinstance(self.trace, TraceReader):
+                raise ValueError("只有 TraceReader 軌跡支持快照")
+            state['trace'] = self.trace.state()
+        return SimulationSnapshot(self.env.now, self.config, self.random.getstate(), state)
+    
+    @classmethod
+    def restore(cls, snapshot: 'SimulationSnapshot',
+                config: Optional[ScenarioConfig] = None) -> 'ScaledTeamSimulator':
+        """
+        在新環境中從快照繼續（環境時鐘從快照時間開始）
+        
+        config 可以修改任意字段：新增的開發者/審查者立即空閒並領取隊列中的任務，
+        縮減時編號超出新人數的人員完成手頭工作後退出；已抽樣的下一次到達時間和
+        處理中任務的完成時間保持不變，之後的抽樣使用新配置。
+        """
+        config = config or snapshot.config
+        env = simpy.Environment(initial_time=snapshot.time)
+        simulator = cls(env, config)
+        state = copy.deepcopy(snapshot.state)
+        trace = state.pop('trace', None)
+        for name, value in state.items():
+            setattr(simulator, name, value)
+        if trace is not None:
+            simulator.trace = TraceReader.from_state(trace)
+        simulator.random.setstate(snapshot.rng_state)
+        now = snapshot.time
+        
+        # 人數變化
+        for pool, keys, prefix, size, busy in (
+                (simulator.idle_developers, simulator.developer_keys, 'dev', config.team_size,
+                 simulator.working),
+                (simulator.idle_reviewers, simulator.reviewer_keys, 'reviewer', config.reviewer_count,
+                 simulator.reviewing)):
+            pool[:] = [worker for worker in pool if worker < size]
+            for worker in range(len(keys), size):
+                keys.append(f"{prefix}-{worker}")
+                simulator.accounting.register_worker(keys[worker], now)
+            for worker in range(size):
+                if worker not in pool and worker not in busy:
+                    pool.append(worker)
+        
+        # 重新登記待觸發的事件
+        for developer_id, (finish, task) in sorted(simulator.working.items(), key=lambda item: item[1][0]):
+            env.timeout(finish - now, (developer_id, task)).callbacks.append(simulator._on_work_done)
+        for reviewer_id, (finish, task) in sorted(simulator.reviewing.items(), key=lambda item: item[1][0]):
+            env.timeout(finish - now, (reviewer_id, task)).callbacks.append(simulator._on_review_done)
+        if simulator.trace is None or simulator._next_event is not None:
+            env.timeout(simulator._next_arrival - now).callbacks.append(simulator._on_arrival)
+        simulator._schedule_daily_metrics(simulator._next_daily - now)
+        
+        # 新增的空閒人員領取排隊任務
+        while simulator.pending and simulator.idle_developers:
+            simulator._start_work(simulator.idle_developers.pop(), simulator.pending.popleft())
+        while simulator.pending_review and simulator.idle_reviewers:
+            simulator._start_review(simulator.idle_reviewers.pop(), simulator.pending_review.popleft())
+        return simulator
+    
+    @property
+    def tasks_created(self) -> int:
+        return self._created
+    
+    @property
+    def tasks_completed(self) -> int:
+        return self._completed
+    
+    @property
+    def defect_count(self) -> int:
+        return self._defects
+    
+    @property
+    def rework_count(self) -> int:
+        return self._reworked
+
+def run_scenario_simulation(config: ScenarioConfig, duration: int = 240,
+                            profile: bool = False, seed: Optional[int] = None,
+                            scale_mode: bool = False,
+                            trace: Optional[Iterable[TraceEvent]] = None) -> SimulationResult:
+    """
+    運行場景模擬
+
+    Args:
+        config: 場景配置
+        duration: 模擬持續時間（小時）
+        profile: 是否收集進程剖析數據（結果存入 metrics['profile']）
+        seed: 隨機種子
+        scale_mode: 使用 ScaledTeamSimulator（適合數千開發者、數百萬任務）
+        trace: 到達事件序列（例如 TraceReader），替代合成的任務到達；每個模擬需要新的迭代器
+    """
+    env = ProfiledEnvironment() if profile else simpy.Environment()
+    
+    if scale_mode:
+        simulator = ScaledTeamSimulator(env, config, seed, trace)
+        simulator.start()
+    else:
+        simulator = EnhancedTeamSimulator(env, config, seed, trace)
+        
+        # 啟動進程
+        env.process(simulator.generate_tasks())
+        env.process(simulator.metrics_collector())
+        
+        # 創建開發者
+        for i in range(config.team_size):
+            env.process(simulator.developer_work(i))
+        
+        # 創建審查者（如果需要）
+        if config.workflow_type in [WorkflowType.AGILE, WorkflowType.CONTINUOUS]:
+            for i in range(config.reviewer_count):
+                env.process(simulator.reviewer_work(i))
     
     # 運行模擬
     env.run(until=duration)
     
-    # 計算結果
-    completed_count = len(simulator.completed_tasks)
-    total_created = len(simulator.tasks)
+    if profile:
+        simulator.metrics['profile'] = env.profile_summary()
+    return _collect_result(simulator, config, duration)
+
+def _collect_result(simulator: EnhancedTeamSimulator, config: ScenarioConfig,
+                    duration: float) -> SimulationResult:
+    """從運行結束的模擬器匯總 SimulationResult"""
+    env = simulator.env
+    completed_count = simulator.tasks_completed
+    total_created = simulator.tasks_created
     
     cycle_times = simulator.metrics['cycle_times']
-    avg_cycle_time = np.mean(cycle_times) if cycle_times else 0
+    avg_cycle_time = np.mean(cycle_times) if len(cycle_times) else 0
     
     throughput = completed_count / (duration / 24) if duration > 0 else 0
     
-    defect_count = len(simulator.metrics['defects'])
-    rework_count = len(simulator.metrics['rework_events'])
+    defect_count = simulator.defect_count
+    rework_count = simulator.rework_count
     
-    # 簡化的利用率計算
-    team_utilization = min(1.0, completed_count / (config.team_size * duration / 8))
+    # 時間加權的開發者利用率（忙碌時間 / 可用時間）；分支中退出的開發者不計入
+    team_utilization = simulator.accounting.team_utilization(
+        env.now, simulator.developer_keys[:config.team_size])
+    simulator.metrics['accounting'] = simulator.accounting.summary(env.now)
+    simulator.metrics['open_task_ages'] = simulator.open_task_ages()
     
     return SimulationResult(
         scenario_name=config.name,
@@ -241,6 +624,39 @@ def run_scenario_simulation(config: ScenarioConfig, duration: int = 240) -> Simu
         metrics=simulator.metrics
     )
 
+def run_branched_simulation(config: ScenarioConfig, branch_at: float,
+                            branches: Dict[str, Dict[str, Any]], duration: int = 240,
+                            seed: Optional[int] = None,
+                            trace: Optional[TraceReader] = None) -> Dict[str, SimulationResult]:
+    """
+    共享前綴的假設分析：前 branch_at 小時只模擬一次，然後每個分支以修改後的
+    配置從快照繼續到 duration
+    
+    Args:
+        config: 前綴使用的場景配置
+        branch_at: 分支時刻（小時）
+        branches: 分支名稱 → 要修改的 ScenarioConfig 字段，例如 {'reviewer_count': 2}
+        duration: 總模擬時長（包含前綴）
+        seed: 隨機種子；各分支從同一個 RNG 狀態繼續
+        trace: 回放的軌跡；各分支從快照時的讀取位置繼續讀取同一文件
+    
+    使用 ScaledTeamSimulator（其狀態是顯式的，可以快照）；分支結果覆蓋整個時域，
+    與從頭運行同一分支配置變化的模擬等價。
+    """
+    env = simpy.Environment()
+    prefix = ScaledTeamSimulator(env, config, seed, trace)
+    prefix.start()
+    env.run(until=branch_at)
+    snapshot = prefix.snapshot()
+    
+    results = {}
+    for name, changes in branches.items():
+        branch_config = replace(config, name=name, **changes)
+        simulator = ScaledTeamSimulator.restore(snapshot, branch_config)
+        simulator.env.run(until=duration)
+        results[name] = _collect_result(simulator, branch_config, duration)
+    return results
+
 def compare_scenarios(scenarios: List[ScenarioConfig], duration: int = 240) -> List[SimulationResult]:
     """比較多個場景"""
     results = []
@@ -360,8 +776,160 @@ def print_comparison_summary(results: List[SimulationResult]):
     
     print("=" * 80)
 
+def benchmark_scale_mode(points: List[Tuple[int, int]], scale_mode: bool = True,
+                         utilization: float = 0.8, track_memory: bool = True) -> pd.DataFrame:
+    """
+    測量模擬器的時間和內存擴展曲線
+    
+    Args:
+        points: (開發者人數, 目標任務數) 列表
+        scale_mode: 是否使用 ScaledTeamSimulator
+        utilization: 目標開發者利用率，用於推算任務到達間隔
+        track_memory: 是否額外運行一次 tracemalloc 測量內存峰值
+        
+    Returns:
+        每個測量點的耗時和內存峰值
+    """
+    rows = []
+    for team_size, task_count in points:
+        # 敏捷模式下每個任務平均約 14 小時開發工作（含返工）
+        arrival_interval = 14.0 / (team_size * utilization)
+        config = ScenarioConfig(
+            name=f"Scale-{team_size}",
+            workflow_type=WorkflowType.AGILE,
+            team_size=team_size,
+            reviewer_count=max(1, team_size // 4),
+            arrival_interval=arrival_interval
+        )
+        duration = task_count * arrival_interval
+        
+        start = time.perf_counter()
+        result = run_scenario_simulation(config, duration, seed=0, scale_mode=scale_mode)
+        elapsed = time.perf_counter() - start
+        
+        peak_mb = None
+        if track_memory:
+            tracemalloc.start()
+            run_scenario_simulation(config, duration, seed=0, scale_mode=scale_mode)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        
+        rows.append({
+            'Mode': 'scale' if scale_mode else 'process',
+            'Developers': team_size,
+            'Tasks Created': result.tasks_created,
+            'Tasks Completed': result.tasks_completed,
+            'Wall Time (s)': elapsed,
+            'us/Task': elapsed / max(1, result.tasks_created) * 1e6,
+            'Peak Memory (MB)': peak_mb
+        })
+    
+    return pd.DataFrame(rows)
+
+def run_scale_benchmark():
+    """打印 README 中記錄的擴展曲線"""
+    print("📈 Scale mode benchmark")
+    small = [(4, 10_000), (200, 100_000), (2000, 100_000)]
+    large = [(2000, 1_000_000), (2000, 10_000_000)]
+    
+    table = pd.concat([
+        benchmark_scale_mode(small, scale_mode=False),
+        benchmark_scale_mode(small + large, scale_mode=True)
+    ])
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+def run_what_if_demo(branch_day: int = 30, horizon_days: int = 90, seed: int = 0):
+    """「第 30 天增加一名審查者」：共享前綴的分支模擬 vs 每個分支從頭運行"""
+    print(f"🔀 What-if branches at day {branch_day} of {horizon_days}")
+    config = ScenarioConfig(name="Baseline", workflow_type=WorkflowType.AGILE, team_size=8,
+                            reviewer_count=1, arrival_interval=2.0)
+    branches = {
+        'Baseline': {},
+        '+1 reviewer': {'reviewer_count': 2},
+        '+2 developers': {'team_size': 10},
+        '+1 reviewer, +2 developers': {'reviewer_count': 2, 'team_size': 10}
+    }
+    duration = horizon_days * 24
+    
+    start = time.perf_counter()
+    results = run_branched_simulation(config, branch_day * 24, branches, duration, seed)
+    branched = time.perf_counter() - start
+    start = time.perf_counter()
+    rerun = run_scenario_simulation(config, duration, seed=seed, scale_mode=True)
+    full_run = time.perf_counter() - start
+    
+    table = pd.DataFrame([{
+        'Branch': name,
+        'Completed': result.tasks_completed,
+        'Avg Cycle Time (h)': result.average_cycle_time,
+        'P95 Open Age (h)': np.percentile(result.metrics['open_task_ages'], 95)
+                            if result.metrics['open_task_ages'] else 0.0,
+        'Dev Utilization': result.team_utilization
+    } for name, result in results.items()])
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    baseline = results['Baseline']
+    matches = (rerun.tasks_completed == baseline.tasks_completed
+               and rerun.average_cycle_time == baseline.average_cycle_time)
+    print(f"Baseline branch matches an uninterrupted run: {matches}")
+    print(f"Shared prefix: {branched:.3f}s for {len(branches)} branches vs "
+          f"{full_run * len(branches):.3f}s re-running the full horizon per branch")
+
+def replay_trace(path: str, team_sizes: Tuple[int, ...] = (2, 4, 8), reviewer_count: int = 1,
+                 workflow_type: WorkflowType = WorkflowType.AGILE,
+                 duration: Optional[float] = None, seed: int = 0) -> pd.DataFrame:
+    """
+    用同一份事件軌跡回放多個候選團隊配置
+    
+    每個配置重新打開文件流式讀取（ScaledTeamSimulator 只預讀下一個事件），所有配置
+    使用相同的種子；duration 缺省為覆蓋最後一個事件的整天數（先流式掃描一遍得到）。
+    """
+    duration = duration or (math.floor(trace_summary(path)['end'] / 24) + 1) * 24
+    rows = []
+    for team_size in team_sizes:
+        config = ScenarioConfig(name=f"Replay-{team_size}", workflow_type=workflow_type,
+                                team_size=team_size, reviewer_count=reviewer_count)
+        start = time.perf_counter()
+        result = run_scenario_simulation(config, duration, seed=seed, scale_mode=True,
+                                         trace=TraceReader(path))
+        elapsed = time.perf_counter() - start
+        cycle_times = result.metrics['cycle_times']
+        rows.append({
+            'Developers': team_size,
+            'Reviewers': reviewer_count,
+            'Tasks Created': result.tasks_created,
+            'Tasks Completed': result.tasks_completed,
+            'Avg Cycle Time (h)': result.average_cycle_time,
+            'P95 Cycle Time (h)': np.percentile(cycle_times, 95) if len(cycle_times) else 0.0,
+            'Dev Utilization': result.team_utilization,
+            'Wall Time (s)': elapsed,
+            'Events/s': result.tasks_created / elapsed if elapsed > 0 else 0.0
+        })
+    return pd.DataFrame(rows)
+
+def run_trace_replay(path: str):
+    """打印軌跡概況和各候選團隊規模的回放結果"""
+    summary = trace_summary(path)
+    print(f"📼 Replaying {summary['events']} arrivals over {summary['span'] / 24:.1f} days "
+          f"({summary['rate_per_day']:.2f}/day) from {path}")
+    table = replay_trace(path)
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
 def main():
     """主函數"""
+    if '--scale-benchmark' in sys.argv:
+        run_scale_benchmark()
+        return
+    if '--what-if' in sys.argv:
+        run_what_if_demo()
+        return
+    if '--replay' in sys.argv:
+        arguments = sys.argv[sys.argv.index('--replay') + 1:]
+        if not arguments or arguments[0].startswith('--'):
+            print("Usage: python scenario_comparison.py --replay TRACE (.jsonl/.csv, optionally .gz)")
+            sys.exit(2)
+        run_trace_replay(arguments[0])
+        return
+    
     print("🐝 Bee Swarm Scenario Comparison Tool")
     print("Comparing different workflow methodologies...\n")
     
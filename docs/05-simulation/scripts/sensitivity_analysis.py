@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Bee Swarm 全局靈敏度分析
+在 ScenarioConfig 字段上生成 Morris 軌跡或 Saltelli 設計，通過參數掃描引擎批量
+並行運行，計算 Morris 基本效應或 Sobol 一階/總效應指數及其自助法置信區間
+"""
+
+import argparse
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from parameter_sweep import Parameter, ResultCache, parse_parameter, run_sweep
+from scenario_comparison import ScenarioConfig, WorkflowType
+
+# 默認分析空間：缺陷率、返工倍數、自動化水平和審查退回概率
+SENSITIVITY_PARAMETERS = (
+    Parameter('defect_rate', 0.0, 0.3),
+    Parameter('rework_multiplier', 1.0, 3.0),
+    Parameter('automation_level', 0.0, 1.0),
+    Parameter('review_rework_probability', 0.0, 0.5)
+)
+
+
+@dataclass
+class SensitivityDesign:
+    """
+    靈敏度分析設計
+
+    units 為單位超立方內的坐標（每行一個運行點），points 為映射後的參數值。
+    Morris：每條軌跡 k + 1 個點，steps[t][i] 記錄第 t 條軌跡中參數 i 的步長（帶符號）
+    和步前點的行號；Saltelli：前 N 行為 A，其後 N 行為 B，再後為 k 個 AB_i 塊。
+    """
+    method: str
+    parameters: List[Parameter]
+    units: np.ndarray
+    points: List[Dict[str, Any]]
+    samples: int
+    steps: List[List[tuple]] = field(default_factory=list)
+
+
+def _to_points(parameters: Sequence[Parameter], units: np.ndarray) -> List[Dict[str, Any]]:
+    return [{parameter.name: parameter.from_unit(u) for parameter, u in zip(parameters, row)}
+            for row in units]
+
+
+def morris_design(parameters: Sequence[Parameter], trajectories: int = 20, levels: int = 4,
+                  seed: int = 0) -> SensitivityDesign:
+    """
+    Morris 一次一因子（OAT）軌跡設計
+
+    每條軌跡從 levels 級網格上的隨機點出發，按隨機順序每次只改變一個參數，
+    步長 Δ = levels / (2 (levels − 1))；超出 [0, 1] 時反向移動。共 trajectories × (k + 1) 次運行。
+    """
+    rng = np.random.default_rng(seed)
+    count = len(parameters)
+    delta = levels / (2 * (levels - 1))
+    grid = np.linspace(0.0, 1.0, levels)
+    rows, steps = [], []
+    for _ in range(trajectories):
+        current = rng.choice(grid, size=count)
+        rows.append(current.copy())
+        trajectory = []
+        for index in rng.permutation(count):
+            step = delta if current[index] + delta <= 1.0 + 1e-9 else -delta
+            trajectory.append((int(index), step, len(rows) - 1))
+            current[index] += step
+            rows.append(current.copy())
+        steps.append(trajectory)
+    units = np.array(rows)
+    return SensitivityDesign('morris', list(parameters), units, _to_points(parameters, units),
+                             trajectories, steps)
+
+
+def saltelli_design(parameters: Sequence[Parameter], samples: int = 128,
+                    seed: int = 0) -> SensitivityDesign:
+    """
+    Saltelli 設計：由 2k 維加擾 Sobol 序列得到矩陣 A、B 和 k 個 AB_i
+
+    AB_i 為 A 的第 i 列換成 B 的第 i 列。samples 向上取整到 2 的冪，
+    共 N (k + 2) 次運行，一階和總效應指數共用這些運行。
+    """
+    count = len(parameters)
+    exponent = max(1, math.ceil(math.log2(samples)))
+    base = qmc.Sobol(2 * count, scramble=True, seed=seed).random_base2(exponent)
+    matrix_a, matrix_b = base[:, :count], base[:, count:]
+    blocks = [matrix_a, matrix_b]
+    for index in range(count):
+        mixed = matrix_a.copy()
+        mixed[:, index] = matrix_b[:, index]
+        blocks.append(mixed)
+    units = np.vstack(blocks)
+    return SensitivityDesign('sobol', list(parameters), units, _to_points(parameters, units),
+                             len(matrix_a))
+
+
+def _interval(values: np.ndarray, confidence: float) -> tuple:
+    tail = (1 - confidence) / 2 * 100
+    return float(np.percentile(values, tail)), float(np.percentile(values, 100 - tail))
+
+
+def morris_indices(design: SensitivityDesign, outputs: np.ndarray, bootstrap: int = 1000,
+                   confidence: float = 0.95, seed: int = 0) -> pd.DataFrame:
+    """
+    基本效應統計：mu（均值）、mu_star（絕對值均值）和 sigma（標準差）
+
+    效應按單位超立方內的步長歸一化，各參數可直接比較；mu_star 的置信區間
+    對軌跡做自助重抽樣得到。
+    """
+    count = len(design.parameters)
+    effects = np.empty((design.samples, count))
+    for trajectory, steps in enumerate(design.steps):
+        for index, step, row in steps:
+            effects[trajectory, index] = (outputs[row + 1] - outputs[row]) / step
+
+    rng = np.random.default_rng(seed)
+    resamples = rng.integers(0, design.samples, size=(bootstrap, design.samples))
+    boot_mu_star = np.abs(effects)[resamples].mean(axis=1)
+    rows = []
+    for index, parameter in enumerate(design.parameters):
+        low, high = _interval(boot_mu_star[:, index], confidence)
+        rows.append({'parameter': parameter.name,
+                     'mu': float(effects[:, index].mean()),
+                     'mu_star': float(np.abs(effects[:, index]).mean()),
+                     'mu_star_low': low,
+                     'mu_star_high': high,
+                     'sigma': float(effects[:, index].std(ddof=1)) if design.samples > 1 else 0.0})
+    return pd.DataFrame(rows)
+
+
+def _sobol_estimates(f_a: np.ndarray, f_b: np.ndarray, f_ab: np.ndarray) -> tuple:
+    """
+    Saltelli (2010) 一階估計和 Jansen 總效應估計；f_ab 每列對應一個參數
+
+    一階估計中的 f_B 先減去輸出均值：KPI 的均值遠大於其波動時（例如吞吐量），
+    未中心化的估計方差很大。
+    """
+    outputs = np.concatenate([f_a, f_b])
+    variance = np.var(outputs)
+    if variance == 0:
+        zeros = np.zeros(f_ab.shape[1])
+        return zeros, zeros
+    centred = f_b - outputs.mean()
+    first = np.mean(centred[:, None] * (f_ab - f_a[:, None]), axis=0) / variance
+    total = 0.5 * np.mean((f_a[:, None] - f_ab) ** 2, axis=0) / variance
+    return first, total
+
+
+def sobol_indices(design: SensitivityDesign, outputs: np.ndarray, bootstrap: int = 1000,
+                  confidence: float = 0.95, seed: int = 0) -> pd.DataFrame:
+    """一階（S1）和總效應（ST）Sobol 指數；置信區間對 A/B 的行做自助重抽樣得到"""
+    samples, count = design.samples, len(design.parameters)
+    f_a, f_b = outputs[:samples], outputs[samples:2 * samples]
+    f_ab = outputs[2 * samples:].reshape(count, samples).T
+    first, total = _sobol_estimates(f_a, f_b, f_ab)
+
+    rng = np.random.default_rng(seed)
+    boot_first = np.empty((bootstrap, count))
+    boot_total = np.empty((bootstrap, count))
+    for draw in range(bootstrap):
+        rows = rng.integers(0, samples, size=samples)
+        boot_first[draw], boot_total[draw] = _sobol_estimates(f_a[rows], f_b[rows], f_ab[rows])
+
+    table = []
+    for index, parameter in enumerate(design.parameters):
+        first_low, first_high = _interval(boot_first[:, index], confidence)
+        total_low, total_high = _interval(boot_total[:, index], confidence)
+        table.append({'parameter': parameter.name,
+                      'S1': float(first[index]), 'S1_low': first_low, 'S1_high': first_high,
+                      'ST': float(total[index]), 'ST_low': total_low, 'ST_high': total_high})
+    return pd.DataFrame(table)
+
+
+@dataclass
+class SensitivityResult:
+    """每個 KPI 一張指數表，runs 為參數掃描引擎返回的逐次運行表"""
+    method: str
+    indices: Dict[str, pd.DataFrame]
+    runs: pd.DataFrame
+    simulations: int
+
+
+def run_sensitivity(design: SensitivityDesign, kpis: Sequence[str] = ('throughput',),
+                    base: Optional[ScenarioConfig] = None, duration: float = 240,
+                    replications: int = 2, seed: int = 0, workers: Optional[int] = None,
+                    cache: Optional[ResultCache] = None, scale_mode: bool = False,
+                    bootstrap: int = 1000, confidence: float = 0.95) -> SensitivityResult:
+    """
+    運行設計並計算所有 KPI 的指數
+
+    每個設計點運行 replications 次後取均值作為模型輸出；所有點共享種子
+    seed + r（公共隨機數），指數反映參數的影響而非種子間的噪聲。
+    所有 KPI 和（Sobol 時）一階/總效應指數共用同一批運行。
+    """
+    base = base or ScenarioConfig(name='sensitivity', workflow_type=WorkflowType.CONTINUOUS,
+                                  team_size=4, arrival_interval=3.0)
+    runs = run_sweep(design.points, base, duration, replications, seed, workers, cache, scale_mode)
+    means = runs.groupby('point')[list(kpis)].mean().sort_index()
+    estimator = morris_indices if design.method == 'morris' else sobol_indices
+    indices = {kpi: estimator(design, means[kpi].to_numpy(), bootstrap, confidence, seed)
+               for kpi in kpis}
+    return SensitivityResult(design.method, indices, runs, int((~runs['cached']).sum()))
+
+
+def print_sensitivity(result: SensitivityResult):
+    """輸出每個 KPI 的指數表（按重要性排序）"""
+    sort_by = 'mu_star' if result.method == 'morris' else 'ST'
+    print(f"🎯 {result.method.title()} sensitivity ({result.simulations} simulations)")
+    for kpi, table in result.indices.items():
+        print(f"\n{kpi}:")
+        print(table.sort_values(sort_by, ascending=False).to_string(
+            index=False, float_format=lambda value: f"{value:.3f}"))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Morris / Sobol sensitivity analysis over ScenarioConfig fields")
+    parser.add_argument('--method', choices=['morris', 'sobol'], default='morris')
+    parser.add_argument('--samples', type=int, default=None,
+                        help="Morris trajectories (default 20) or Saltelli base samples (default 128)")
+    parser.add_argument('--levels', type=int, default=4, help="Morris grid levels")
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=LOW:HIGH|A,B,C',
+                        help="field to analyse (repeatable); defaults to the four standard fields")
+    parser.add_argument('--kpi', action='append', default=[], help="KPI to analyse (repeatable)")
+    parser.add_argument('--workflow', choices=[workflow.value for workflow in WorkflowType], default='continuous')
+    parser.add_argument('--team-size', type=int, default=4)
+    parser.add_argument('--arrival-interval', type=float, default=3.0)
+    parser.add_argument('--duration', type=float, default=240)
+    parser.add_argument('--replications', type=int, default=2)
+    parser.add_argument('--bootstrap', type=int, default=1000)
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cache', default=None, help="JSON Lines cache file shared with parameter_sweep.py")
+    parser.add_argument('--scale-mode', action='store_true')
+    args = parser.parse_args(argv)
+
+    parameters = [parse_parameter(spec) for spec in args.param] or list(SENSITIVITY_PARAMETERS)
+    if args.method == 'morris':
+        design = morris_design(parameters, args.samples or 20, args.levels, args.seed)
+    else:
+        design = saltelli_design(parameters, args.samples or 128, args.seed)
+    base = ScenarioConfig(name='sensitivity', workflow_type=WorkflowType(args.workflow),
+                          team_size=args.team_size, arrival_interval=args.arrival_interval)
+    print_sensitivity(run_sensitivity(
+        design, args.kpi or ['throughput', 'average_cycle_time'], base, args.duration,
+        args.replications, args.seed, args.workers, ResultCache(args.cache), args.scale_mode,
+        args.bootstrap, args.confidence))
+
+
+if __name__ == "__main__":
+    main()
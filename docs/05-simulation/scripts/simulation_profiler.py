@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Bee Swarm 仿真性能剖析工具
+為 SimPy 進程和事件類型統計實際執行時間、事件數和恢復次數
+"""
+
+import time
+import functools
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, Generator, Optional
+
+import simpy
+
+
+@dataclass
+class ProfileEntry:
+    """單個進程或事件類型的剖析統計"""
+    name: str
+    wall_time: float = 0.0  # 秒（實際執行時間，而非仿真時間）
+    events: int = 0         # 產出的 SimPy 事件數 / 記錄的業務事件數
+    resumes: int = 0        # 生成器被恢復執行的次數
+    instances: int = 0      # 註冊的進程實例數
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'wall_time': self.wall_time,
+            'events': self.events,
+            'resumes': self.resumes,
+            'instances': self.instances
+        }
+
+
+class ProfiledEnvironment(simpy.Environment):
+    """
+    帶剖析功能的 SimPy 環境
+
+    可直接替換 simpy.Environment。每個通過 process() 註冊的生成器
+    都會被包裝，按生成器名稱（__qualname__）匯總每次恢復執行所耗費的
+    實際時間。同名生成器的多個實例（例如每位開發者一個 developer_work）
+    會合併為一條記錄。開銷為每次恢復兩次 perf_counter 調用。
+    """
+
+    def __init__(self, initial_time: float = 0):
+        super().__init__(initial_time)
+        self.process_profiles: Dict[str, ProfileEntry] = {}
+        self.event_profiles: Dict[str, ProfileEntry] = {}
+        self.run_wall_time = 0.0
+
+    def process(self, generator: Generator) -> simpy.Process:
+        name = getattr(generator, '__qualname__', None) or type(generator).__name__
+        entry = self.process_profiles.get(name)
+        if entry is None:
+            entry = self.process_profiles[name] = ProfileEntry(name)
+        entry.instances += 1
+        return super().process(self._instrument(generator, entry))
+
+    def run(self, until: Optional[Any] = None) -> Optional[Any]:
+        start = time.perf_counter()
+        try:
+            return super().run(until)
+        finally:
+            self.run_wall_time += time.perf_counter() - start
+
+    @staticmethod
+    def _instrument(generator: Generator, entry: ProfileEntry) -> Generator:
+        """包裝生成器，透明轉發發送值和異常（包括 Interrupt）"""
+        clock = time.perf_counter
+        value = None
+        error = None
+        while True:
+            start = clock()
+            try:
+                if error is None:
+                    event = generator.send(value)
+                else:
+                    event = generator.throw(error)
+            except StopIteration as stop:
+                entry.wall_time += clock() - start
+                entry.resumes += 1
+                return stop.value
+            except BaseException:
+                entry.wall_time += clock() - start
+                entry.resumes += 1
+                raise
+            entry.wall_time += clock() - start
+            entry.resumes += 1
+            entry.events += 1
+
+            try:
+                value = yield event
+                error = None
+            except GeneratorExit:
+                generator.close()
+                raise
+            except BaseException as exc:
+                value = None
+                error = exc
+
+    def profile_events(self, log_func: Callable) -> Callable:
+        """
+        包裝仿真的 log_event 方法，按事件類型統計次數和耗時
+
+        log_func 的第一個參數必須是 EventType 枚舉值。
+        """
+        profiles = self.event_profiles
+        clock = time.perf_counter
+
+        @functools.wraps(log_func)
+        def wrapper(event_type, *args, **kwargs):
+            start = clock()
+            try:
+                return log_func(event_type, *args, **kwargs)
+            finally:
+                name = getattr(event_type, 'name', str(event_type))
+                entry = profiles.get(name)
+                if entry is None:
+                    entry = profiles[name] = ProfileEntry(name)
+                entry.wall_time += clock() - start
+                entry.events += 1
+
+        return wrapper
+
+    def profile_summary(self) -> Dict[str, Any]:
+        """返回按實際耗時降序排列的剖析數據"""
+        def by_time(entries):
+            return [e.to_dict() for e in sorted(entries.values(),
+                                                key=lambda e: e.wall_time, reverse=True)]
+
+        process_time = sum(e.wall_time for e in self.process_profiles.values())
+        return {
+            'run_wall_time': self.run_wall_time,
+            'process_wall_time': process_time,
+            'scheduler_wall_time': max(0.0, self.run_wall_time - process_time),
+            'processes': by_time(self.process_profiles),
+            'event_types': by_time(self.event_profiles)
+        }
+
+
+def format_hot_path_report(summary: Dict[str, Any], limit: int = 10) -> str:
+    """將 profile_summary() 的結果格式化為熱點報告"""
+    total = summary['run_wall_time'] or 1e-12
+    lines = [
+        "=" * 88,
+        "SIMULATION HOT-PATH REPORT",
+        "=" * 88,
+        f"Total run time: {summary['run_wall_time'] * 1000:.1f} ms "
+        f"(processes {summary['process_wall_time'] * 1000:.1f} ms, "
+        f"scheduler {summary['scheduler_wall_time'] * 1000:.1f} ms)",
+        "",
+        f"{'Process':<52}{'Time(ms)':>10}{'%':>7}{'Resumes':>10}{'Events':>9}{'us/res':>9}"
+    ]
+    for entry in summary['processes'][:limit]:
+        lines.append(_format_row(entry, total))
+
+    if summary['event_types']:
+        lines.append("")
+        lines.append(f"{'Event type':<52}{'Time(ms)':>10}{'%':>7}{'Resumes':>10}{'Events':>9}{'us/evt':>9}")
+        for entry in summary['event_types'][:limit]:
+            lines.append(_format_row(entry, total))
+
+    lines.append("=" * 88)
+    return "\n".join(lines)
+
+
+def _format_row(entry: Dict[str, Any], total: float) -> str:
+    count = entry['resumes'] or entry['events']
+    per_call = entry['wall_time'] / count * 1e6 if count else 0.0
+    name = entry['name']
+    if entry['instances'] > 1:
+        name = f"{name} x{entry['instances']}"
+    return (f"{name[:51]:<52}{entry['wall_time'] * 1000:>10.2f}"
+            f"{entry['wall_time'] / total * 100:>6.1f}%{entry['resumes']:>10}"
+            f"{entry['events']:>9}{per_call:>9.1f}")
+
+
+def print_hot_path_report(env: simpy.Environment, limit: int = 10):
+    """打印熱點報告；普通 simpy.Environment 會被忽略"""
+    if isinstance(env, ProfiledEnvironment):
+        print(format_hot_path_report(env.profile_summary(), limit))
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Bee Swarm 仿真時間加權統計
+在狀態變化時以 O(1) 更新的累加器，提供精確的利用率、平均隊列長度和在製品（WIP）
+"""
+
+from typing import Dict, Any, Hashable, Iterable, Optional
+
+
+class TimeWeightedValue:
+    """
+    分段常數量的時間加權累加器
+
+    每次數值變化時調用 update()/add()，累加「數值 × 持續時間」的面積，
+    無需按固定間隔採樣。
+    """
+    __slots__ = ('value', 'last_time', 'area', 'start_time', 'max_value')
+
+    def __init__(self, start_time: float = 0.0, value: float = 0.0):
+        self.value = value
+        self.last_time = start_time
+        self.area = 0.0
+        self.start_time = start_time
+        self.max_value = value
+
+    def update(self, now: float, value: float):
+        self.area += self.value * (now - self.last_time)
+        self.last_time = now
+        self.value = value
+        if value > self.max_value:
+            self.max_value = value
+
+    def add(self, now: float, delta: float):
+        self.update(now, self.value + delta)
+
+    def area_until(self, now: float) -> float:
+        return self.area + self.value * (now - self.last_time)
+
+    def mean(self, now: float) -> float:
+        elapsed = now - self.start_time
+        return self.area_until(now) / elapsed if elapsed > 0 else self.value
+
+
+class FlowAccounting:
+    """
+    任務流的時間加權賬本
+
+    - WIP：系統中的任務數（arrive 到 depart）
+    - 服務中任務數：正在被處理的任務（start_work(task=True) 到 end_work）
+    - 排隊長度 = WIP − 服務中任務數
+    - 每個工作者的忙碌時間：同一工作者的並發工作只計一次
+
+    另外維護系統中任務的到達時間之和，使 WIP 面積與任務停留時間之和可以精確對賬
+    （Little 定律的有限時域形式）。
+    """
+
+    def __init__(self, start_time: float = 0.0):
+        self.start_time = start_time
+        self.wip = TimeWeightedValue(start_time)
+        self.in_service = TimeWeightedValue(start_time)
+        self.arrivals = 0
+        self.departures = 0
+        self.completed_sojourn = 0.0   # 已離開任務的停留時間之和
+        self.arrival_time_sum = 0.0    # 仍在系統中任務的到達時間之和
+
+        self._available_since: Dict[Hashable, float] = {}
+        self._active: Dict[Hashable, int] = {}
+        self._busy_since: Dict[Hashable, float] = {}
+        self._busy_total: Dict[Hashable, float] = {}
+
+    # 任務流
+    def arrive(self, now: float):
+        self.arrivals += 1
+        self.arrival_time_sum += now
+        self.wip.add(now, 1)
+
+    def depart(self, now: float, arrived_at: float):
+        self.departures += 1
+        self.completed_sojourn += now - arrived_at
+        self.arrival_time_sum -= arrived_at
+        self.wip.add(now, -1)
+
+    # 工作者
+    def register_worker(self, worker: Hashable, now: Optional[float] = None):
+        """登記工作者開始可用的時間（默認為賬本起點）"""
+        self._available_since[worker] = self.start_time if now is None else now
+        self._busy_total.setdefault(worker, 0.0)
+
+    def start_work(self, worker: Hashable, now: float, task: bool = True):
+        if worker not in self._available_since:
+            self.register_worker(worker)
+        active = self._active.get(worker, 0)
+        if active == 0:
+            self._busy_since[worker] = now
+        self._active[worker] = active + 1
+        if task:
+            self.in_service.add(now, 1)
+
+    def end_work(self, worker: Hashable, now: float, task: bool = True):
+        active = self._active[worker] - 1
+        self._active[worker] = active
+        if active == 0:
+            self._busy_total[worker] += now - self._busy_since.pop(worker)
+        if task:
+            self.in_service.add(now, -1)
+
+    def busy_time(self, worker: Hashable, now: float) -> float:
+        busy = self._busy_total.get(worker, 0.0)
+        if worker in self._busy_since:
+            busy += now - self._busy_since[worker]
+        return busy
+
+    def utilization(self, worker: Hashable, now: float) -> float:
+        available = now - self._available_since.get(worker, self.start_time)
+        return self.busy_time(worker, now) / available if available > 0 else 0.0
+
+    def team_utilization(self, now: float, workers: Optional[Iterable[Hashable]] = None) -> float:
+        """一組工作者（默認全部）的總忙碌時間 / 總可用時間"""
+        workers = list(self._available_since if workers is None else workers)
+        available = sum(now - self._available_since.get(worker, self.start_time)
+                        for worker in workers)
+        busy = sum(self.busy_time(worker, now) for worker in workers)
+        return busy / available if available > 0 else 0.0
+
+    # 匯總
+    def littles_law(self, now: float) -> Dict[str, float]:
+        """
+        Little 定律檢查
+
+        L 為時間平均 WIP，λ 為到達率，W 為已完成任務的平均停留時間；
+        relative_gap = |L − λW| / L（有限時域和未完成任務會造成偏差）。
+        exact_residual 為 WIP 面積與所有任務（含未完成部分）停留時間之和的差，
+        賬本正確時應接近 0。
+        """
+        elapsed = now - self.start_time
+        if elapsed <= 0:
+            return {'L': 0.0, 'lambda': 0.0, 'W': 0.0, 'lambda_W': 0.0,
+                    'relative_gap': 0.0, 'exact_residual': 0.0}
+
+        wip_area = self.wip.area_until(now)
+        L = wip_area / elapsed
+        arrival_rate = self.arrivals / elapsed
+        W = self.completed_sojourn / self.departures if self.departures else 0.0
+        in_system_age = self.wip.value * now - self.arrival_time_sum
+
+        return {
+            'L': L,
+            'lambda': arrival_rate,
+            'W': W,
+            'lambda_W': arrival_rate * W,
+            'relative_gap': abs(L - arrival_rate * W) / L if L > 0 else 0.0,
+            'exact_residual': wip_area - (self.completed_sojourn + in_system_age)
+        }
+
+    def summary(self, now: float) -> Dict[str, Any]:
+        return {
+            'team_utilization': self.team_utilization(now),
+            'utilization_by_worker': {worker: self.utilization(worker, now)
+                                      for worker in self._available_since},
+            'busy_time_by_worker': {worker: self.busy_time(worker, now)
+                                    for worker in self._available_since},
+            'average_wip': self.wip.mean(now),
+            'average_queue_length': self.wip.mean(now) - self.in_service.mean(now),
+            'max_wip': self.wip.max_value,
+            'littles_law': self.littles_law(now)
+        }
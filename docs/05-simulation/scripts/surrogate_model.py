@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Bee Swarm 代理模型（元模型）
+用參數掃描結果擬合高斯過程回歸，保存為 JSON，毫秒級以下回答 KPI 的假設分析查詢
+（均值和不確定度）；訓練域之外的查詢被標記，可回退到真實模擬
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
+from scipy.optimize import minimize
+
+from parameter_sweep import KPI_COLUMNS, _plain, build_config, evaluate_config, summarize_sweep
+from scenario_comparison import ScenarioConfig, WorkflowType
+
+# 模型文件格式版本
+MODEL_VERSION = 1
+
+# 不作為特徵的掃描表列
+_NON_FEATURES = set(KPI_COLUMNS) | {'point', 'replication', 'seed', 'cached', 'wall_time'}
+
+
+@dataclass
+class Feature:
+    """
+    代理模型的輸入特徵
+
+    數值特徵按訓練數據的 [low, high] 縮放到 [0, 1]；離散特徵（例如 workflow_type）
+    按訓練中出現過的取值做獨熱編碼。
+    """
+    name: str
+    low: float = 0.0
+    high: float = 1.0
+    values: List[Any] = field(default_factory=list)
+
+
+@dataclass
+class GaussianProcess:
+    """單個 KPI 的高斯過程：ARD 平方指數核 + 觀測噪聲，目標值已標準化"""
+    lengthscales: np.ndarray
+    signal_variance: float
+    noise_variance: float
+    y_mean: float
+    y_scale: float
+    alpha: np.ndarray = None
+    inverse: np.ndarray = None
+    scaled_training: np.ndarray = None
+    training_norms: np.ndarray = None
+
+    def kernel(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        scaled_left, scaled_right = left / self.lengthscales, right / self.lengthscales
+        distances = (np.sum(scaled_left ** 2, axis=1)[:, None] + np.sum(scaled_right ** 2, axis=1)[None, :]
+                     - 2 * scaled_left @ scaled_right.T)
+        return self.signal_variance * np.exp(-0.5 * np.maximum(distances, 0.0))
+
+    def prepare(self, training: np.ndarray):
+        """預計算 K⁻¹ 和縮放後的訓練點，預測時只剩核向量和兩次矩陣-向量乘法"""
+        covariance = self.kernel(training, training) + self.noise_variance * np.eye(len(training))
+        self.inverse = cho_solve(cho_factor(covariance, lower=True), np.eye(len(training)))
+        self.scaled_training = training / self.lengthscales
+        self.training_norms = np.einsum('ij,ij->i', self.scaled_training, self.scaled_training)
+
+    def condition(self, training: np.ndarray, targets: np.ndarray):
+        self.prepare(training)
+        self.alpha = self.inverse @ ((targets - self.y_mean) / self.y_scale)
+
+    def predict(self, inputs: np.ndarray):
+        """返回（均值, 均值的標準差），已還原為原始量綱"""
+        scaled = inputs / self.lengthscales
+        distances = (np.einsum('ij,ij->i', scaled, scaled)[:, None] + self.training_norms
+                     - 2 * scaled @ self.scaled_training.T)
+        cross = self.signal_variance * np.exp(-0.5 * np.maximum(distances, 0.0))
+        variance = self.signal_variance - np.einsum('ij,ij->i', cross @ self.inverse, cross)
+        return (cross @ self.alpha * self.y_scale + self.y_mean,
+                np.sqrt(np.maximum(variance, 0.0)) * self.y_scale)
+
+
+def _negative_log_likelihood(log_parameters: np.ndarray, inputs: np.ndarray,
+                             targets: np.ndarray) -> float:
+    dimensions = inputs.shape[1]
+    lengthscales = np.exp(log_parameters[:dimensions])
+    signal, noise = np.exp(log_parameters[dimensions:])
+    process = GaussianProcess(lengthscales, signal, noise, 0.0, 1.0)
+    covariance = process.kernel(inputs, inputs) + (noise + 1e-8) * np.eye(len(inputs))
+    try:
+        lower = np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        return 1e10
+    solved = solve_triangular(lower, targets, lower=True)
+    return 0.5 * solved @ solved + np.sum(np.log(np.diag(lower))) + 0.5 * len(targets) * math.log(2 * math.pi)
+
+
+def fit_gaussian_process(inputs: np.ndarray, targets: np.ndarray) -> GaussianProcess:
+    """最大化邊際似然擬合超參數（長度尺度、信號方差、噪聲方差，均在對數空間優化）"""
+    y_mean = float(np.mean(targets))
+    y_scale = float(np.std(targets)) or 1.0
+    standardized = (targets - y_mean) / y_scale
+    dimensions = inputs.shape[1]
+    start = np.concatenate([np.zeros(dimensions), [0.0, math.log(0.1)]])
+    bounds = [(math.log(0.05), math.log(20.0))] * dimensions + [(math.log(0.01), math.log(10.0)),
+                                                                (math.log(1e-6), math.log(1.0))]
+    solution = minimize(_negative_log_likelihood, start, args=(inputs, standardized),
+                        method='L-BFGS-B', bounds=bounds)
+    lengthscales = np.exp(solution.x[:dimensions])
+    signal, noise = np.exp(solution.x[dimensions:])
+    process = GaussianProcess(lengthscales, float(signal), float(noise) + 1e-8, y_mean, y_scale)
+    process.condition(inputs, targets)
+    return process
+
+
+@dataclass
+class SurrogatePrediction:
+    """一次查詢的結果：各 KPI 的均值和標準差，以及是否在訓練域內"""
+    mean: Dict[str, float]
+    std: Dict[str, float]
+    in_domain: bool
+    reasons: List[str] = field(default_factory=list)
+    simulated: bool = False
+
+
+class SurrogateModel:
+    """
+    在掃描結果上擬合的多 KPI 高斯過程代理模型
+
+    同一設計點的重複運行先取均值再擬合（噪聲方差吸收剩餘的隨機性）。
+    查詢落在訓練範圍外、使用未見過的離散取值，或預測標準差超過 KPI 總體
+    標準差的 max_std_ratio 倍（訓練點稀疏的區域）時，in_domain 為 False。
+    """
+
+    def __init__(self, features: List[Feature], processes: Dict[str, GaussianProcess],
+                 training: np.ndarray, base: Dict[str, Any], max_std_ratio: float = 0.5,
+                 validation: Optional[Dict[str, Dict[str, float]]] = None):
+        self.features = features
+        self.processes = processes
+        self.training = training
+        self.base = base
+        self.max_std_ratio = max_std_ratio
+        self.validation = validation or {}
+
+    @property
+    def kpis(self) -> List[str]:
+        return list(self.processes)
+
+    @classmethod
+    def fit(cls, table: pd.DataFrame, kpis: Sequence[str] = ('throughput', 'average_cycle_time'),
+            base: Optional[ScenarioConfig] = None, max_points: int = 800,
+            holdout: float = 0.2, seed: int = 0) -> 'SurrogateModel':
+        """
+        從 run_sweep() 的整潔表格（或其 CSV）擬合
+
+        設計點多於 max_points 時隨機抽樣（GP 的擬合代價為 O(n³)）。holdout > 0 時
+        先留出一部分點計算 RMSE 和 R²，再用全部點重新擬合。
+        """
+        base = base or ScenarioConfig(name='sweep', workflow_type=WorkflowType.AGILE, team_size=4)
+        summary = summarize_sweep(table, list(kpis))
+        names = [column for column in summary.columns
+                 if column not in _NON_FEATURES and not column.endswith('_std')]
+        if len(summary) > max_points:
+            summary = summary.sample(max_points, random_state=seed).reset_index(drop=True)
+
+        features = []
+        for name in names:
+            column = summary[name]
+            if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+                features.append(Feature(name, float(column.min()), float(column.max())))
+            else:
+                features.append(Feature(name, values=sorted(column.astype(str).unique())))
+
+        model = cls(features, {}, np.empty((0, 0)), {name: _plain(value) for name, value in asdict(base).items()})
+        inputs = model.encode(summary[names].to_dict('records'))
+
+        validation = {}
+        if holdout > 0 and len(summary) >= 10:
+            order = np.random.default_rng(seed).permutation(len(summary))
+            cut = max(1, int(len(summary) * holdout))
+            test, train = order[:cut], order[cut:]
+            for kpi in kpis:
+                targets = summary[kpi].to_numpy(dtype=float)
+                process = fit_gaussian_process(inputs[train], targets[train])
+                predicted, _ = process.predict(inputs[test])
+                error = targets[test] - predicted
+                total = np.sum((targets[test] - targets[test].mean()) ** 2)
+                validation[kpi] = {'rmse': float(np.sqrt(np.mean(error ** 2))),
+                                   'r2': float(1 - np.sum(error ** 2) / total) if total else 0.0}
+
+        model.processes = {kpi: fit_gaussian_process(inputs, summary[kpi].to_numpy(dtype=float))
+                           for kpi in kpis}
+        model.training = inputs
+        model.validation = validation
+        return model
+
+    def encode(self, points: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """把查詢點編碼為特徵矩陣；缺失的字段取基準配置的值"""
+        rows = []
+        for point in points:
+            row = []
+            for feature in self.features:
+                value = _plain(point.get(feature.name, self.base.get(feature.name)))
+                if feature.values:
+                    row.extend(1.0 if str(value) == option else 0.0 for option in feature.values)
+                else:
+                    span = feature.high - feature.low
+                    row.append((float(value) - feature.low) / span if span else 0.0)
+            rows.append(row)
+        return np.asarray(rows, dtype=float)
+
+    def domain_issues(self, point: Dict[str, Any]) -> List[str]:
+        """查詢點超出訓練範圍的字段"""
+        issues = []
+        trained = {feature.name for feature in self.features}
+        for name in point:
+            if name in trained:
+                continue
+            if name not in self.base:
+                issues.append(f"未知字段 {name}")
+            elif _plain(point[name]) != self.base[name]:
+                issues.append(f"{name} 未參與訓練（固定為 {self.base[name]}）")
+        for feature in self.features:
+            if feature.name not in point:
+                continue
+            value = _plain(point[feature.name])
+            if feature.values:
+                if str(value) not in feature.values:
+                    issues.append(f"{feature.name}={value} 不在訓練取值 {feature.values} 中")
+            elif not feature.low <= float(value) <= feature.high:
+                issues.append(f"{feature.name}={value} 超出訓練範圍 [{feature.low:g}, {feature.high:g}]")
+        return issues
+
+    def predict(self, point: Dict[str, Any]) -> SurrogatePrediction:
+        """預測單個查詢點的所有 KPI"""
+        inputs = self.encode([point])
+        issues = self.domain_issues(point)
+        mean, std = {}, {}
+        for kpi, process in self.processes.items():
+            value, deviation = process.predict(inputs)
+            mean[kpi], std[kpi] = float(value[0]), float(deviation[0])
+            if deviation[0] > self.max_std_ratio * process.y_scale:
+                issues.append(f"{kpi} 的預測標準差 {deviation[0]:.3g} 過大（訓練點稀疏）")
+        return SurrogatePrediction(mean, std, not issues, issues)
+
+    def predict_frame(self, points: pd.DataFrame) -> pd.DataFrame:
+        """批量預測：返回每個 KPI 的 <kpi> 和 <kpi>_std 列"""
+        inputs = self.encode(points.to_dict('records'))
+        result = points.copy()
+        for kpi, process in self.processes.items():
+            result[kpi], result[f"{kpi}_std"] = process.predict(inputs)
+        return result
+
+    def predict_or_simulate(self, point: Dict[str, Any], duration: float = 240,
+                            replications: int = 3, seed: int = 0) -> SurrogatePrediction:
+        """域內查詢用代理模型回答，域外查詢回退到 run_scenario_simulation"""
+        prediction = self.predict(point)
+        if prediction.in_domain:
+            return prediction
+        config = build_config(self.base_config(), point, 'what-if')
+        runs = pd.DataFrame([evaluate_config(config, duration, seed + replication)
+                             for replication in range(replications)])
+        return SurrogatePrediction(
+            mean={kpi: float(runs[kpi].mean()) for kpi in self.kpis},
+            std={kpi: float(runs[kpi].std(ddof=1) / math.sqrt(replications)) if replications > 1 else 0.0
+                 for kpi in self.kpis},
+            in_domain=False, reasons=prediction.reasons, simulated=True)
+
+    def base_config(self) -> ScenarioConfig:
+        fields = dict(self.base)
+        fields['workflow_type'] = WorkflowType(fields['workflow_type'])
+        return ScenarioConfig(**fields)
+
+    def save(self, path: str):
+        payload = {
+            'version': MODEL_VERSION,
+            'features': [asdict(feature) for feature in self.features],
+            'base': self.base,
+            'max_std_ratio': self.max_std_ratio,
+            'validation': self.validation,
+            'training': self.training.tolist(),
+            'processes': {kpi: {'lengthscales': process.lengthscales.tolist(),
+                                'signal_variance': process.signal_variance,
+                                'noise_variance': process.noise_variance,
+                                'y_mean': process.y_mean,
+                                'y_scale': process.y_scale,
+                                'alpha': process.alpha.tolist()}
+                          for kpi, process in self.processes.items()}
+        }
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(payload, handle)
+
+    @classmethod
+    def load(cls, path: str) -> 'SurrogateModel':
+        """讀取模型；K⁻¹ 不保存，加載時由訓練點和超參數重新計算"""
+        with open(path, encoding='utf-8') as handle:
+            payload = json.load(handle)
+        if payload.get('version') != MODEL_VERSION:
+            raise ValueError(f"不支持的代理模型版本: {payload.get('version')}")
+        training = np.asarray(payload['training'], dtype=float)
+        processes = {}
+        for kpi, data in payload['processes'].items():
+            process = GaussianProcess(np.asarray(data['lengthscales']), data['signal_variance'],
+                                      data['noise_variance'], data['y_mean'], data['y_scale'],
+                                      alpha=np.asarray(data['alpha']))
+            process.prepare(training)
+            processes[kpi] = process
+        return cls([Feature(**feature) for feature in payload['features']], processes, training,
+                   payload['base'], payload['max_std_ratio'], payload['validation'])
+
+
+def _parse_query(items: Sequence[str]) -> Dict[str, Any]:
+    """name=value 形式的查詢參數；能轉為數值的轉為數值"""
+    point = {}
+    for item in items:
+        name, _, value = item.partition('=')
+        try:
+            point[name] = int(value) if value.lstrip('-').isdigit() else float(value)
+        except ValueError:
+            point[name] = value
+    return point
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Gaussian-process surrogate for scenario KPIs")
+    commands = parser.add_subparsers(dest='command', required=True)
+    fit = commands.add_parser('fit', help="fit a surrogate on a parameter_sweep.py --output CSV")
+    fit.add_argument('table')
+    fit.add_argument('--output', default='surrogate.json')
+    fit.add_argument('--kpi', action='append', default=[])
+    fit.add_argument('--workflow', choices=[workflow.value for workflow in WorkflowType], default='agile',
+                     help="base workflow used for the sweep")
+    fit.add_argument('--max-points', type=int, default=800)
+    predict = commands.add_parser('predict', help="answer a what-if query")
+    predict.add_argument('model')
+    predict.add_argument('query', nargs='+', metavar='NAME=VALUE')
+    predict.add_argument('--simulate', action='store_true',
+                         help="fall back to simulation when the query is outside the training domain")
+    args = parser.parse_args(argv)
+
+    if args.command == 'fit':
+        started = time.perf_counter()
+        base = ScenarioConfig(name='sweep', workflow_type=WorkflowType(args.workflow), team_size=4)
+        model = SurrogateModel.fit(pd.read_csv(args.table), args.kpi or ['throughput', 'average_cycle_time'],
+                                   base, args.max_points)
+        model.save(args.output)
+        print(f"✅ Fitted {len(model.training)} points x {len(model.kpis)} KPIs "
+              f"in {time.perf_counter() - started:.1f}s -> '{args.output}'")
+        for kpi, scores in model.validation.items():
+            print(f"   {kpi}: holdout RMSE {scores['rmse']:.3f}, R² {scores['r2']:.3f}")
+        return
+
+    model = SurrogateModel.load(args.model)
+    point = _parse_query(args.query)
+    started = time.perf_counter()
+    prediction = model.predict_or_simulate(point) if args.simulate else model.predict(point)
+    elapsed = time.perf_counter() - started
+    source = "simulation" if prediction.simulated else "surrogate"
+    print(f"🔮 {source} answer in {elapsed * 1e6:,.0f} µs")
+    for kpi in model.kpis:
+        print(f"   {kpi}: {prediction.mean[kpi]:.3f} ± {prediction.std[kpi]:.3f}")
+    if not prediction.in_domain:
+        print("⚠️  Outside the training domain:", file=sys.stderr)
+        for reason in prediction.reasons:
+            print(f"   - {reason}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Bee Swarm 任務依賴圖工具
+拓撲排序、增量入度追蹤的就緒隊列，以及關鍵路徑（CPM）和鬆弛時間分析
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, List
+
+
+@dataclass
+class CriticalPathResult:
+    """關鍵路徑分析結果（時間單位與輸入的工期一致）"""
+    path: List[Hashable]
+    length: float
+    earliest_start: Dict[Hashable, float] = field(default_factory=dict)
+    earliest_finish: Dict[Hashable, float] = field(default_factory=dict)
+    latest_start: Dict[Hashable, float] = field(default_factory=dict)
+    latest_finish: Dict[Hashable, float] = field(default_factory=dict)
+    slack: Dict[Hashable, float] = field(default_factory=dict)
+
+
+class TaskGraph:
+    """
+    任務依賴圖（有向無環圖）
+
+    節點按添加順序保存，依賴可以在被依賴的節點之前聲明，
+    在 topological_order() 時統一校驗。
+    """
+
+    def __init__(self):
+        self.dependencies: Dict[Hashable, List[Hashable]] = {}
+        self.dependents: Dict[Hashable, List[Hashable]] = {}
+
+    def add_task(self, task_id: Hashable, dependencies: Iterable[Hashable] = ()):
+        if task_id in self.dependencies:
+            raise ValueError(f"重複的任務: {task_id}")
+        self.dependencies[task_id] = list(dependencies)
+        self.dependents.setdefault(task_id, [])
+        for dependency in self.dependencies[task_id]:
+            self.dependents.setdefault(dependency, []).append(task_id)
+
+    def __len__(self) -> int:
+        return len(self.dependencies)
+
+    def __contains__(self, task_id: Hashable) -> bool:
+        return task_id in self.dependencies
+
+    def topological_order(self) -> List[Hashable]:
+        """Kahn 算法；同一層按添加順序輸出。依賴缺失或存在環時拋出 ValueError"""
+        for task_id, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                if dependency not in self.dependencies:
+                    raise ValueError(f"任務 {task_id} 依賴未知任務 {dependency}")
+
+        in_degree = {task_id: len(deps) for task_id, deps in self.dependencies.items()}
+        ready = deque(task_id for task_id, degree in in_degree.items() if degree == 0)
+        order = []
+        while ready:
+            task_id = ready.popleft()
+            order.append(task_id)
+            for dependent in self.dependents[task_id]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self.dependencies):
+            cyclic = sorted(str(task_id) for task_id, degree in in_degree.items() if degree > 0)
+            raise ValueError(f"依賴圖存在環: {', '.join(cyclic)}")
+        return order
+
+    def critical_path(self, durations: Dict[Hashable, float]) -> CriticalPathResult:
+        """
+        關鍵路徑法：正向計算最早開始/完成時間，反向計算最晚開始/完成時間
+
+        鬆弛時間 = 最晚開始 − 最早開始；關鍵路徑從最晚完成的任務沿
+        「完成時間等於其最早開始時間」的依賴回溯得到。
+        """
+        order = self.topological_order()
+        if not order:
+            return CriticalPathResult(path=[], length=0.0)
+
+        earliest_start, earliest_finish = {}, {}
+        for task_id in order:
+            start = max((earliest_finish[dep] for dep in self.dependencies[task_id]), default=0.0)
+            earliest_start[task_id] = start
+            earliest_finish[task_id] = start + durations[task_id]
+        length = max(earliest_finish.values())
+
+        latest_start, latest_finish = {}, {}
+        for task_id in reversed(order):
+            finish = min((latest_start[dep] for dep in self.dependents[task_id]), default=length)
+            latest_finish[task_id] = finish
+            latest_start[task_id] = finish - durations[task_id]
+        slack = {task_id: latest_start[task_id] - earliest_start[task_id] for task_id in order}
+
+        path = [max(order, key=lambda task_id: earliest_finish[task_id])]
+        while self.dependencies[path[-1]]:
+            current = path[-1]
+            path.append(max(self.dependencies[current], key=lambda dep: earliest_finish[dep]))
+        path.reverse()
+
+        return CriticalPathResult(path, length, earliest_start, earliest_finish,
+                                  latest_start, latest_finish, slack)
+
+
+class DagScheduler:
+    """
+    依賴感知的就緒隊列
+
+    維護每個任務剩餘的未完成依賴數（入度），任務完成時只更新其直接後繼，
+    入度降為 0 的任務按拓撲序號釋放。rank 可作為優先級隊列的排序鍵。
+    """
+
+    def __init__(self, graph: TaskGraph):
+        self.graph = graph
+        self.rank = {task_id: index for index, task_id in enumerate(graph.topological_order())}
+        self.remaining = {task_id: len(deps) for task_id, deps in graph.dependencies.items()}
+        self.completed = set()
+
+    def initial_ready(self) -> List[Hashable]:
+        return sorted((task_id for task_id, count in self.remaining.items() if count == 0),
+                      key=self.rank.__getitem__)
+
+    def complete(self, task_id: Hashable) -> List[Hashable]:
+        """標記任務完成，返回因此變為就緒的任務"""
+        if task_id in self.completed:
+            raise ValueError(f"任務已完成: {task_id}")
+        self.completed.add(task_id)
+        released = []
+        for dependent in self.graph.dependents[task_id]:
+            self.remaining[dependent] -= 1
+            if self.remaining[dependent] == 0:
+                released.append(dependent)
+        return sorted(released, key=self.rank.__getitem__)
+
+    @property
+    def finished(self) -> bool:
+        return len(self.completed) == len(self.graph)
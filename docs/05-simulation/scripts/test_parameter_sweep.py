@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+逐次減半搜索的回歸測試
+運行：python -m pytest -q test_parameter_sweep.py
+"""
+
+from parameter_sweep import evaluate_config, successive_halving
+from scenario_comparison import ScenarioConfig, WorkflowType
+
+BASE = ScenarioConfig(name='sweep', workflow_type=WorkflowType.AGILE, team_size=4)
+DOMINATED = {'team_size': 2, 'automation_level': 0.0,
+             'documentation_overhead': 0.5, 'meeting_overhead': 0.3}
+DOMINANT = {'team_size': 12, 'automation_level': 1.0,
+            'documentation_overhead': 0.0, 'meeting_overhead': 0.0}
+
+
+def test_run_without_completions_scores_worst():
+    """沒有完成任何任務的運行，週期時間記為模擬時長而不是 0"""
+    kpis = evaluate_config(BASE, 1.0, seed=0)
+    assert kpis['tasks_completed'] == 0
+    assert kpis['average_cycle_time'] == kpis['p95_cycle_time'] == 1.0
+
+
+def test_dominated_configuration_cannot_win_through_empty_rung():
+    """第一級短到沒有候選完成任務時，同分的候選一併晉級，由高保真度評估決定勝負"""
+    result = successive_halving([DOMINATED, DOMINANT], BASE, min_duration=12, max_duration=240,
+                                max_replications=2, workers=1)
+    first = result.rungs[result.rungs['rung'] == 0]
+    assert (first['score'] == 12).all()
+    assert len(result.rungs[result.rungs['rung'] == 1]) == 2
+    assert result.best == DOMINANT
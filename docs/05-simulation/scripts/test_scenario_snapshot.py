@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+ScaledTeamSimulator 快照與分支的回歸測試
+運行：python -m pytest -q test_scenario_snapshot.py
+"""
+
+from dataclasses import replace
+
+import pytest
+import simpy
+
+from scenario_comparison import (ScaledTeamSimulator, ScenarioConfig, WorkflowType,
+                                 run_branched_simulation, run_scenario_simulation)
+
+
+def _config(workflow_type: WorkflowType, **changes) -> ScenarioConfig:
+    config = ScenarioConfig(name='snapshot', workflow_type=workflow_type, team_size=4,
+                            defect_rate=0.2, arrival_interval=3.0)
+    return replace(config, **changes)
+
+
+@pytest.mark.parametrize('workflow_type', list(WorkflowType))
+def test_empty_branch_matches_uninterrupted_run(workflow_type):
+    """不修改配置的分支應與從頭到尾不中斷的大規模模式運行完全一致"""
+    config = _config(workflow_type)
+    branched = run_branched_simulation(config, 240, {'same': {}}, duration=720, seed=7)['same']
+    direct = run_scenario_simulation(config, 720, seed=7, scale_mode=True)
+
+    assert list(branched.metrics['cycle_times']) == list(direct.metrics['cycle_times'])
+    assert branched.metrics['accounting'] == direct.metrics['accounting']
+    assert branched.metrics['daily_completion'] == direct.metrics['daily_completion']
+    assert branched.metrics['open_task_ages'] == direct.metrics['open_task_ages']
+    for field in ('tasks_created', 'tasks_completed', 'defect_count', 'rework_count', 'team_utilization'):
+        assert getattr(branched, field) == getattr(direct, field)
+
+
+def test_shrinking_branch_drains_excess_workers():
+    """縮減人數後，超出新人數的開發者和審查者完成手頭工作即退出，不再領取任務"""
+    config = _config(WorkflowType.CONTINUOUS, team_size=6, reviewer_count=2, arrival_interval=1.0)
+    env = simpy.Environment()
+    prefix = ScaledTeamSimulator(env, config, seed=3)
+    prefix.start()
+    env.run(until=240)
+    snapshot = prefix.snapshot()
+    in_flight = [developer for developer in prefix.working if developer >= 2]
+    assert in_flight, "分支時刻應有編號超出新人數的開發者正在工作"
+
+    shrunk = replace(config, team_size=2, reviewer_count=1)
+    simulator = ScaledTeamSimulator.restore(snapshot, shrunk)
+    starts = []
+    start_work, start_review = simulator._start_work, simulator._start_review
+    simulator._start_work = lambda developer, task: (starts.append(('dev', developer)),
+                                                     start_work(developer, task))
+    simulator._start_review = lambda reviewer, task: (starts.append(('reviewer', reviewer)),
+                                                      start_review(reviewer, task))
+    drain_by = max([finish for developer, (finish, _) in simulator.working.items() if developer >= 2] +
+                   [finish for reviewer, (finish, _) in simulator.reviewing.items() if reviewer >= 1])
+    excess = [simulator.developer_keys[developer] for developer in range(2, 6)]
+    drained = None
+
+    for until in sorted([drain_by + 1e-6, *range(264, 721, 24)]):
+        simulator.env.run(until=until)
+        if drained is None and until > drain_by:
+            drained = {key: simulator.accounting.busy_time(key, until) for key in excess}
+        for pool, size in ((simulator.idle_developers, 2), (simulator.idle_reviewers, 1)):
+            assert len(pool) == len(set(pool)) <= size
+            assert all(worker < size for worker in pool)
+        assert not set(simulator.idle_developers) & set(simulator.working)
+        if until > drain_by:
+            assert all(developer < 2 for developer in simulator.working)
+            assert all(reviewer < 1 for reviewer in simulator.reviewing)
+
+    assert starts, "分支之後應繼續有任務開始處理"
+    assert all(worker < (2 if kind == 'dev' else 1) for kind, worker in starts)
+
+    # 退出的開發者在排空之後不再累計忙碌時間
+    for key in excess:
+        assert simulator.accounting.busy_time(key, 720) == pytest.approx(drained[key])
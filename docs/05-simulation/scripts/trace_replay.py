@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Bee Swarm 事件軌跡回放
+流式讀取記錄下來的 GitHub Issue / PR 事件（JSON Lines 或 CSV，可 gzip 壓縮），
+以到達事件驅動模擬，替代合成的泊松到達；內存與軌跡長度無關
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+# GH Archive 的事件類型名稱
+ARCHIVE_EVENT_TYPES = {'IssuesEvent': 'issue', 'PullRequestEvent': 'pull_request'}
+
+# 標籤 → 任務類型 / 優先級（小寫比較，取第一個匹配的標籤）
+TASK_TYPE_LABELS = {
+    'bug': 'bug_fix', 'fix': 'bug_fix', 'regression': 'bug_fix',
+    'tech-debt': 'technical_debt', 'technical debt': 'technical_debt',
+    'refactor': 'technical_debt', 'chore': 'technical_debt',
+    'feature': 'feature', 'enhancement': 'feature'
+}
+PRIORITY_LABELS = {
+    'critical': 'critical', 'p0': 'critical', 'priority: critical': 'critical',
+    'high': 'high', 'p1': 'high', 'priority: high': 'high',
+    'medium': 'medium', 'p2': 'medium', 'priority: medium': 'medium',
+    'low': 'low', 'p3': 'low', 'priority: low': 'low'
+}
+
+
+@dataclass(frozen=True)
+class TraceEvent:
+    """
+    一個到達事件
+
+    time 為距軌跡起點的小時數；task_type、priority 和 complexity 缺省為 None，
+    由模擬器按原有分佈抽樣。
+    """
+    time: float
+    kind: str
+    id: str
+    labels: Tuple[str, ...] = ()
+    task_type: Optional[str] = None
+    priority: Optional[str] = None
+    complexity: Optional[float] = None
+
+
+def _parse_timestamp(value: str) -> datetime:
+    moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def _split_labels(value: Any) -> Tuple[str, ...]:
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return tuple(label.strip() for label in value.split(';') if label.strip())
+    return tuple(label['name'] if isinstance(label, dict) else str(label) for label in value)
+
+
+def _from_labels(labels: Sequence[str], mapping: Dict[str, str]) -> Optional[str]:
+    for label in labels:
+        value = mapping.get(label.lower())
+        if value:
+            return value
+    return None
+
+
+class TraceReader:
+    """
+    軌跡文件的惰性迭代器
+
+    每行一條記錄，逐行解析後立即丟棄，只保留當前位置，百萬級事件的軌跡也只佔用常數內存。
+    支持的字段（JSON Lines 和 CSV 相同，CSV 的 labels 用分號分隔）：
+
+    - 時間：time（小時）或 timestamp / created_at（ISO 8601），後者換算為距 origin 的小時數，
+      origin 缺省為第一條記錄的時間
+    - 類型：type 為 issue 或 pull_request（也接受 GH Archive 的 IssuesEvent / PullRequestEvent），
+      只有 kind 屬於 kinds、action 屬於 actions（默認 opened、reopened）的事件算作到達。
+      kinds 默認只取 Issue：真實倉庫中的 PR 大多實現某個已有 Issue，同時計入會重複計算工作量；
+      只有 PR 常常不關聯 Issue 的軌跡才應加入 pull_request
+    - 可選：id / number、labels、task_type、priority、complexity；
+      GH Archive 記錄從 payload 中讀取 action、編號和標籤
+
+    軌跡應按時間排序；早於上一個事件的記錄按上一個事件的時間到達，並計入 late_events。
+    offset 為已消費的字節數，state() / from_state() 用它在另一次運行中從同一位置繼續。
+    """
+
+    def __init__(self, path, kinds: Sequence[str] = ('issue',),
+                 actions: Sequence[str] = ('opened', 'reopened'),
+                 origin: Optional[datetime] = None, offset: int = 0,
+                 last_time: float = 0.0):
+        self.path = str(path)
+        self.kinds = tuple(kinds)
+        self.actions = tuple(actions)
+        self.origin = origin
+        self.offset = offset
+        self.last_time = last_time
+        self.late_events = 0
+        self.skipped = 0
+        self.format = 'csv' if self.path.removesuffix('.gz').endswith('.csv') else 'jsonl'
+        self._columns: Optional[list] = None
+        self._iterator: Optional[Iterator[TraceEvent]] = None
+
+    def _open(self):
+        return gzip.open(self.path, 'rb') if self.path.endswith('.gz') else open(self.path, 'rb')
+
+    def _lines(self, handle) -> Iterator[str]:
+        for line in handle:
+            self.offset += len(line)
+            yield line.decode('utf-8')
+
+    def _records(self) -> Iterator[Dict[str, Any]]:
+        with self._open() as handle:
+            if self.format == 'csv':
+                if self._columns is None:
+                    header = handle.readline()
+                    self._columns = next(csv.reader([header.decode('utf-8')]))
+                    self.offset = max(self.offset, len(header))
+                handle.seek(self.offset)
+                for row in csv.reader(self._lines(handle)):
+                    if row:
+                        yield dict(zip(self._columns, row))
+            else:
+                handle.seek(self.offset)
+                for line in self._lines(handle):
+                    if line.strip():
+                        yield json.loads(line)
+
+    def _event(self, record: Dict[str, Any]) -> Optional[TraceEvent]:
+        payload = record.get('payload') or {}
+        kind = ARCHIVE_EVENT_TYPES.get(record.get('type'), record.get('type'))
+        action = payload.get('action') or record.get('action') or 'opened'
+        if kind not in self.kinds or action not in self.actions:
+            return None
+        item = payload.get('issue') or payload.get('pull_request') or {}
+
+        if record.get('time') not in (None, ''):
+            time = float(record['time'])
+        else:
+            moment = _parse_timestamp(record.get('timestamp') or record['created_at'])
+            if self.origin is None:
+                self.origin = moment
+            time = (moment - self.origin).total_seconds() / 3600
+        if time < self.last_time:
+            self.late_events += 1
+            time = self.last_time
+        self.last_time = time
+
+        labels = _split_labels(record.get('labels') or item.get('labels'))
+        complexity = record.get('complexity')
+        return TraceEvent(
+            time=time,
+            kind=kind,
+            id=str(item.get('number') or record.get('number') or record.get('id') or ''),
+            labels=labels,
+            task_type=record.get('task_type') or _from_labels(labels, TASK_TYPE_LABELS),
+            priority=record.get('priority') or _from_labels(labels, PRIORITY_LABELS),
+            complexity=float(complexity) if complexity not in (None, '') else None
+        )
+
+    def _events(self) -> Iterator[TraceEvent]:
+        for record in self._records():
+            event = self._event(record)
+            if event is None:
+                self.skipped += 1
+            else:
+                yield event
+
+    def __iter__(self) -> 'TraceReader':
+        return self
+
+    def __next__(self) -> TraceEvent:
+        if self._iterator is None:
+            self._iterator = self._events()
+        return next(self._iterator)
+
+    def state(self) -> Dict[str, Any]:
+        """當前讀取位置，供 from_state() 在另一次運行中繼續"""
+        return {'path': self.path, 'kinds': self.kinds, 'actions': self.actions,
+                'origin': self.origin, 'offset': self.offset, 'last_time': self.last_time}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'TraceReader':
+        """從 state() 記錄的位置重新打開文件，繼續讀取之後的事件"""
+        return cls(**state)
+
+
+def trace_summary(path, **options) -> Dict[str, Any]:
+    """流式掃描整個軌跡：事件數、時間跨度、到達率和各類型計數"""
+    reader = TraceReader(path, **options)
+    count, first, kinds = 0, None, {}
+    for event in reader:
+        count += 1
+        if first is None:
+            first = event.time
+        kinds[event.kind] = kinds.get(event.kind, 0) + 1
+    span = reader.last_time - (first or 0.0)
+    return {
+        'events': count,
+        'start': first or 0.0,
+        'end': reader.last_time,
+        'span': span,
+        'rate_per_day': count / (span / 24) if span > 0 else 0.0,
+        'kinds': kinds,
+        'late_events': reader.late_events,
+        'skipped': reader.skipped,
+        'origin': reader.origin
+    }
+
+
+def write_synthetic_trace(path, events: int = 100_000, interval: float = 8.0, seed: int = 0,
+                          start: str = '2025-01-01T00:00:00Z', pull_request_share: float = 0.3):
+    """
+    生成合成軌跡（用於測試和基準）：泊松到達，工作日白天的到達率是其餘時間的 3 倍，
+    所有事件的長期平均間隔為 interval 小時；pull_request_share 的事件為 PR，其餘為 Issue
+    （按默認 kinds 回放時只有 Issue 算作到達）
+    """
+    rng = random.Random(seed)
+    moment = _parse_timestamp(start)
+    label_choices = [('enhancement',), ('bug',), ('bug', 'p1'), ('refactor',), ('enhancement', 'p0')]
+    label_weights = [0.5, 0.2, 0.1, 0.15, 0.05]
+    is_csv = str(path).removesuffix('.gz').endswith('.csv')
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'wt', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle) if is_csv else None
+        if writer:
+            writer.writerow(['timestamp', 'type', 'action', 'id', 'labels'])
+        # 非均勻泊松過程的稀疏化抽樣：按峰值強度生成候選，非高峰時段保留 1/3。
+        # 工作日 9-18 點佔一週 45/168 的時間，(3 × 45 + 123) / 168 倍的基準強度等於 1 / interval
+        peak_rate = 3 * 168 / (258 * interval)
+        for number in range(1, events + 1):
+            while True:
+                moment += timedelta(hours=rng.expovariate(peak_rate))
+                if (moment.weekday() < 5 and 9 <= moment.hour < 18) or rng.random() < 1 / 3:
+                    break
+            kind = 'pull_request' if rng.random() < pull_request_share else 'issue'
+            labels = rng.choices(label_choices, weights=label_weights)[0]
+            record = {'timestamp': moment.isoformat().replace('+00:00', 'Z'), 'type': kind,
+                      'action': 'opened', 'id': number, 'labels': list(labels)}
+            if writer:
+                writer.writerow([record['timestamp'], kind, 'opened', number, ';'.join(labels)])
+            else:
+                handle.write(json.dumps(record) + '\n')
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Inspect or generate GitHub event traces for replay")
+    commands = parser.add_subparsers(dest='command', required=True)
+    generate = commands.add_parser('generate', help="write a synthetic JSONL/CSV trace")
+    generate.add_argument('path', help="output file (.jsonl, .csv, optionally .gz)")
+    generate.add_argument('--events', type=int, default=100_000)
+    generate.add_argument('--interval', type=float, default=8.0, help="mean hours between events")
+    generate.add_argument('--seed', type=int, default=0)
+    inspect = commands.add_parser('inspect', help="stream a trace and print its summary")
+    inspect.add_argument('path')
+    inspect.add_argument('--kinds', nargs='+', default=['issue'], choices=['issue', 'pull_request'],
+                         help="event kinds counted as arrivals")
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        write_synthetic_trace(args.path, args.events, args.interval, args.seed)
+        print(f"Wrote {args.events} events to {args.path}")
+    else:
+        summary = trace_summary(args.path, kinds=args.kinds)
+        print(f"📼 {args.path}")
+        print(f"   {summary['events']} arrivals over {summary['span']:.1f}h "
+              f"({summary['rate_per_day']:.2f}/day), starting {summary['origin'] or 'at 0h'}")
+        print(f"   by kind: {summary['kinds']}; {summary['late_events']} out-of-order, "
+              f"{summary['skipped']} other records skipped")
+
+
+if __name__ == "__main__":
+    main()